@@ -0,0 +1,78 @@
+"""
+Measure the contraction-hierarchy query engine against plain Dijkstra:
+build time, index size and query latency percentiles.
+
+Run from the repository root with:
+    python -m benchmarks.ch_benchmark
+"""
+import random
+
+from benchmarks.dijkstra_benchmark import time_call
+
+
+def grid_weighted_graph(side, seed=0):
+    """Build a side x side undirected grid with random weights, like a plate scan of food."""
+    from graphs.weighted_graph import WeightedGraph
+
+    rng = random.Random(seed)
+    graph = WeightedGraph(is_directed=False)
+    edges = []
+    for i in range(side):
+        for j in range(side):
+            if i + 1 < side:
+                edges.append((f'{i},{j}', f'{i + 1},{j}', rng.randint(1, 10)))
+            if j + 1 < side:
+                edges.append((f'{i},{j}', f'{i},{j + 1}', rng.randint(1, 10)))
+    graph.add_edges(edges)
+    return graph
+
+
+def percentiles(samples, points=(50, 90, 99)):
+    """Return {point: value} for the given percentiles of samples."""
+    ordered = sorted(samples)
+    return {
+        point: ordered[min(len(ordered) - 1, len(ordered) * point // 100)]
+        for point in points
+    }
+
+
+def run(graphs=None, queries=200, seed=0):
+    """Print build time, index size and query latency percentiles for each graph."""
+    if graphs is None:
+        graphs = [
+            ('grid 50x50', grid_weighted_graph(50, seed)),
+            ('grid 100x100', grid_weighted_graph(100, seed)),
+        ]
+
+    rng = random.Random(seed)
+    for name, graph in graphs:
+        ids = list(graph.vertex_dict)
+        pairs = [(rng.choice(ids), rng.choice(ids)) for _ in range(queries)]
+
+        dijkstra_times = []
+        expected = []
+        for start_id, target_id in pairs:
+            distance, seconds = time_call(graph.find_shortest_path, start_id, target_id)
+            expected.append(distance)
+            dijkstra_times.append(seconds)
+
+        hierarchy, build_time = time_call(graph.enable_contraction_hierarchy)
+
+        ch_times = []
+        for (start_id, target_id), distance in zip(pairs, expected):
+            result, seconds = time_call(graph.find_shortest_path, start_id, target_id)
+            if result != distance:
+                raise AssertionError(f'{name}: {start_id}->{target_id} gave {result}, expected {distance}')
+            ch_times.append(seconds)
+
+        print(f'{name}: {len(ids)} vertices, {hierarchy.original_edge_count} edges')
+        print(f'  build {build_time:.2f}s, {hierarchy.shortcut_count()} shortcuts, '
+              f'~{hierarchy.size_in_bytes() / 1e6:.1f} MB')
+        for label, samples in (('dijkstra', dijkstra_times), ('ch', ch_times)):
+            summary = ', '.join(f'p{point} {value * 1000:.3f}ms'
+                                for point, value in percentiles(samples).items())
+            print(f'  {label:>8}: {summary}')
+
+
+if __name__ == "__main__":
+    run()
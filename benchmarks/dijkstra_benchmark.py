@@ -0,0 +1,95 @@
+"""
+Compare the heap-based Dijkstra in WeightedGraph.find_shortest_path against
+the original O(V^2) dictionary-scan version on growing random graphs.
+
+Run from the repository root with:
+    python -m benchmarks.dijkstra_benchmark
+"""
+import random
+import time
+
+from graphs.weighted_graph import WeightedGraph
+
+
+def legacy_find_shortest_path(graph, start_id, target_id):
+    """
+    The original Dijkstra implementation, which scans every remaining vertex
+    to find the minimum on each step. Kept here only as a baseline.
+    """
+    vertex_to_distance = {}
+    for vertex in graph.vertex_dict.values():
+        vertex_to_distance[vertex] = float('inf')
+    vertex_to_distance[graph.vertex_dict[start_id]] = 0
+
+    while vertex_to_distance:
+        min_distance = min(vertex_to_distance.values())
+        min_vertex = None
+        for vertex in vertex_to_distance:
+            if vertex_to_distance[vertex] == min_distance:
+                min_vertex = vertex
+
+        if min_vertex.id == target_id:
+            return vertex_to_distance[min_vertex]
+
+        for neighbor, weight in list(min_vertex.neighbors_dict.values()):
+            if neighbor in vertex_to_distance:
+                new_distance = weight + vertex_to_distance[min_vertex]
+                if new_distance < vertex_to_distance[neighbor]:
+                    vertex_to_distance[neighbor] = new_distance
+
+        del vertex_to_distance[min_vertex]
+
+    return None
+
+
+def random_weighted_graph(num_vertices, edges_per_vertex, seed=0):
+    """
+    Build a connected, undirected random WeightedGraph: a random spanning
+    chain plus `edges_per_vertex` extra random edges per vertex.
+    """
+    rng = random.Random(seed)
+    graph = WeightedGraph(is_directed=False)
+    ids = [str(i) for i in range(num_vertices)]
+    for vertex_id in ids:
+        graph.add_vertex(vertex_id)
+
+    order = ids[:]
+    rng.shuffle(order)
+    for vertex_id1, vertex_id2 in zip(order, order[1:]):
+        graph.add_edge(vertex_id1, vertex_id2, rng.randint(1, 100))
+
+    for vertex_id in ids:
+        for _ in range(edges_per_vertex):
+            graph.add_edge(vertex_id, rng.choice(ids), rng.randint(1, 100))
+
+    return graph
+
+
+def time_call(function, *args):
+    """Return (result, seconds) for a single call of function(*args)."""
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def run(sizes=(250, 500, 1000, 2000, 4000), edges_per_vertex=3, seed=0):
+    """Print a timing table for both implementations on each graph size."""
+    print(f'{"vertices":>10} {"legacy (s)":>12} {"heap (s)":>10} {"speedup":>8}')
+    for size in sizes:
+        graph = random_weighted_graph(size, edges_per_vertex, seed)
+        start_id, target_id = '0', str(size - 1)
+
+        legacy, legacy_time = time_call(
+            legacy_find_shortest_path, graph, start_id, target_id)
+        heap, heap_time = time_call(
+            graph.find_shortest_path, start_id, target_id)
+
+        if legacy != heap:
+            raise AssertionError(f'Mismatch on {size} vertices: {legacy} != {heap}')
+
+        speedup = legacy_time / heap_time if heap_time else float('inf')
+        print(f'{size:>10} {legacy_time:>12.4f} {heap_time:>10.4f} {speedup:>7.1f}x')
+
+
+if __name__ == "__main__":
+    run()
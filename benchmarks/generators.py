@@ -0,0 +1,133 @@
+"""
+Seeded generators of synthetic food maps for benchmarking, each sized by
+roughly how many edges it should have:
+
+- grid: a 2D lattice, like a plate scanned into cells.
+- geometric: food scattered at random, joined to everything within a radius.
+- scale_free: a preferential-attachment network where a few hubs are
+  joined to most of the food.
+- chain: one long path, the worst case for anything recursive.
+
+Every generator places its vertices at (x, y) positions and weights each
+edge by the distance between its ends, so A* works on all of them. With
+directed=True every edge points from the earlier vertex to the later one,
+which makes the map acyclic so topological_sort can run on it.
+"""
+import math
+import random
+
+from graphs.weighted_graph import WeightedGraph
+
+
+def _build(vertices, edges, directed):
+    """
+    Build a WeightedGraph from (id, position) vertices and (index, index)
+    edges, weighting each edge by the distance between its ends.
+    """
+    graph = WeightedGraph(is_directed=directed)
+    for vertex_id, position in vertices:
+        graph.add_vertex(vertex_id, position)
+
+    positions = [position for _, position in vertices]
+    graph.add_edges(
+        (vertices[i][0], vertices[j][0],
+         round(math.dist(positions[i], positions[j]), 3) or 0.001)
+        for i, j in edges)
+    return graph
+
+
+def grid(edge_count, seed=0, directed=False):
+    """
+    A side x side lattice with about edge_count edges, each joining
+    neighboring cells. Positions are jittered a little so the weights vary.
+    """
+    rng = random.Random(seed)
+    side = max(2, round(math.sqrt(edge_count / 2)))
+    vertices = [(f'{i},{j}', (i + rng.uniform(-0.25, 0.25), j + rng.uniform(-0.25, 0.25)))
+                for i in range(side) for j in range(side)]
+
+    edges = []
+    for i in range(side):
+        for j in range(side):
+            if i + 1 < side:
+                edges.append((i * side + j, (i + 1) * side + j))
+            if j + 1 < side:
+                edges.append((i * side + j, i * side + j + 1))
+    return _build(vertices, edges, directed)
+
+
+def geometric(edge_count, seed=0, directed=False, average_degree=8):
+    """
+    A random geometric graph: edge_count * 2 / average_degree points in the
+    unit square, each joined to every point within the radius that gives
+    about edge_count edges in total. Points are bucketed into cells one
+    radius wide, so only neighboring cells are compared.
+    """
+    rng = random.Random(seed)
+    vertex_count = max(2, edge_count * 2 // average_degree)
+    # Expected edges are vertex_count^2 * pi * radius^2 / 2
+    radius = math.sqrt(2 * edge_count / (math.pi * vertex_count ** 2))
+    positions = [(rng.random(), rng.random()) for _ in range(vertex_count)]
+
+    cells = {}
+    for i, (x, y) in enumerate(positions):
+        cells.setdefault((int(x / radius), int(y / radius)), []).append(i)
+
+    edges = []
+    for (cell_x, cell_y), members in cells.items():
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for j in cells.get((cell_x + dx, cell_y + dy), ()):
+                    for i in members:
+                        if i < j and math.dist(positions[i], positions[j]) <= radius:
+                            edges.append((i, j))
+
+    vertices = [(str(i), position) for i, position in enumerate(positions)]
+    return _build(vertices, edges, directed)
+
+
+def scale_free(edge_count, seed=0, directed=False, edges_per_vertex=4):
+    """
+    A Barabasi-Albert network: each new vertex joins edges_per_vertex
+    existing vertices, picked with probability proportional to their degree.
+    Vertices are placed at random, so hub edges are long.
+    """
+    rng = random.Random(seed)
+    vertex_count = max(edges_per_vertex + 1, edge_count // edges_per_vertex)
+
+    # Each vertex appears once per edge end, so a uniform pick from this
+    # list is a pick weighted by degree
+    ends = list(range(edges_per_vertex))
+    edges = []
+    for new in range(edges_per_vertex, vertex_count):
+        chosen = set()
+        while len(chosen) < edges_per_vertex:
+            chosen.add(rng.choice(ends))
+        for old in chosen:
+            edges.append((old, new))
+            ends.extend((old, new))
+
+    vertices = [(str(i), (rng.random(), rng.random())) for i in range(vertex_count)]
+    return _build(vertices, edges, directed)
+
+
+def chain(edge_count, seed=0, directed=False):
+    """A single path of edge_count edges with randomly spaced vertices along a line."""
+    rng = random.Random(seed)
+    x = 0
+    vertices = []
+    for i in range(edge_count + 1):
+        vertices.append((str(i), (x, 0)))
+        x += rng.uniform(0.5, 1.5)
+
+    edges = [(i, i + 1) for i in range(edge_count)]
+    return _build(vertices, edges, directed)
+
+
+# Generator name -> function(edge_count, seed, directed) returning a WeightedGraph
+GENERATORS = {
+    'grid': grid,
+    'geometric': geometric,
+    'scale_free': scale_free,
+    'chain': chain,
+}
@@ -0,0 +1,31 @@
+"""
+Compare the heap-based Prim (WeightedGraph.prim_spanning_tree) against
+WeightedGraph.minimum_spanning_tree_kruskal on sparse and dense random graphs.
+
+Run from the repository root with:
+    python -m benchmarks.mst_benchmark
+"""
+from benchmarks.dijkstra_benchmark import random_weighted_graph, time_call
+
+
+def run(sizes=(250, 500, 1000, 2000), densities=(('sparse', 2), ('dense', 50)), seed=0):
+    """Print a timing table for both MST algorithms on each graph size and density."""
+    print(f'{"graph":>8} {"vertices":>9} {"edges":>8} {"kruskal (s)":>12} {"prim (s)":>10}')
+    for name, edges_per_vertex in densities:
+        for size in sizes:
+            graph = random_weighted_graph(size, edges_per_vertex, seed)
+            edge_count = sum(len(v.neighbors_dict) for v in graph.get_vertices()) // 2
+
+            kruskal_edges, kruskal_time = time_call(graph.minimum_spanning_tree_kruskal)
+            (_, prim_weight), prim_time = time_call(graph.prim_spanning_tree)
+
+            kruskal_weight = sum(weight for _, _, weight in kruskal_edges)
+            if kruskal_weight != prim_weight:
+                raise AssertionError(
+                    f'Mismatch on {name} graph of {size}: {kruskal_weight} != {prim_weight}')
+
+            print(f'{name:>8} {size:>9} {edge_count:>8} {kruskal_time:>12.4f} {prim_time:>10.4f}')
+
+
+if __name__ == "__main__":
+    run()
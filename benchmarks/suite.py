@@ -0,0 +1,256 @@
+"""
+Time the main algorithms in graphs/ on every synthetic food map from
+benchmarks/generators.py, save the results as JSON, and compare a run
+against a saved baseline.
+
+Run from the repository root with:
+    python -m benchmarks.suite run --output baseline.json
+    python -m benchmarks.suite compare baseline.json --threshold 20
+
+compare reruns the baseline's generators, sizes and seed (or reads a
+second results file) and exits with status 1 if any timing got more than
+the threshold percentage slower.
+"""
+import argparse
+from datetime import datetime, timezone
+import json
+import platform
+import sys
+
+from benchmarks.dijkstra_benchmark import time_call
+from benchmarks.generators import GENERATORS
+
+DEFAULT_SIZES = (10 ** 2, 10 ** 3, 10 ** 4, 10 ** 5)
+
+
+class Benchmark(object):
+    """One algorithm to time, and which maps it can run on."""
+
+    def __init__(self, function, directed=False, max_vertices=None):
+        """
+        Parameters:
+        function (callable): Called with (graph, start_id, far_id), where
+        start_id is the first vertex generated and far_id the last.
+        directed (boolean): Whether it needs the directed (acyclic) map.
+        max_vertices (integer): Skip maps with more vertices than this.
+        """
+        self.function = function
+        self.directed = directed
+        self.max_vertices = max_vertices
+
+
+BENCHMARKS = {
+    'find_shortest_path': Benchmark(
+        lambda graph, start_id, far_id: graph.find_shortest_path(start_id, far_id)),
+    # A distance as large as the map makes the search visit everything it can reach
+    'find_vertices_n_away': Benchmark(
+        lambda graph, start_id, far_id: graph.find_vertices_n_away(start_id, len(graph.vertex_dict))),
+    'minimum_spanning_tree_kruskal': Benchmark(
+        lambda graph, start_id, far_id: graph.minimum_spanning_tree_kruskal()),
+    'minimum_spanning_tree_prim': Benchmark(
+        lambda graph, start_id, far_id: graph.minimum_spanning_tree_prim()),
+    # V x V distance matrix, so only on small maps
+    'floyd_warshall': Benchmark(
+        lambda graph, start_id, far_id: graph.floyd_warshall(), max_vertices=1000),
+    'get_connected_components': Benchmark(
+        lambda graph, start_id, far_id: graph.get_connected_components()),
+    'topological_sort': Benchmark(
+        lambda graph, start_id, far_id: graph.topological_sort(), directed=True),
+}
+
+
+def run(sizes=DEFAULT_SIZES, generators=None, benchmarks=None, seed=0, repeat=3):
+    """
+    Time every benchmark on every generated map.
+
+    Parameters:
+    sizes (iterable<integer>): Roughly how many edges each map should have.
+    generators (list<string>): Names from GENERATORS; defaults to all of them.
+    benchmarks (list<string>): Names from BENCHMARKS; defaults to all of them.
+    seed (integer): Seed for the generators.
+    repeat (integer): How many times to time each benchmark; the fastest
+    time is kept, since slower runs only add noise from the rest of the machine.
+
+    Returns:
+    dict: {'meta': how the run was made, 'results': a list of {'generator',
+    'size', 'vertices', 'edges', 'benchmark', 'seconds'} records}.
+    """
+    generators = list(generators or GENERATORS)
+    benchmarks = list(benchmarks or BENCHMARKS)
+    for name in generators:
+        if name not in GENERATORS:
+            raise ValueError(f"Unknown generator {name!r}, expected one of {sorted(GENERATORS)}")
+    for name in benchmarks:
+        if name not in BENCHMARKS:
+            raise ValueError(f"Unknown benchmark {name!r}, expected one of {sorted(BENCHMARKS)}")
+
+    results = []
+    for generator in generators:
+        for size in sizes:
+            for directed in (False, True):
+                selected = [name for name in benchmarks if BENCHMARKS[name].directed == directed]
+                if not selected:
+                    continue
+
+                graph = GENERATORS[generator](size, seed, directed)
+                ids = list(graph.vertex_dict)
+                vertex_count = len(ids)
+                # The generators make no self-loops, so undirected edges are stored twice
+                edge_count = graph.arc_count if directed else graph.arc_count // 2
+
+                for name in selected:
+                    benchmark = BENCHMARKS[name]
+                    if benchmark.max_vertices is not None and vertex_count > benchmark.max_vertices:
+                        continue
+                    seconds = min(time_call(benchmark.function, graph, ids[0], ids[-1])[1]
+                                  for _ in range(repeat))
+                    results.append({
+                        'generator': generator,
+                        'size': size,
+                        'vertices': vertex_count,
+                        'edges': edge_count,
+                        'benchmark': name,
+                        'seconds': seconds,
+                    })
+                    print(f'{generator:>10} {size:>8} {name:>30} {seconds:>10.4f}s', file=sys.stderr)
+
+    meta = {
+        'created': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'sizes': list(sizes),
+        'generators': generators,
+        'benchmarks': benchmarks,
+        'seed': seed,
+        'repeat': repeat,
+    }
+    return {'meta': meta, 'results': results}
+
+
+def save(report, filename):
+    """Write a report from run() to a JSON file."""
+    with open(filename, 'w') as f:
+        json.dump(report, f, indent=2)
+
+
+def load(filename):
+    """Read a report written by save()."""
+    with open(filename) as f:
+        return json.load(f)
+
+
+def compare(baseline, current, threshold=10.0, min_seconds=0.005):
+    """
+    Compare two reports from run(), matching records by generator, size and
+    benchmark.
+
+    Parameters:
+    baseline (dict): The report to compare against.
+    current (dict): The new report.
+    threshold (number): How many percent slower a timing may get before it
+    counts as a regression.
+    min_seconds (number): Timings where both runs are faster than this are
+    never regressions, since they are mostly timer noise.
+
+    Returns:
+    tuple(list<dict>, list<dict>): Every matched record as {'generator',
+    'size', 'benchmark', 'baseline', 'current', 'change'} with the change in
+    percent, and the subset of them that regressed.
+    """
+    key = lambda record: (record['generator'], record['size'], record['benchmark'])
+    baseline_seconds = {key(record): record['seconds'] for record in baseline['results']}
+
+    comparisons = []
+    regressions = []
+    for record in current['results']:
+        old = baseline_seconds.get(key(record))
+        if old is None:
+            continue
+        new = record['seconds']
+        change = (new - old) / old * 100 if old else 0.0
+        comparison = {
+            'generator': record['generator'],
+            'size': record['size'],
+            'benchmark': record['benchmark'],
+            'baseline': old,
+            'current': new,
+            'change': change,
+        }
+        comparisons.append(comparison)
+        if change > threshold and max(old, new) >= min_seconds:
+            regressions.append(comparison)
+
+    return comparisons, regressions
+
+
+def print_report(report):
+    """Print the results of run() as a table."""
+    print(f'{"generator":>10} {"size":>8} {"vertices":>9} {"edges":>9} {"benchmark":>30} {"seconds":>10}')
+    for record in report['results']:
+        print(f'{record["generator"]:>10} {record["size"]:>8} {record["vertices"]:>9} '
+              f'{record["edges"]:>9} {record["benchmark"]:>30} {record["seconds"]:>10.4f}')
+
+
+def print_comparison(comparisons, regressions):
+    """Print the results of compare() as a table, marking the regressions."""
+    print(f'{"generator":>10} {"size":>8} {"benchmark":>30} {"baseline":>10} {"current":>10} {"change":>8}')
+    for item in comparisons:
+        flag = '  REGRESSION' if item in regressions else ''
+        print(f'{item["generator"]:>10} {item["size"]:>8} {item["benchmark"]:>30} '
+              f'{item["baseline"]:>10.4f} {item["current"]:>10.4f} {item["change"]:>7.1f}%{flag}')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='time the benchmarks and print or save the results')
+    run_parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES),
+                            help='approximate edge counts of the maps')
+    run_parser.add_argument('--generators', nargs='+', choices=sorted(GENERATORS))
+    run_parser.add_argument('--benchmarks', nargs='+', choices=sorted(BENCHMARKS))
+    run_parser.add_argument('--seed', type=int, default=0)
+    run_parser.add_argument('--repeat', type=int, default=3)
+    run_parser.add_argument('--output', help='JSON file to save the results to')
+
+    compare_parser = commands.add_parser('compare', help='check a run against a saved baseline')
+    compare_parser.add_argument('baseline', help='JSON results to compare against')
+    compare_parser.add_argument('current', nargs='?',
+                                help='JSON results to check; by default the baseline is rerun')
+    compare_parser.add_argument('--threshold', type=float, default=10.0,
+                                help='percent slowdown that counts as a regression')
+    compare_parser.add_argument('--min-seconds', type=float, default=0.005,
+                                help='ignore timings faster than this in both runs')
+    compare_parser.add_argument('--output', help='JSON file to save the rerun to')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        report = run(args.sizes, args.generators, args.benchmarks, args.seed, args.repeat)
+        print_report(report)
+        if args.output:
+            save(report, args.output)
+        return 0
+
+    baseline = load(args.baseline)
+    if args.current:
+        current = load(args.current)
+    else:
+        meta = baseline['meta']
+        current = run(meta['sizes'], meta['generators'], meta['benchmarks'],
+                      meta['seed'], meta['repeat'])
+        if args.output:
+            save(current, args.output)
+
+    comparisons, regressions = compare(baseline, current, args.threshold, args.min_seconds)
+    print_comparison(comparisons, regressions)
+    if regressions:
+        print(f'{len(regressions)} of {len(comparisons)} timings regressed by more than '
+              f'{args.threshold}%')
+        return 1
+    print(f'No regressions beyond {args.threshold}% in {len(comparisons)} timings')
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""
+Regression benchmark for the unweighted traversals in Graph: checks that
+bfs_traversal, find_shortest_path, find_vertices_n_away and
+get_connected_components scale linearly with the number of edges.
+
+Run from the repository root with:
+    python -m benchmarks.traversal_benchmark
+"""
+import random
+
+from benchmarks.dijkstra_benchmark import time_call
+from graphs.graph import Graph
+
+
+def random_graph(edge_count, seed=0):
+    """Build an undirected random Graph with edge_count edges and edge_count / 4 vertices."""
+    rng = random.Random(seed)
+    vertex_count = max(edge_count // 4, 2)
+    graph = Graph(is_directed=False)
+    for i in range(vertex_count):
+        graph.add_vertex(str(i))
+    graph.add_edges(
+        (str(rng.randrange(vertex_count)), str(rng.randrange(vertex_count)))
+        for _ in range(edge_count))
+    # An unreachable target makes find_shortest_path search the whole component
+    graph.add_vertex('unreachable')
+    return graph
+
+
+def traversals(graph):
+    """Return (name, function, args) for every traversal to time on graph."""
+    return [
+        ('bfs_traversal', graph.bfs_traversal, ('0',)),
+        ('find_shortest_path', graph.find_shortest_path, ('0', 'unreachable')),
+        ('find_vertices_n_away', graph.find_vertices_n_away, ('0', len(graph.vertex_dict))),
+        ('get_connected_components', graph.get_connected_components, ()),
+    ]
+
+
+def run(sizes=(10 ** 5, 3 * 10 ** 5, 10 ** 6), max_slowdown=3.0, seed=0):
+    """
+    Time each traversal on each size and fail if the time per edge on the
+    largest graph is more than max_slowdown times that on the smallest.
+
+    The smallest size is already too big for the CPU cache, so cache misses
+    do not count against the traversals. A quadratic traversal would be
+    around 10 times slower per edge.
+    """
+    per_edge = {}
+    print(f'{"edges":>9} ' + ' '.join(f'{name:>25}' for name, _, _ in traversals(Graph())))
+    for size in sizes:
+        graph = random_graph(size, seed)
+        row = []
+        for name, function, args in traversals(graph):
+            _, seconds = time_call(function, *args)
+            per_edge.setdefault(name, []).append(seconds / size)
+            row.append(f'{seconds:>24.4f}s')
+        print(f'{size:>9} ' + ' '.join(row))
+
+    for name, times in per_edge.items():
+        slowdown = times[-1] / times[0]
+        if slowdown > max_slowdown:
+            raise AssertionError(
+                f'{name} is not scaling linearly: {slowdown:.1f}x slower per edge '
+                f'on {sizes[-1]} edges than on {sizes[0]}')
+    print('All traversals scale linearly.')
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,194 @@
+from array import array
+import math
+
+import numpy as np
+
+from graphs.csr_graph import CSRGraph
+
+# Rough cost of one Python-level edge relaxation in the heap Dijkstra, measured
+# in units of one NumPy element update in the Floyd-Warshall k-loop. Used by
+# the 'auto' method to pick the cheaper strategy.
+DIJKSTRA_COST_RATIO = 20
+
+
+class AllPairsResult(object):
+    """
+    The result of an all-pairs shortest path computation.
+
+    `matrix[i, j]` is the shortest distance from the vertex with index i to the
+    vertex with index j (inf if unreachable). If predecessors were requested,
+    `predecessors[i, j]` is the index of the vertex before j on that path
+    (-1 if there is none).
+    """
+
+    def __init__(self, ids, matrix, predecessors=None):
+        """
+        Parameters:
+        ids (list<string>): The vertex id for each matrix row/column.
+        matrix (numpy.ndarray): The V x V distance matrix.
+        predecessors (numpy.ndarray): The V x V predecessor matrix, or None.
+        """
+        self.ids = ids
+        self.index = {vertex_id: i for i, vertex_id in enumerate(ids)}
+        self.matrix = matrix
+        self.predecessors = predecessors
+
+    def distance(self, start_id, target_id):
+        """Return the shortest distance from start_id to target_id, or None if unreachable."""
+        value = self.matrix[self.index[start_id], self.index[target_id]]
+        return None if value == np.inf else value.item()
+
+    def path(self, start_id, target_id):
+        """
+        Rebuild the shortest path from start_id to target_id from the
+        predecessor matrix.
+
+        Returns:
+        list<string>: The vertex ids on the path, or None if target_id is unreachable.
+        """
+        if self.predecessors is None:
+            raise ValueError("Predecessors were not computed for this result")
+
+        start, target = self.index[start_id], self.index[target_id]
+        if self.matrix[start, target] == np.inf:
+            return None
+
+        path = [target]
+        while path[-1] != start:
+            path.append(self.predecessors[start, path[-1]])
+        path.reverse()
+        return [self.ids[i] for i in path]
+
+    def to_dict(self):
+        """Return the distances as a dict of start id -> (target id -> distance)."""
+        return {
+            start_id: dict(zip(self.ids, row))
+            for start_id, row in zip(self.ids, self.matrix.tolist())
+        }
+
+
+def _edge_arrays(csr):
+    """Return the (source, target, weight) NumPy arrays of every stored edge."""
+    offsets = np.frombuffer(csr.offsets, dtype=np.int64)
+    sources = np.repeat(np.arange(len(csr.ids)), np.diff(offsets))
+    targets = np.frombuffer(csr.targets, dtype=np.int32).astype(np.intp)
+    if csr.is_weighted:
+        weights = np.frombuffer(csr.weights, dtype=np.float64)
+    else:
+        weights = np.ones(len(targets))
+    return sources, targets, weights
+
+
+def _floyd_warshall(csr, with_predecessors):
+    """Run Floyd-Warshall as V whole-matrix min-plus updates."""
+    n = len(csr.ids)
+    sources, targets, weights = _edge_arrays(csr)
+
+    matrix = np.full((n, n), np.inf)
+    np.minimum.at(matrix, (sources, targets), weights)
+    np.fill_diagonal(matrix, np.minimum(matrix.diagonal(), 0))
+
+    predecessors = None
+    if with_predecessors:
+        predecessors = np.full((n, n), -1, dtype=np.int32)
+        predecessors[sources, targets] = sources
+
+    via = np.empty_like(matrix)
+    for k in range(n):
+        # Distance from every i to every j when going through k
+        np.add(matrix[:, k, None], matrix[None, k, :], out=via)
+        if with_predecessors:
+            shorter = via < matrix
+            np.copyto(predecessors, predecessors[k], where=shorter)
+        np.minimum(matrix, via, out=matrix)
+
+    if np.any(matrix.diagonal() < 0):
+        raise ValueError("The graph contains a negative cycle")
+
+    return matrix, predecessors
+
+
+def _johnson_potentials(csr):
+    """
+    Compute Bellman-Ford potentials from a virtual source joined to every vertex,
+    so that w(u, v) + h(u) - h(v) is non-negative for every edge.
+    """
+    sources, targets, weights = _edge_arrays(csr)
+    potentials = np.zeros(len(csr.ids))
+
+    for _ in range(len(csr.ids)):
+        updated = potentials.copy()
+        np.minimum.at(updated, targets, potentials[sources] + weights)
+        if np.array_equal(updated, potentials):
+            return potentials
+        potentials = updated
+
+    raise ValueError("The graph contains a negative cycle")
+
+
+def _repeated_dijkstra(csr, with_predecessors):
+    """Run one heap Dijkstra per source, reweighting first if any weight is negative."""
+    n = len(csr.ids)
+    matrix = np.empty((n, n))
+    predecessors = np.empty((n, n), dtype=np.int32) if with_predecessors else None
+
+    potentials = None
+    if csr.is_weighted and min(csr.weights, default=0) < 0:
+        potentials = _johnson_potentials(csr)
+        sources, targets, weights = _edge_arrays(csr)
+        reweighted = weights + potentials[sources] - potentials[targets]
+        csr = CSRGraph(csr.ids, csr.offsets, csr.targets,
+                       array('d', reweighted.tobytes()), csr.is_directed)
+
+    for start in range(n):
+        distance, previous = csr._dijkstra([start])
+        matrix[start] = distance
+        if with_predecessors:
+            predecessors[start] = previous
+
+    if potentials is not None:
+        matrix += potentials[None, :] - potentials[:, None]
+    return matrix, predecessors
+
+
+def choose_method(csr):
+    """
+    Pick 'floyd_warshall' or 'dijkstra' for the given graph by comparing the
+    estimated V^3 vectorized updates against V * (E + V) log V relaxations.
+    """
+    n = len(csr.ids)
+    if n == 0:
+        return 'floyd_warshall'
+    edges = len(csr.targets)
+    dijkstra_cost = DIJKSTRA_COST_RATIO * n * (edges + n) * max(math.log2(n), 1)
+    return 'floyd_warshall' if n ** 3 <= dijkstra_cost else 'dijkstra'
+
+
+def all_pairs_shortest_paths(graph, method='auto', predecessors=False):
+    """
+    Compute the shortest distance between every pair of vertices.
+
+    Parameters:
+    graph (Graph | CSRGraph): The graph to process. Unweighted edges count as 1.
+    method (string): 'floyd_warshall' for the dense vectorized k-loop,
+    'dijkstra' for repeated heap Dijkstra (Johnson-style), or 'auto' to pick
+    whichever is estimated to be cheaper.
+    predecessors (boolean): Whether to also build the predecessor matrix
+    needed by AllPairsResult.path.
+
+    Returns:
+    AllPairsResult: The distance matrix and the id <-> index mapping.
+    """
+    csr = graph if isinstance(graph, CSRGraph) else CSRGraph.from_graph(graph)
+
+    if method == 'auto':
+        method = choose_method(csr)
+
+    if method == 'floyd_warshall':
+        matrix, predecessor_matrix = _floyd_warshall(csr, predecessors)
+    elif method == 'dijkstra':
+        matrix, predecessor_matrix = _repeated_dijkstra(csr, predecessors)
+    else:
+        raise ValueError(f"Unknown all-pairs method: {method}")
+
+    return AllPairsResult(csr.ids, matrix, predecessor_matrix)
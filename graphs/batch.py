@@ -0,0 +1,115 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from graphs.csr_graph import CSRGraph
+from graphs.weighted_graph import INFINITY
+
+# The graph each worker process answers queries on, set once per worker by
+# _init_worker so it is not pickled again for every task
+_worker_graph = None
+
+
+def _init_worker(graph):
+    global _worker_graph
+    _worker_graph = graph
+
+
+def _group_by_source(pairs):
+    """Return a dict of source id -> list of distinct target ids, in first-seen order."""
+    targets_by_source = {}
+    for source_id, target_id in pairs:
+        targets = targets_by_source.setdefault(source_id, {})
+        targets[target_id] = None
+    return {source_id: list(targets) for source_id, targets in targets_by_source.items()}
+
+
+def _solve_source(csr, source_id, target_ids):
+    """
+    Run one Dijkstra from source_id on a CSRGraph, stopping once every target
+    is settled.
+
+    Returns:
+    dict: Target id -> shortest distance, or None if it cannot be reached.
+    """
+    index = csr.index
+    for vertex_id in [source_id] + target_ids:
+        if vertex_id not in index:
+            raise KeyError(f"Vertex {vertex_id!r} is not in the graph!")
+
+    distance, _ = csr._dijkstra([index[source_id]], [index[t] for t in target_ids])
+
+    results = {}
+    for target_id in target_ids:
+        value = distance[index[target_id]]
+        results[target_id] = None if value == INFINITY else value
+    return results
+
+
+def _solve_source_in_worker(task):
+    source_id, target_ids = task
+    return source_id, _solve_source(_worker_graph, source_id, target_ids)
+
+
+def _flatten(solved):
+    """Turn (source_id, {target_id: distance}) results into one pair -> distance dict."""
+    results = {}
+    for source_id, distances in solved:
+        for target_id, distance in distances.items():
+            results[(source_id, target_id)] = distance
+    return results
+
+
+def batch_shortest_paths(graph, pairs, workers=1, chunk_size=1):
+    """
+    Answer many shortest-path distance queries at once.
+
+    Pairs are grouped by source, so each distinct source costs one Dijkstra
+    run that stops once all of its targets are settled. With workers > 1 the
+    sources are spread across a process pool. The graph is converted to a
+    CSRGraph and sent to each worker once, when the worker starts.
+
+    Parameters:
+    graph (WeightedGraph | CSRGraph): The graph to query.
+    pairs (iterable<tuple>): (source_id, target_id) pairs.
+    workers (integer): Number of worker processes. 1 runs everything in
+    this process; None uses one worker per CPU.
+    chunk_size (integer): How many sources to send to a worker per task.
+
+    Returns:
+    dict: (source_id, target_id) -> shortest distance, or None if the target
+    cannot be reached from the source.
+    """
+    tasks = _group_by_source(pairs)
+    csr = graph if isinstance(graph, CSRGraph) else CSRGraph.from_graph(graph)
+
+    if workers == 1 or len(tasks) <= 1:
+        solved = (
+            (source_id, _solve_source(csr, source_id, target_ids))
+            for source_id, target_ids in tasks.items()
+        )
+        return _flatten(solved)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(csr,)) as executor:
+        solved = executor.map(_solve_source_in_worker, tasks.items(), chunksize=chunk_size)
+        return _flatten(solved)
+
+
+def nearest_source_distances(graph, source_ids, target_ids=None):
+    """
+    Find the nearest source for each target with one multi-source Dijkstra, e.g.
+    the distance from every colony to its nearest food.
+
+    Parameters:
+    graph (WeightedGraph): The graph to query.
+    source_ids (iterable<string>): The ids of the source vertices.
+    target_ids (iterable<string>): The vertices to report on. Defaults to
+    every vertex in the graph.
+
+    Returns:
+    dict: Target id -> (distance, nearest source id), or None for targets
+    that no source can reach.
+    """
+    nearest = graph.find_nearest_sources(source_ids)
+    if target_ids is None:
+        target_ids = graph.vertex_dict.keys()
+    return {target_id: nearest.get(target_id) for target_id in target_ids}
@@ -0,0 +1,199 @@
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import heapq
+import os
+import random
+
+from graphs.csr_graph import CSRGraph
+from graphs.weighted_graph import INFINITY
+
+# The graph each worker process scores sources on, set once per worker by
+# _init_worker so it is not pickled again for every task
+_worker_graph = None
+
+
+def _init_worker(graph):
+    global _worker_graph
+    _worker_graph = graph
+
+
+def _bfs_paths(csr, source):
+    """
+    Count shortest paths from source in an unweighted graph.
+
+    Returns:
+    tuple(list<int>, dict, dict): The vertices in non-decreasing distance
+    order, vertex -> number of shortest paths to it, and vertex -> list of
+    (predecessor, CSR edge position) pairs on those paths.
+    """
+    offsets = csr.offsets
+    targets = csr.targets
+    distance = {source: 0}
+    sigma = {source: 1}
+    predecessors = {source: []}
+    order = []
+
+    queue = deque([source])
+    while queue:
+        current = queue.popleft()
+        order.append(current)
+        next_distance = distance[current] + 1
+        for position in range(offsets[current], offsets[current + 1]):
+            neighbor = targets[position]
+            if neighbor not in distance:
+                distance[neighbor] = next_distance
+                sigma[neighbor] = 0
+                predecessors[neighbor] = []
+                queue.append(neighbor)
+            if distance[neighbor] == next_distance:
+                sigma[neighbor] += sigma[current]
+                predecessors[neighbor].append((current, position))
+
+    return order, sigma, predecessors
+
+
+def _dijkstra_paths(csr, source):
+    """Like _bfs_paths, but following edge weights with Dijkstra's Algorithm."""
+    offsets = csr.offsets
+    targets = csr.targets
+    weights = csr.weights
+    distance = {source: 0}
+    sigma = {source: 1}
+    predecessors = {source: []}
+    settled = set()
+    order = []
+
+    heap = [(0, source)]
+    while heap:
+        current_distance, current = heapq.heappop(heap)
+        if current in settled:
+            continue
+        settled.add(current)
+        order.append(current)
+        for position in range(offsets[current], offsets[current + 1]):
+            neighbor = targets[position]
+            new_distance = current_distance + weights[position]
+            old_distance = distance.get(neighbor, INFINITY)
+            if new_distance < old_distance:
+                distance[neighbor] = new_distance
+                sigma[neighbor] = sigma[current]
+                predecessors[neighbor] = [(current, position)]
+                heapq.heappush(heap, (new_distance, neighbor))
+            elif new_distance == old_distance and neighbor not in settled:
+                # Another shortest path of the same length
+                sigma[neighbor] += sigma[current]
+                predecessors[neighbor].append((current, position))
+
+    return order, sigma, predecessors
+
+
+def _accumulate(csr, sources):
+    """
+    Run Brandes' dependency accumulation from each source index.
+
+    Returns:
+    tuple(array, array): The summed betweenness of every vertex index and of
+    every CSR edge position, over the given sources.
+    """
+    vertex_scores = array('d', [0.0]) * len(csr.ids)
+    edge_scores = array('d', [0.0]) * len(csr.targets)
+    find_paths = _dijkstra_paths if csr.is_weighted else _bfs_paths
+
+    for source in sources:
+        order, sigma, predecessors = find_paths(csr, source)
+
+        # Walk back from the farthest vertices, passing each vertex's share of
+        # the paths through it on to its predecessors
+        delta = dict.fromkeys(order, 0.0)
+        for vertex in reversed(order):
+            coefficient = (1 + delta[vertex]) / sigma[vertex]
+            for predecessor, position in predecessors[vertex]:
+                contribution = sigma[predecessor] * coefficient
+                edge_scores[position] += contribution
+                delta[predecessor] += contribution
+            if vertex != source:
+                vertex_scores[vertex] += delta[vertex]
+
+    return vertex_scores, edge_scores
+
+
+def _accumulate_in_worker(sources):
+    return _accumulate(_worker_graph, sources)
+
+
+def betweenness_centrality(graph, samples=None, seed=None, workers=1, chunk_size=None):
+    """
+    Compute the vertex and edge betweenness of every vertex and edge with
+    Brandes' algorithm: one BFS (or Dijkstra, if weighted) per source,
+    followed by a backwards pass that adds up each vertex's and edge's share
+    of the shortest paths from that source. That is O(V * E) for unweighted
+    graphs instead of a shortest-path query per pair.
+
+    The sources can be split across a process pool. The graph is converted to
+    a CSRGraph and sent to each worker once, when the worker starts, and only
+    the score arrays come back.
+
+    Parameters:
+    graph (Graph | WeightedGraph | CSRGraph): The graph to score. Weights must
+    be positive.
+    samples (integer): If given, only this many randomly chosen sources are
+    used and the scores are scaled up to estimate the full result, which
+    trades accuracy for speed on very large maps.
+    seed (integer): Seed for choosing the sampled sources.
+    workers (integer): Number of worker processes. 1 runs everything in this
+    process; None uses one worker per CPU.
+    chunk_size (integer): How many sources to send to a worker per task.
+    Defaults to splitting the sources into four tasks per worker.
+
+    Returns:
+    tuple(dict, dict): Vertex id -> betweenness, and (start_id, dest_id) ->
+    betweenness for every edge. Undirected edges are listed once, and their
+    pairs of vertices are only counted once.
+    """
+    csr = graph if isinstance(graph, CSRGraph) else CSRGraph.from_graph(graph)
+    n = len(csr.ids)
+
+    sources = list(range(n))
+    if samples is not None and samples < n:
+        sources = random.Random(seed).sample(sources, samples)
+
+    if workers == 1 or len(sources) <= 1:
+        vertex_scores, edge_scores = _accumulate(csr, sources)
+    else:
+        if chunk_size is None:
+            task_count = 4 * (workers or os.cpu_count() or 1)
+            chunk_size = max(1, -(-len(sources) // task_count))
+        tasks = [sources[i:i + chunk_size] for i in range(0, len(sources), chunk_size)]
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(csr,)) as executor:
+            vertex_scores = array('d', [0.0]) * n
+            edge_scores = array('d', [0.0]) * len(csr.targets)
+            for partial_vertex, partial_edge in executor.map(_accumulate_in_worker, tasks):
+                for i, score in enumerate(partial_vertex):
+                    vertex_scores[i] += score
+                for position, score in enumerate(partial_edge):
+                    edge_scores[position] += score
+
+    # Sampled sources stand in for all of them; undirected graphs see every
+    # pair of vertices from both ends
+    scale = n / len(sources) if sources else 1
+    if not csr.is_directed:
+        scale /= 2
+
+    ids = csr.ids
+    vertex_betweenness = {ids[i]: score * scale for i, score in enumerate(vertex_scores)}
+
+    edge_betweenness = {}
+    offsets, targets = csr.offsets, csr.targets
+    for u in range(n):
+        for position in range(offsets[u], offsets[u + 1]):
+            key = (ids[u], ids[targets[position]])
+            reverse_key = (key[1], key[0])
+            if not csr.is_directed and reverse_key in edge_betweenness:
+                edge_betweenness[reverse_key] += edge_scores[position] * scale
+            else:
+                edge_betweenness[key] = edge_scores[position] * scale
+
+    return vertex_betweenness, edge_betweenness
@@ -0,0 +1,200 @@
+import heapq
+import time
+
+
+def _undirected_neighbors(graph):
+    """
+    Return a dict of vertex id -> set of neighbor ids, ignoring edge direction
+    and self-loops, since two vertices conflict if either points to the other.
+    """
+    neighbors = {vertex_id: set() for vertex_id in graph.vertex_dict}
+    for vertex_id in graph.vertex_dict:
+        for neighbor_id in graph.neighbor_ids(vertex_id):
+            if neighbor_id != vertex_id:
+                neighbors[vertex_id].add(neighbor_id)
+                neighbors[neighbor_id].add(vertex_id)
+    return neighbors
+
+
+def _smallest_free_color(used):
+    """Return the smallest color (0, 1, 2, ...) not in the set `used`."""
+    color = 0
+    while color in used:
+        color += 1
+    return color
+
+
+def greedy_coloring(graph, order=None, neighbors=None):
+    """
+    Color the vertices one at a time, giving each the smallest color that none
+    of its already colored neighbors has.
+
+    Parameters:
+    graph (Graph): The graph to color. Edge directions are ignored.
+    order (iterable<string>): The order to color the vertices in. Defaults to
+    the order they were added to the graph.
+    neighbors (dict): A precomputed result of _undirected_neighbors(graph).
+
+    Returns:
+    dict: Vertex id -> color, where colors are 0, 1, 2, ...
+    """
+    if neighbors is None:
+        neighbors = _undirected_neighbors(graph)
+    if order is None:
+        order = graph.vertex_dict
+
+    colors = {}
+    for vertex_id in order:
+        used = {colors[neighbor_id] for neighbor_id in neighbors[vertex_id]
+                if neighbor_id in colors}
+        colors[vertex_id] = _smallest_free_color(used)
+    return colors
+
+
+def largest_first_coloring(graph, neighbors=None):
+    """
+    Greedy coloring in order of decreasing degree (Welsh-Powell), which tends
+    to use fewer colors because the hardest vertices are colored while there
+    is still the most freedom.
+
+    The order comes from bucketing the vertices by degree, which is linear
+    rather than a comparison sort.
+    """
+    if neighbors is None:
+        neighbors = _undirected_neighbors(graph)
+
+    max_degree = max((len(adjacent) for adjacent in neighbors.values()), default=0)
+    buckets = [[] for _ in range(max_degree + 1)]
+    for vertex_id, adjacent in neighbors.items():
+        buckets[len(adjacent)].append(vertex_id)
+
+    order = (vertex_id for bucket in reversed(buckets) for vertex_id in bucket)
+    return greedy_coloring(graph, order, neighbors)
+
+
+def dsatur_coloring(graph, neighbors=None):
+    """
+    Color with DSatur: always color next the uncolored vertex whose neighbors
+    already use the most distinct colors (its saturation), breaking ties by
+    degree.
+
+    Instead of rescanning every vertex at each step, the uncolored vertices
+    sit in a bucket queue indexed by saturation, with a heap ordered by degree
+    inside each bucket. Coloring a vertex can only raise its neighbors'
+    saturation, so each raise pushes one new entry and old entries are
+    skipped when they come out. That is O((V + E) log V) overall.
+
+    Returns:
+    dict: Vertex id -> color, where colors are 0, 1, 2, ...
+    """
+    if neighbors is None:
+        neighbors = _undirected_neighbors(graph)
+
+    # Distinct colors among each vertex's neighbors; its size is the saturation
+    neighbor_colors = {vertex_id: set() for vertex_id in neighbors}
+    # buckets[s] is a heap of (-degree, insertion count, vertex id)
+    buckets = [[]]
+    for count, (vertex_id, adjacent) in enumerate(neighbors.items()):
+        buckets[0].append((-len(adjacent), count, vertex_id))
+    heapq.heapify(buckets[0])
+    count = len(neighbors)
+
+    colors = {}
+    max_saturation = 0
+    while len(colors) < len(neighbors):
+        # Find the highest non-empty bucket, dropping stale entries on the way
+        while True:
+            bucket = buckets[max_saturation]
+            while bucket:
+                vertex_id = bucket[0][2]
+                if vertex_id in colors or len(neighbor_colors[vertex_id]) != max_saturation:
+                    heapq.heappop(bucket)
+                else:
+                    break
+            if bucket:
+                break
+            max_saturation -= 1
+
+        _, _, vertex_id = heapq.heappop(bucket)
+        color = _smallest_free_color(neighbor_colors[vertex_id])
+        colors[vertex_id] = color
+
+        # Raise the saturation of uncolored neighbors that did not see this color yet
+        for neighbor_id in neighbors[vertex_id]:
+            if neighbor_id in colors or color in neighbor_colors[neighbor_id]:
+                continue
+            neighbor_colors[neighbor_id].add(color)
+            saturation = len(neighbor_colors[neighbor_id])
+            if saturation == len(buckets):
+                buckets.append([])
+            heapq.heappush(buckets[saturation],
+                           (-len(neighbors[neighbor_id]), count, neighbor_id))
+            count += 1
+            if saturation > max_saturation:
+                max_saturation = saturation
+
+    return colors
+
+
+# Strategy name -> function(graph, neighbors) returning vertex id -> color
+STRATEGIES = {
+    'greedy': lambda graph, neighbors: greedy_coloring(graph, neighbors=neighbors),
+    'largest_first': largest_first_coloring,
+    'dsatur': dsatur_coloring,
+}
+
+
+def color_graph(graph, strategy='dsatur'):
+    """
+    Color the graph so that no two adjacent vertices share a color.
+
+    Parameters:
+    graph (Graph): The graph to color. Edge directions are ignored.
+    strategy (string): 'greedy', 'largest_first' or 'dsatur'.
+
+    Returns:
+    dict: Vertex id -> color, where colors are 0, 1, 2, ...
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown coloring strategy {strategy!r}, "
+                         f"expected one of {sorted(STRATEGIES)}")
+    return STRATEGIES[strategy](graph, _undirected_neighbors(graph))
+
+
+def color_count(colors):
+    """Return how many distinct colors a coloring uses."""
+    return len(set(colors.values()))
+
+
+def compare_colorings(graph, strategies=None):
+    """
+    Run each strategy on the same graph and report how it did.
+
+    Parameters:
+    graph (Graph): The graph to color.
+    strategies (list<string>): The strategies to run; defaults to all of them.
+
+    Returns:
+    dict: Strategy name -> {'colors': number of colors used, 'seconds':
+    runtime, 'coloring': vertex id -> color}.
+    """
+    if strategies is None:
+        strategies = list(STRATEGIES)
+
+    # Every strategy works from the same adjacency, so build it once and
+    # leave it out of the timings
+    neighbors = _undirected_neighbors(graph)
+    report = {}
+    for strategy in strategies:
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown coloring strategy {strategy!r}, "
+                             f"expected one of {sorted(STRATEGIES)}")
+        start = time.perf_counter()
+        colors = STRATEGIES[strategy](graph, neighbors)
+        seconds = time.perf_counter() - start
+        report[strategy] = {
+            'colors': color_count(colors),
+            'seconds': seconds,
+            'coloring': colors,
+        }
+    return report
@@ -0,0 +1,272 @@
+import heapq
+import sys
+
+from graphs.csr_graph import CSRGraph
+from graphs.weighted_graph import INFINITY
+
+# How many vertices a witness search may settle before giving up and
+# inserting the shortcut anyway (which is always safe, just larger)
+WITNESS_SETTLE_LIMIT = 500
+
+
+class ContractionHierarchy(object):
+    """
+    A contraction-hierarchies index over a static WeightedGraph.
+
+    Vertices are contracted one at a time, cheapest first by edge difference
+    (shortcuts added minus edges removed). Contracting v adds a shortcut
+    u -> w for each pair of its remaining neighbors whose only shortest path
+    runs through v. A query then only needs two small Dijkstra searches that
+    each move upwards in contraction order, one from the start and one
+    (backwards) from the target.
+    """
+
+    def __init__(self, graph):
+        """
+        Build the hierarchy for graph.
+
+        Parameters:
+        graph (WeightedGraph | CSRGraph): The graph to preprocess. Weights must
+        not be negative.
+        """
+        csr = graph if isinstance(graph, CSRGraph) else CSRGraph.from_graph(graph)
+        self.ids = csr.ids
+        self.index = csr.index
+        n = len(csr.ids)
+
+        # (u, v) -> (weight, middle vertex or -1 for an original edge)
+        self.edges = {}
+        out_adjacency = [dict() for _ in range(n)]
+        in_adjacency = [dict() for _ in range(n)]
+        weights = csr.weights
+        for u in range(n):
+            for position in range(csr.offsets[u], csr.offsets[u + 1]):
+                v = csr.targets[position]
+                weight = weights[position] if weights is not None else 1
+                if weight < 0:
+                    raise ValueError("Contraction hierarchies need non-negative weights")
+                if u != v and weight < out_adjacency[u].get(v, INFINITY):
+                    out_adjacency[u][v] = weight
+                    in_adjacency[v][u] = weight
+                    self.edges[(u, v)] = (weight, -1)
+
+        self.original_edge_count = len(self.edges)
+        self.rank = self._contract(out_adjacency, in_adjacency)
+
+        # Split every edge into the upward search graphs: the forward search
+        # follows u -> v when v ranks higher, the backward search follows
+        # u -> v in reverse when u ranks higher
+        self.up = [[] for _ in range(n)]
+        self.down = [[] for _ in range(n)]
+        rank = self.rank
+        for (u, v), (weight, _) in self.edges.items():
+            if rank[u] < rank[v]:
+                self.up[u].append((v, weight))
+            else:
+                self.down[v].append((u, weight))
+
+    def _witness_search(self, out_adjacency, source, excluded, max_distance):
+        """
+        Run a limited Dijkstra from source that avoids `excluded`.
+
+        Returns:
+        dict: Vertex -> an upper bound on its distance from source without
+        passing through `excluded`.
+        """
+        distance = {source: 0}
+        heap = [(0, source)]
+        settled = 0
+        while heap:
+            current_distance, current = heapq.heappop(heap)
+            if current_distance > max_distance or settled >= WITNESS_SETTLE_LIMIT:
+                break
+            if current_distance > distance[current]:
+                continue
+            settled += 1
+            for neighbor, weight in out_adjacency[current].items():
+                if neighbor == excluded:
+                    continue
+                new_distance = current_distance + weight
+                if new_distance < distance.get(neighbor, INFINITY):
+                    distance[neighbor] = new_distance
+                    heapq.heappush(heap, (new_distance, neighbor))
+        return distance
+
+    def _shortcuts(self, out_adjacency, in_adjacency, v):
+        """Return the (u, w, weight) shortcuts needed if v were contracted now."""
+        shortcuts = []
+        outgoing = out_adjacency[v]
+        if not outgoing:
+            return shortcuts
+        max_out = max(outgoing.values())
+
+        for u, in_weight in in_adjacency[v].items():
+            witness = self._witness_search(out_adjacency, u, v, in_weight + max_out)
+            for w, out_weight in outgoing.items():
+                if w == u:
+                    continue
+                through_v = in_weight + out_weight
+                if witness.get(w, INFINITY) > through_v:
+                    shortcuts.append((u, w, through_v))
+        return shortcuts
+
+    def _priority(self, out_adjacency, in_adjacency, contracted_neighbors, v, shortcuts):
+        """Edge difference of v, plus how many of its neighbors are already contracted."""
+        removed = len(out_adjacency[v]) + len(in_adjacency[v])
+        return len(shortcuts) - removed + contracted_neighbors[v]
+
+    def _contract(self, out_adjacency, in_adjacency):
+        """Contract every vertex in edge-difference order and return each vertex's rank."""
+        n = len(out_adjacency)
+        contracted_neighbors = [0] * n
+        heap = []
+        for v in range(n):
+            shortcuts = self._shortcuts(out_adjacency, in_adjacency, v)
+            heap.append((self._priority(out_adjacency, in_adjacency,
+                                        contracted_neighbors, v, shortcuts), v))
+        heapq.heapify(heap)
+        rank = [0] * n
+        next_rank = 0
+
+        while heap:
+            _, v = heapq.heappop(heap)
+
+            # Priorities go stale as neighbors are contracted, so recompute this
+            # one lazily and put it back if it is no longer the smallest
+            shortcuts = self._shortcuts(out_adjacency, in_adjacency, v)
+            priority = self._priority(out_adjacency, in_adjacency,
+                                      contracted_neighbors, v, shortcuts)
+            if heap and priority > heap[0][0]:
+                heapq.heappush(heap, (priority, v))
+                continue
+
+            for u, w, weight in shortcuts:
+                if weight < out_adjacency[u].get(w, INFINITY):
+                    out_adjacency[u][w] = weight
+                    in_adjacency[w][u] = weight
+                    self.edges[(u, w)] = (weight, v)
+
+            # Remove v from the remaining graph
+            for u in in_adjacency[v]:
+                del out_adjacency[u][v]
+                contracted_neighbors[u] += 1
+            for w in out_adjacency[v]:
+                del in_adjacency[w][v]
+                contracted_neighbors[w] += 1
+            out_adjacency[v] = {}
+            in_adjacency[v] = {}
+
+            rank[v] = next_rank
+            next_rank += 1
+
+        return rank
+
+    def shortcut_count(self):
+        """Return the number of shortcut edges added during contraction."""
+        return len(self.edges) - self.original_edge_count
+
+    def size_in_bytes(self):
+        """Return a rough estimate of the memory used by the query structures."""
+        size = sys.getsizeof(self.edges) + sys.getsizeof(self.up) + sys.getsizeof(self.down)
+        size += sum(sys.getsizeof(key) + sys.getsizeof(value) for key, value in self.edges.items())
+        for adjacency in (self.up, self.down):
+            size += sum(sys.getsizeof(edges) for edges in adjacency)
+        return size
+
+    def _search(self, start, target):
+        """
+        Run the upward forward search from start and the upward backward search
+        from target, alternating between them.
+
+        Returns:
+        tuple(number, int, list, list): The shortest distance, the vertex where
+        the searches meet, and the two predecessor maps.
+        """
+        adjacency = (self.up, self.down)
+        distance = ({start: 0}, {target: 0})
+        previous = ({start: -1}, {target: -1})
+        settled = (set(), set())
+        heaps = ([(0, start)], [(0, target)])
+        shortest = INFINITY
+        meeting = -1
+
+        side = 0
+        while heaps[0] or heaps[1]:
+            if not heaps[side]:
+                side = 1 - side
+            current_distance, current = heapq.heappop(heaps[side])
+
+            # A search can stop once its frontier is past the best meeting
+            if current_distance >= shortest:
+                heaps[side].clear()
+                side = 1 - side
+                continue
+            if current in settled[side]:
+                continue
+            settled[side].add(current)
+
+            other = distance[1 - side].get(current)
+            if other is not None and current_distance + other < shortest:
+                shortest = current_distance + other
+                meeting = current
+
+            for neighbor, weight in adjacency[side][current]:
+                new_distance = current_distance + weight
+                if new_distance < distance[side].get(neighbor, INFINITY):
+                    distance[side][neighbor] = new_distance
+                    previous[side][neighbor] = current
+                    heapq.heappush(heaps[side], (new_distance, neighbor))
+
+            side = 1 - side
+
+        return shortest, meeting, previous[0], previous[1]
+
+    def _unpack(self, u, v, path):
+        """Append the original vertices of the (possibly shortcut) edge u -> v to path, excluding u."""
+        stack = [(u, v)]
+        while stack:
+            a, b = stack.pop()
+            middle = self.edges[(a, b)][1]
+            if middle == -1:
+                path.append(b)
+            else:
+                # Expand a -> middle first, so push it last
+                stack.append((middle, b))
+                stack.append((a, middle))
+
+    def find_shortest_path(self, start_id, target_id):
+        """Return the total weight of the shortest path, or None if the target cannot be reached."""
+        if start_id not in self.index or target_id not in self.index:
+            raise KeyError("One or both vertices are not in the graph!")
+        shortest, _, _, _ = self._search(self.index[start_id], self.index[target_id])
+        return None if shortest == INFINITY else shortest
+
+    def find_shortest_route(self, start_id, target_id):
+        """
+        Return (total weight, list of vertex ids) for the shortest path, with
+        every shortcut unpacked into the original vertices, or (None, None) if
+        the target cannot be reached.
+        """
+        if start_id not in self.index or target_id not in self.index:
+            raise KeyError("One or both vertices are not in the graph!")
+
+        start, target = self.index[start_id], self.index[target_id]
+        shortest, meeting, forward, backward = self._search(start, target)
+        if shortest == INFINITY:
+            return None, None
+
+        # Hierarchy edges from start up to the meeting vertex...
+        up_path = [meeting]
+        while up_path[-1] != start:
+            up_path.append(forward[up_path[-1]])
+        up_path.reverse()
+        # ...and from the meeting vertex down to target
+        down_path = [meeting]
+        while down_path[-1] != target:
+            down_path.append(backward[down_path[-1]])
+        hierarchy_path = up_path + down_path[1:]
+
+        path = [start]
+        for u, v in zip(hierarchy_path, hierarchy_path[1:]):
+            self._unpack(u, v, path)
+        return shortest, [self.ids[i] for i in path]
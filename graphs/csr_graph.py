@@ -0,0 +1,389 @@
+from array import array
+from collections import deque
+import heapq
+
+from graphs.graph import Graph
+from graphs.weighted_graph import WeightedGraph, INFINITY
+
+
+class CSRGraph(object):
+    """ CSRGraph Class
+    A frozen, compressed-sparse-row copy of a Graph or WeightedGraph.
+
+    Vertex ids are mapped to dense integer indices. The neighbors of the
+    vertex with index i are `targets[offsets[i]:offsets[i + 1]]`, and their
+    edge weights (for weighted graphs) sit at the same positions in `weights`.
+    An undirected edge is stored once in each direction, as in Graph.
+    """
+    __slots__ = ('is_directed', 'is_weighted', 'ids', 'index',
+                 'offsets', 'targets', 'weights')
+
+    def __init__(self, ids, offsets, targets, weights=None, is_directed=True):
+        """
+        Initialize a CSR graph from already-built arrays.
+
+        Parameters:
+        ids (list<string>): The vertex id for each dense index.
+        offsets (array): len(ids) + 1 edge offsets, one per vertex plus the end.
+        targets (array): The neighbor index of every stored edge.
+        weights (array): The weight of every stored edge, or None if unweighted.
+        is_directed (boolean): Whether the graph is directed.
+        """
+        if len(offsets) != len(ids) + 1 or offsets[-1] != len(targets):
+            raise ValueError("Offsets do not match the vertex and edge counts")
+        if weights is not None and len(weights) != len(targets):
+            raise ValueError("There must be exactly one weight per edge")
+
+        setattr_ = super(CSRGraph, self).__setattr__
+        setattr_('ids', list(ids))
+        setattr_('index', {vertex_id: i for i, vertex_id in enumerate(self.ids)})
+        setattr_('offsets', offsets)
+        setattr_('targets', targets)
+        setattr_('weights', weights)
+        setattr_('is_directed', is_directed)
+        setattr_('is_weighted', weights is not None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CSRGraph is frozen")
+
+    def __reduce__(self):
+        """Pickle as plain arrays, so graphs backed by a memory-mapped cache can be sent to worker processes."""
+        weights = array('d', self.weights) if self.is_weighted else None
+        return (CSRGraph, (self.ids, array('q', self.offsets), array('i', self.targets),
+                           weights, self.is_directed))
+
+    @classmethod
+    def from_graph(cls, graph):
+        """
+        Build a CSR graph from a Graph or WeightedGraph.
+
+        Parameters:
+        graph (Graph): The graph to compress. Edge weights are kept if it is a
+        WeightedGraph.
+
+        Returns:
+        CSRGraph: The compressed copy of the graph.
+        """
+        is_weighted = isinstance(graph, WeightedGraph)
+        ids = list(graph.index)
+        handles = list(graph.index.values())
+
+        offsets = array('q', [0])
+        targets = array('i')
+        weights = array('d') if is_weighted else None
+
+        # The graph already keeps each vertex's neighbors as a slice of handle
+        # arrays, so copy the slices across whole
+        for handle in handles:
+            start = graph.starts[handle]
+            end = start + graph.degrees[handle]
+            targets.extend(graph.targets[start:end])
+            if is_weighted:
+                weights.extend(graph.weights[start:end])
+            offsets.append(len(targets))
+
+        # Removed vertices leave gaps in the handles, which CSR indices may not have
+        if len(handles) < len(graph.ids):
+            index = array('i', [-1]) * len(graph.ids)
+            for i, handle in enumerate(handles):
+                index[handle] = i
+            targets = array('i', map(index.__getitem__, targets))
+
+        return cls(ids, offsets, targets, weights, graph.is_directed)
+
+    def to_graph(self):
+        """
+        Convert back to a mutable Graph, or WeightedGraph if this graph is weighted.
+
+        Returns:
+        Graph: A new graph with the same vertices and edges.
+        """
+        if self.is_weighted:
+            graph = WeightedGraph(self.is_directed)
+        else:
+            graph = Graph(self.is_directed)
+
+        for vertex_id in self.ids:
+            graph.add_vertex(vertex_id)
+
+        def edges():
+            for i, vertex_id in enumerate(self.ids):
+                for position in range(self.offsets[i], self.offsets[i + 1]):
+                    j = self.targets[position]
+                    # Undirected edges are stored both ways, only add them once
+                    if not self.is_directed and j < i:
+                        continue
+                    if self.is_weighted:
+                        yield vertex_id, self.ids[j], self.weights[position]
+                    else:
+                        yield vertex_id, self.ids[j]
+
+        graph.add_edges(edges())
+
+        return graph
+
+    def reverse(self):
+        """
+        Return the graph with every edge flipped. An undirected graph is its
+        own reverse, so it is returned unchanged.
+
+        Returns:
+        CSRGraph: The reversed graph, with the same vertex indices.
+        """
+        if not self.is_directed:
+            return self
+
+        n = len(self.ids)
+        offsets = self.offsets
+        targets = self.targets
+
+        # Count the edges coming into each vertex, then place them
+        counts = [0] * (n + 1)
+        for j in targets:
+            counts[j + 1] += 1
+        reverse_offsets = array('q', [0]) * (n + 1)
+        for i in range(n):
+            reverse_offsets[i + 1] = reverse_offsets[i] + counts[i + 1]
+
+        next_position = list(reverse_offsets[:n])
+        reverse_targets = array('i', [0]) * len(targets)
+        reverse_weights = array('d', [0.0]) * len(targets) if self.is_weighted else None
+        for i in range(n):
+            for position in range(offsets[i], offsets[i + 1]):
+                j = targets[position]
+                reverse_targets[next_position[j]] = i
+                if reverse_weights is not None:
+                    reverse_weights[next_position[j]] = self.weights[position]
+                next_position[j] += 1
+
+        return CSRGraph(self.ids, reverse_offsets, reverse_targets, reverse_weights, True)
+
+    def __len__(self):
+        """Return the number of vertices."""
+        return len(self.ids)
+
+    def __str__(self):
+        """Return a string representation of the graph."""
+        return f'CSRGraph with {len(self.ids)} vertices and {len(self.targets)} stored edges'
+
+    def __repr__(self):
+        """Return a string representation of the graph."""
+        return self.__str__()
+
+    def contains_id(self, vertex_id):
+        return vertex_id in self.index
+
+    def get_vertex_ids(self):
+        """Return the ids of all vertices, in index order."""
+        return list(self.ids)
+
+    def neighbor_indices(self, i):
+        """Return a zero-copy view of the neighbor indices of vertex index i."""
+        return memoryview(self.targets)[self.offsets[i]:self.offsets[i + 1]]
+
+    def neighbor_weights(self, i):
+        """Return a zero-copy view of the edge weights of vertex index i."""
+        return memoryview(self.weights)[self.offsets[i]:self.offsets[i + 1]]
+
+    def get_neighbors(self, vertex_id):
+        """Return the ids of the neighbors of vertex_id."""
+        ids = self.ids
+        return [ids[j] for j in self.neighbor_indices(self.index[vertex_id])]
+
+    def get_neighbors_with_weights(self, vertex_id):
+        """Return the neighbors of vertex_id as a list of (neighbor_id, weight) tuples."""
+        i = self.index[vertex_id]
+        ids = self.ids
+        return [(ids[j], weight) for j, weight
+                in zip(self.neighbor_indices(i), self.neighbor_weights(i))]
+
+    def _bfs(self, start, target=None):
+        """
+        Run a breadth-first search from vertex index `start`.
+
+        Returns:
+        tuple(list<int>, list<int>): The indices in visiting order, and the
+        predecessor index of every vertex (-1 for the start, -2 if unseen).
+        """
+        offsets = self.offsets
+        targets = self.targets
+        previous = [-2] * len(self.ids)
+        previous[start] = -1
+        order = []
+
+        queue = deque([start])
+        while queue:
+            current = queue.popleft()
+            order.append(current)
+            if current == target:
+                break
+            for position in range(offsets[current], offsets[current + 1]):
+                neighbor = targets[position]
+                if previous[neighbor] == -2:
+                    previous[neighbor] = current
+                    queue.append(neighbor)
+
+        return order, previous
+
+    def _dijkstra(self, starts, targets=None):
+        """
+        Run Dijkstra's Algorithm from the vertex indices in `starts` with a
+        lazy-deletion heap, stopping early once every index in `targets` (if
+        given) is settled. Every edge of an unweighted graph counts as weight 1.
+
+        Returns:
+        tuple(list<float>, list<int>): The distance to every vertex (INFINITY
+        if unreached) and the predecessor index of every vertex (-1 if none).
+        """
+        offsets = self.offsets
+        edge_targets = self.targets
+        weights = self.weights
+        if weights is None:
+            weights = array('d', [1.0]) * len(edge_targets)
+        distance = [INFINITY] * len(self.ids)
+        previous = [-1] * len(self.ids)
+        settled = bytearray(len(self.ids))
+        for start in starts:
+            distance[start] = 0
+        remaining = set(targets) if targets else None
+
+        heap = [(0, start) for start in starts]
+        while heap:
+            current_distance, current = heapq.heappop(heap)
+            if settled[current]:
+                continue
+            settled[current] = 1
+            if remaining is not None and current in remaining:
+                remaining.discard(current)
+                if not remaining:
+                    break
+            for position in range(offsets[current], offsets[current + 1]):
+                neighbor = edge_targets[position]
+                new_distance = current_distance + weights[position]
+                if new_distance < distance[neighbor]:
+                    distance[neighbor] = new_distance
+                    previous[neighbor] = current
+                    heapq.heappush(heap, (new_distance, neighbor))
+
+        return distance, previous
+
+    def _path_to(self, previous, target, root):
+        """Walk `previous` back from index target to index root and return the ids."""
+        path = [target]
+        while path[-1] != root:
+            path.append(previous[path[-1]])
+        path.reverse()
+        return [self.ids[i] for i in path]
+
+    def bfs_traversal(self, start_id):
+        """
+        Traverse the graph using breadth-first search.
+
+        Returns:
+        list<string>: The ids of all reachable vertices, in visiting order.
+        """
+        if not self.contains_id(start_id):
+            raise KeyError("Start id not in graph")
+        order, _ = self._bfs(self.index[start_id])
+        return [self.ids[i] for i in order]
+
+    def find_vertices_n_away(self, start_id, target_distance):
+        """
+        Find and return all vertex ids exactly `target_distance` hops away from start_id.
+        """
+        if not self.contains_id(start_id):
+            raise KeyError("Start id not in graph")
+
+        offsets = self.offsets
+        targets = self.targets
+        seen = bytearray(len(self.ids))
+        start = self.index[start_id]
+        seen[start] = 1
+        ring = [start]
+
+        for _ in range(target_distance):
+            next_ring = []
+            for current in ring:
+                for position in range(offsets[current], offsets[current + 1]):
+                    neighbor = targets[position]
+                    if not seen[neighbor]:
+                        seen[neighbor] = 1
+                        next_ring.append(neighbor)
+            ring = next_ring
+
+        return [self.ids[i] for i in ring]
+
+    def get_connected_components(self):
+        """
+        Return a list of all connected components, with each connected component
+        represented as a list of vertex ids.
+        """
+        offsets = self.offsets
+        targets = self.targets
+        seen = bytearray(len(self.ids))
+        components = []
+        for root in range(len(self.ids)):
+            if seen[root]:
+                continue
+
+            # Breadth-first search from root, sharing `seen` across components
+            # so each vertex is visited once and the components are disjoint
+            seen[root] = 1
+            component = [root]
+            for current in component:
+                for position in range(offsets[current], offsets[current + 1]):
+                    neighbor = targets[position]
+                    if not seen[neighbor]:
+                        seen[neighbor] = 1
+                        component.append(neighbor)
+            components.append([self.ids[i] for i in component])
+        return components
+
+    def find_shortest_path(self, start_id, target_id):
+        """
+        Find the shortest path from start_id to target_id, with the same return
+        value as the graph this was built from.
+
+        Returns:
+        list<string> | number: For an unweighted graph, the vertex ids on the
+        fewest-hop path as in Graph.find_shortest_path. For a weighted graph,
+        the total path weight as in WeightedGraph.find_shortest_path. None if
+        the target cannot be reached.
+        """
+        if not self.contains_id(start_id) or not self.contains_id(target_id):
+            raise KeyError("One or both vertices are not in the graph!")
+
+        start, target = self.index[start_id], self.index[target_id]
+        if self.is_weighted:
+            distance, _ = self._dijkstra([start], [target])
+            return None if distance[target] == INFINITY else distance[target]
+
+        _, previous = self._bfs(start, target)
+        if previous[target] == -2:
+            return None
+        return self._path_to(previous, target, start)
+
+    def find_shortest_route(self, start_id, target_id):
+        """
+        Use Dijkstra's Algorithm to return (total weight, list of vertex ids) for
+        the shortest path from start_id to target_id, or (None, None) if there is none.
+        """
+        if not self.contains_id(start_id) or not self.contains_id(target_id):
+            raise KeyError("One or both vertices are not in the graph!")
+
+        start, target = self.index[start_id], self.index[target_id]
+        distance, previous = self._dijkstra([start], [target])
+        if distance[target] == INFINITY:
+            return None, None
+        return distance[target], self._path_to(previous, target, start)
+
+    def find_all_distances(self, start_id):
+        """
+        Return a dict of vertex id -> shortest distance from start_id for every
+        reachable vertex.
+        """
+        if not self.contains_id(start_id):
+            raise KeyError("Start id not in graph")
+
+        distance, _ = self._dijkstra([self.index[start_id]])
+        return {self.ids[i]: d for i, d in enumerate(distance) if d != INFINITY}
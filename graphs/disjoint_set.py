@@ -0,0 +1,81 @@
+class DisjointSet(object):
+    """
+    Array-backed union-find with path compression and union by rank.
+
+    Items can be any hashable value (usually vertex ids). Each item is given a
+    dense integer index the first time it is seen, and the parent and rank of
+    every index are kept in flat lists.
+    """
+
+    def __init__(self, items=()):
+        """
+        Initialize the structure with each item in its own set.
+
+        Parameters:
+        items (iterable): The items to start with. More are added on demand.
+        """
+        self.index = {}  # item -> dense index
+        self.items = []  # dense index -> item
+        self.parent = []
+        self.rank = []
+        self.set_count = 0
+        for item in items:
+            self.add(item)
+
+    def __len__(self):
+        """Return the number of items."""
+        return len(self.items)
+
+    def __contains__(self, item):
+        return item in self.index
+
+    def add(self, item):
+        """Add item in a set of its own if it is new, and return its index."""
+        i = self.index.get(item)
+        if i is None:
+            i = len(self.items)
+            self.index[item] = i
+            self.items.append(item)
+            self.parent.append(i)
+            self.rank.append(0)
+            self.set_count += 1
+        return i
+
+    def _find_root(self, i):
+        """Return the root index of index i, halving the path on the way up."""
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def find(self, item):
+        """Return the representative item (or, group label) of item's set."""
+        return self.items[self._find_root(self.add(item))]
+
+    def union(self, item1, item2):
+        """
+        Combine the sets containing item1 and item2.
+
+        Returns:
+        boolean: True if they were in different sets, False if already joined.
+        """
+        root1 = self._find_root(self.add(item1))
+        root2 = self._find_root(self.add(item2))
+        if root1 == root2:
+            return False
+
+        # Hang the shallower tree under the deeper one
+        rank = self.rank
+        if rank[root1] < rank[root2]:
+            root1, root2 = root2, root1
+        self.parent[root2] = root1
+        if rank[root1] == rank[root2]:
+            rank[root1] += 1
+
+        self.set_count -= 1
+        return True
+
+    def connected(self, item1, item2):
+        """Return True if item1 and item2 are in the same set."""
+        return self.find(item1) == self.find(item2)
@@ -0,0 +1,398 @@
+import heapq
+
+from graphs.weighted_graph import INFINITY
+
+
+class DynamicShortestPathTree(object):
+    """
+    A single-source shortest-path tree over a WeightedGraph that is repaired
+    after every edge change instead of being recomputed, in the style of
+    Ramalingam and Reps.
+
+    - When an edge gets cheaper (or is added), only the vertices whose
+      distance actually improves are visited, by a Dijkstra seeded at the
+      edge's head.
+    - When a tree edge gets more expensive (or is removed), only the subtree
+      hanging below it can change. Each vertex in that subtree takes its best
+      incoming edge from outside the subtree, and a Dijkstra restricted to
+      the subtree settles the rest. Changes to non-tree edges cost nothing.
+
+    The tree registers itself as a listener on the graph, so it stays current
+    through add_edge, add_edges, update_weight, remove_edge and remove_vertex.
+    Weights must not be negative.
+    """
+
+    def __init__(self, graph, start_id):
+        """
+        Parameters:
+        graph (WeightedGraph): The graph to track.
+        start_id (string): The id of the source vertex.
+        """
+        if not graph.contains_id(start_id):
+            raise KeyError("Start id not in graph")
+
+        self.graph = graph
+        self.start_id = start_id
+        distance, previous = graph._dijkstra([start_id])
+        self.distance = dict(distance)
+        self.previous = dict(previous)
+
+        # Tree children of every reached vertex, to find the subtree below an edge
+        self.children = {vertex_id: set() for vertex_id in self.distance}
+        for vertex_id, previous_id in self.previous.items():
+            if previous_id is not None:
+                self.children[previous_id].add(vertex_id)
+
+        # A directed graph only stores outgoing edges, so keep our own
+        # incoming ones up to date rather than rebuild them every change
+        self.incoming = None
+        if graph.is_directed:
+            self.incoming = {vertex_id: {} for vertex_id in graph.vertex_dict}
+            for vertex_id in graph.vertex_dict:
+                for neighbor_id, weight in graph.neighbors_with_weights(vertex_id):
+                    self.incoming[neighbor_id][vertex_id] = weight
+
+        # How many vertices the last change made us look at
+        self.last_update_size = 0
+        graph.add_listener(self)
+
+    def close(self):
+        """Stop tracking changes to the graph."""
+        self.graph.remove_listener(self)
+
+    def distance_to(self, vertex_id):
+        """Return the shortest distance from the source to vertex_id, or None if it cannot be reached."""
+        return self.distance.get(vertex_id)
+
+    def path_to(self, vertex_id):
+        """Return the list of vertex ids on the shortest path to vertex_id, or None if it cannot be reached."""
+        if vertex_id not in self.distance:
+            return None
+        return self.graph._build_path(self.previous, vertex_id)
+
+    def _incoming_edges(self, vertex_id):
+        """Return (neighbor id, weight) pairs for the edges into vertex_id."""
+        if self.incoming is not None:
+            return self.incoming.get(vertex_id, {}).items()
+        return self.graph.neighbors_with_weights(vertex_id)
+
+    def _set_parent(self, vertex_id, parent_id):
+        """Move vertex_id under parent_id in the tree."""
+        old_parent = self.previous.get(vertex_id)
+        if old_parent is not None:
+            self.children[old_parent].discard(vertex_id)
+        self.previous[vertex_id] = parent_id
+        self.children.setdefault(vertex_id, set())
+        if parent_id is not None:
+            self.children.setdefault(parent_id, set()).add(vertex_id)
+
+    def _propagate(self, heap, allowed=None):
+        """
+        Continue Dijkstra from the (distance, id) entries in heap, lowering
+        distances wherever they improve.
+
+        Returns:
+        integer: How many vertices were settled.
+        """
+        distance = self.distance
+        graph = self.graph
+        settled = 0
+        while heap:
+            current_distance, current_id = heapq.heappop(heap)
+            if current_distance > distance.get(current_id, INFINITY):
+                continue
+            settled += 1
+            for neighbor_id, weight in graph.neighbors_with_weights(current_id):
+                if allowed is not None and neighbor_id not in allowed:
+                    continue
+                new_distance = current_distance + weight
+                if new_distance < distance.get(neighbor_id, INFINITY):
+                    distance[neighbor_id] = new_distance
+                    self._set_parent(neighbor_id, current_id)
+                    heapq.heappush(heap, (new_distance, neighbor_id))
+        return settled
+
+    def _edge_decreased(self, tail_id, head_id, weight):
+        """Repair the tree after the edge tail -> head got cheaper or was added."""
+        tail_distance = self.distance.get(tail_id)
+        if tail_distance is None:
+            return
+        new_distance = tail_distance + weight
+        if new_distance >= self.distance.get(head_id, INFINITY):
+            return
+
+        self.distance[head_id] = new_distance
+        self._set_parent(head_id, tail_id)
+        self.last_update_size += self._propagate([(new_distance, head_id)])
+
+    def _edge_increased(self, head_id):
+        """Repair the subtree below head_id after its tree edge got dearer or was removed."""
+        # Everything below the edge loses its distance
+        affected = set()
+        stack = [head_id]
+        while stack:
+            vertex_id = stack.pop()
+            affected.add(vertex_id)
+            stack.extend(self.children.get(vertex_id, ()))
+        for vertex_id in affected:
+            del self.distance[vertex_id]
+        self.last_update_size += len(affected)
+
+        # Seed each affected vertex with its best edge from outside the subtree,
+        # whose distances are still correct
+        heap = []
+        for vertex_id in affected:
+            best_distance, best_parent = INFINITY, None
+            for neighbor_id, weight in self._incoming_edges(vertex_id):
+                if neighbor_id in affected or neighbor_id not in self.distance:
+                    continue
+                if self.distance[neighbor_id] + weight < best_distance:
+                    best_distance = self.distance[neighbor_id] + weight
+                    best_parent = neighbor_id
+            if best_parent is not None:
+                self.distance[vertex_id] = best_distance
+                self._set_parent(vertex_id, best_parent)
+                heap.append((best_distance, vertex_id))
+        heapq.heapify(heap)
+        self._propagate(heap, affected)
+
+        # Whatever is still without a distance can no longer be reached
+        for vertex_id in affected:
+            if vertex_id not in self.distance:
+                self._set_parent(vertex_id, None)
+                del self.previous[vertex_id]
+
+    def _directed_edge_changed(self, tail_id, head_id, old_weight, new_weight):
+        """Repair the tree for a change to the one-way edge tail -> head."""
+        if new_weight is not None and (old_weight is None or new_weight < old_weight):
+            self._edge_decreased(tail_id, head_id, new_weight)
+        elif old_weight is not None and (new_weight is None or new_weight > old_weight):
+            if self.previous.get(head_id) == tail_id and head_id in self.distance:
+                self._edge_increased(head_id)
+
+    def edge_changed(self, vertex_id1, vertex_id2, old_weight, new_weight):
+        """Called by the graph after an edge is added, reweighted or removed."""
+        if new_weight is not None and new_weight < 0:
+            raise ValueError("Dynamic shortest paths need non-negative weights")
+        self.last_update_size = 0
+
+        if self.incoming is not None:
+            if new_weight is None:
+                self.incoming[vertex_id2].pop(vertex_id1, None)
+            else:
+                self.incoming.setdefault(vertex_id2, {})[vertex_id1] = new_weight
+            self._directed_edge_changed(vertex_id1, vertex_id2, old_weight, new_weight)
+        else:
+            self._directed_edge_changed(vertex_id1, vertex_id2, old_weight, new_weight)
+            self._directed_edge_changed(vertex_id2, vertex_id1, old_weight, new_weight)
+
+    def vertex_removed(self, vertex_id):
+        """Called by the graph after a vertex (and so all of its edges) is removed."""
+        if vertex_id == self.start_id:
+            # Without a source nothing is reachable any more
+            self.distance.clear()
+            self.previous.clear()
+            self.children.clear()
+        if self.incoming is not None:
+            self.incoming.pop(vertex_id, None)
+        self.children.pop(vertex_id, None)
+
+
+class DynamicSpanningTree(object):
+    """
+    A minimum spanning forest of an undirected WeightedGraph that is updated
+    by swapping single edges as the graph changes.
+
+    - A new or cheaper non-tree edge (u, v) replaces the most expensive edge
+      on the tree path from u to v, if it is cheaper than that edge, or joins
+      two trees if u and v were not connected.
+    - A removed or dearer tree edge splits its tree in two. The smaller half
+      is found by searching both halves in lockstep, and the cheapest graph
+      edge leaving it (possibly the same edge) reconnects them.
+    - Other changes leave the tree alone.
+
+    The trees are also kept rooted, with a parent pointer per vertex, so the
+    tree path between two vertices is found by climbing from both ends
+    rather than searching the whole tree. The cost of each update depends on
+    the tree around the changed edge, not on the number of edges in the
+    whole map.
+    """
+
+    def __init__(self, graph):
+        """
+        Parameters:
+        graph (WeightedGraph): The undirected graph to track.
+        """
+        if graph.is_directed:
+            raise ValueError("Spanning trees are only defined here for undirected graphs")
+
+        self.graph = graph
+        self.tree = {vertex_id: {} for vertex_id in graph.vertex_dict}  # id -> {id: weight}
+        self.total_weight = 0
+        for vertex_id1, vertex_id2, weight in graph.minimum_spanning_tree_kruskal():
+            self.tree[vertex_id1][vertex_id2] = weight
+            self.tree[vertex_id2][vertex_id1] = weight
+            self.total_weight += weight
+
+        # Root every tree of the forest; roots have parent None
+        self.parent = {}
+        for root_id in self.tree:
+            if root_id in self.parent:
+                continue
+            self.parent[root_id] = None
+            stack = [root_id]
+            while stack:
+                current_id = stack.pop()
+                for neighbor_id in self.tree[current_id]:
+                    if neighbor_id not in self.parent:
+                        self.parent[neighbor_id] = current_id
+                        stack.append(neighbor_id)
+        graph.add_listener(self)
+
+    def close(self):
+        """Stop tracking changes to the graph."""
+        self.graph.remove_listener(self)
+
+    def edges(self):
+        """Return the tree edges as (start_id, dest_id, weight) tuples, each listed once."""
+        return [(vertex_id, neighbor_id, weight)
+                for vertex_id, neighbors in self.tree.items()
+                for neighbor_id, weight in neighbors.items()
+                if vertex_id < neighbor_id]
+
+    def _add_vertex(self, vertex_id):
+        if vertex_id not in self.tree:
+            self.tree[vertex_id] = {}
+            self.parent[vertex_id] = None
+
+    def _make_root(self, vertex_id):
+        """Re-root vertex_id's tree at vertex_id by reversing the parent pointers above it."""
+        parent = self.parent
+        previous_id, current_id = None, vertex_id
+        while current_id is not None:
+            next_id = parent[current_id]
+            parent[current_id] = previous_id
+            previous_id, current_id = current_id, next_id
+
+    def _link(self, vertex_id1, vertex_id2, weight):
+        """Join the different trees of vertex_id1 and vertex_id2 with an edge."""
+        self._make_root(vertex_id1)
+        self.parent[vertex_id1] = vertex_id2
+        self.tree[vertex_id1][vertex_id2] = weight
+        self.tree[vertex_id2][vertex_id1] = weight
+        self.total_weight += weight
+
+    def _cut(self, vertex_id1, vertex_id2):
+        """Remove a tree edge, leaving the child side as a tree of its own."""
+        self.total_weight -= self.tree[vertex_id1].pop(vertex_id2)
+        del self.tree[vertex_id2][vertex_id1]
+        if self.parent[vertex_id1] == vertex_id2:
+            self.parent[vertex_id1] = None
+        else:
+            self.parent[vertex_id2] = None
+
+    def _tree_path(self, start_id, target_id):
+        """
+        Return the tree edges (child, parent, weight) on the path between
+        start_id and target_id, or None if they are in different trees.
+
+        Both ends climb towards their root in lockstep until one reaches a
+        vertex the other has passed, so the cost is the length of the path.
+        """
+        parent = self.parent
+        # Vertex -> the vertex below it on the way up from each end
+        below = ({start_id: None}, {target_id: None})
+        current = [start_id, target_id]
+        meeting = start_id if start_id == target_id else None
+
+        while meeting is None and (current[0] is not None or current[1] is not None):
+            for side in (0, 1):
+                current_id = current[side]
+                if current_id is None:
+                    continue
+                parent_id = parent[current_id]
+                current[side] = parent_id
+                if parent_id is None:
+                    continue
+                below[side][parent_id] = current_id
+                if parent_id in below[1 - side]:
+                    meeting = parent_id
+                    break
+        if meeting is None:
+            return None
+
+        path = []
+        for side in (0, 1):
+            current_id = below[side][meeting]
+            while current_id is not None:
+                path.append((current_id, parent[current_id], self.tree[current_id][parent[current_id]]))
+                current_id = below[side][current_id]
+        return path
+
+    def _smaller_side(self, vertex_id1, vertex_id2):
+        """
+        After cutting the edge between vertex_id1 and vertex_id2, return the
+        vertices of whichever resulting tree is smaller, by growing both one
+        vertex at a time until one runs out.
+        """
+        sides = ({vertex_id1}, {vertex_id2})
+        stacks = ([vertex_id1], [vertex_id2])
+        while True:
+            for side, stack in zip(sides, stacks):
+                if not stack:
+                    return side
+                current_id = stack.pop()
+                for neighbor_id in self.tree[current_id]:
+                    if neighbor_id not in side:
+                        side.add(neighbor_id)
+                        stack.append(neighbor_id)
+
+    def _reconnect(self, vertex_id1, vertex_id2):
+        """Join the two trees left by cutting vertex_id1 - vertex_id2 with the cheapest edge between them."""
+        side = self._smaller_side(vertex_id1, vertex_id2)
+        graph = self.graph
+
+        best = None
+        for vertex_id in side:
+            for neighbor_id, weight in graph.neighbors_with_weights(vertex_id):
+                if neighbor_id not in side and (best is None or weight < best[2]):
+                    best = (vertex_id, neighbor_id, weight)
+        if best is not None:
+            self._link(*best)
+
+    def _insert(self, vertex_id1, vertex_id2, weight):
+        """Consider a new or cheaper non-tree edge for the tree."""
+        self._add_vertex(vertex_id1)
+        self._add_vertex(vertex_id2)
+        path = self._tree_path(vertex_id1, vertex_id2)
+        if path is None:
+            self._link(vertex_id1, vertex_id2, weight)
+            return
+
+        heaviest = max(path, key=lambda edge: edge[2])
+        if weight < heaviest[2]:
+            self._cut(heaviest[0], heaviest[1])
+            self._link(vertex_id1, vertex_id2, weight)
+
+    def edge_changed(self, vertex_id1, vertex_id2, old_weight, new_weight):
+        """Called by the graph after an edge is added, reweighted or removed."""
+        if vertex_id1 == vertex_id2:
+            return  # self-loops are never in a spanning tree
+
+        in_tree = vertex_id2 in self.tree.get(vertex_id1, ())
+        if not in_tree:
+            if new_weight is not None and (old_weight is None or new_weight < old_weight):
+                self._insert(vertex_id1, vertex_id2, new_weight)
+        elif new_weight is None or new_weight > old_weight:
+            self._cut(vertex_id1, vertex_id2)
+            self._reconnect(vertex_id1, vertex_id2)
+        else:
+            # A tree edge got cheaper, so it stays in the tree
+            self.total_weight += new_weight - self.tree[vertex_id1][vertex_id2]
+            self.tree[vertex_id1][vertex_id2] = new_weight
+            self.tree[vertex_id2][vertex_id1] = new_weight
+
+    def vertex_removed(self, vertex_id):
+        """Called by the graph after a vertex (and so all of its edges) is removed."""
+        self.tree.pop(vertex_id, None)
+        self.parent.pop(vertex_id, None)
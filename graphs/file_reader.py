@@ -1,59 +1,303 @@
+from array import array
+import mmap
+import os
+import struct
+import tempfile
+
+from graphs.csr_graph import CSRGraph
 from graphs.graph import Graph
+from graphs.weighted_graph import WeightedGraph
+
+# Number of characters of edge lines to parse per chunk
+CHUNK_SIZE = 1 << 20
+
+# Binary cache layout: magic, then the header fields below, then the vertex ids
+# (utf-8, newline separated), then the int64 offsets, int32 targets and
+# float64 weights arrays, each starting on an 8-byte boundary.
+CACHE_SUFFIX = '.graphcache'
+CACHE_MAGIC = b'GRAPHCSR'
+# source size, source mtime (ns), is_directed, is_weighted, vertex count,
+# edge count, length of the encoded ids
+CACHE_HEADER = struct.Struct('<qqBBxxxxxxqqq')
+
+_STRIP_PARENS = str.maketrans('', '', '()')
+
+
+def _parse_weight(text):
+    """Parse an edge weight, keeping whole numbers as ints."""
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def _read_header(f):
+    """
+    Read the first two lines of an edge-list file.
+
+    Returns:
+    tuple(boolean, list<string>): Whether the graph is directed, and the vertex ids.
+    """
+    # The first line (G or D) determines whether the graph is directed
+    first_line = f.readline().strip()
+    if first_line == "G":
+        is_directed = False
+    elif first_line == "D":
+        is_directed = True
+    else:
+        raise ValueError(f"Invalid graph type {first_line!r}, expected G or D")
+
+    # The second line is a comma-separated list of vertex ids
+    vertex_ids = [vertex_id.strip() for vertex_id in f.readline().split(',')]
+    return is_directed, [vertex_id for vertex_id in vertex_ids if vertex_id]
+
+
+def _iter_edge_chunks(f, chunk_size=CHUNK_SIZE, filename=None):
+    """
+    Parse the remaining "(A,B)" or "(A,B,weight)" lines of f, just after its
+    two header lines, in chunks. Every edge must have the same form as the
+    first, since that decides whether the graph is weighted.
+
+    Yields:
+    list<tuple>: (vertex_id1, vertex_id2) or (vertex_id1, vertex_id2, weight)
+    edges, one list per chunk of roughly chunk_size characters.
+    """
+    name = filename or 'edge list'
+    line_number = 2
+    field_count = None
+    while True:
+        lines = f.readlines(chunk_size)
+        if not lines:
+            return
 
+        edges = []
+        for line in lines:
+            line_number += 1
+            fields = line.translate(_STRIP_PARENS).split(',')
+            if len(fields) not in (2, 3):
+                if line.strip():
+                    raise ValueError(f"{name}, line {line_number}: invalid edge line {line.strip()!r}")
+                continue
+            if field_count is None:
+                field_count = len(fields)
+            elif len(fields) != field_count:
+                expected = 'weighted' if field_count == 3 else 'unweighted'
+                raise ValueError(f"{name}, line {line_number}: edge {line.strip()!r} does not match "
+                                 f"the {expected} edges before it")
 
-def read_graph_from_file(filename):
+            if field_count == 2:
+                edges.append((fields[0].strip(), fields[1].strip()))
+            else:
+                try:
+                    weight = _parse_weight(fields[2])
+                except ValueError:
+                    raise ValueError(f"{name}, line {line_number}: invalid edge weight "
+                                     f"{fields[2].strip()!r}") from None
+                edges.append((fields[0].strip(), fields[1].strip(), weight))
+        yield edges
+
+
+def iter_edges_from_file(filename, chunk_size=CHUNK_SIZE):
+    """
+    Stream the edges of an edge-list file one at a time without building a graph.
+
+    Arguments:
+    filename (string): The relative path of the file to be processed
+    chunk_size (integer): Roughly how many characters to parse at a time
+
+    Yields:
+    tuple: (vertex_id1, vertex_id2) or (vertex_id1, vertex_id2, weight)
+    """
+    with open(filename, "r") as f:
+        _read_header(f)
+        for edges in _iter_edge_chunks(f, chunk_size, filename):
+            yield from edges
+
+
+def _cache_path(filename):
+    return filename + CACHE_SUFFIX
+
+
+def _pad(length):
+    """Return the number of bytes needed to round length up to a multiple of 8."""
+    return -length % 8
+
+
+def write_graph_cache(graph, filename):
+    """
+    Write a binary CSR cache for the graph loaded from `filename`, next to it.
+
+    Arguments:
+    graph (Graph | CSRGraph): The graph that was loaded from filename
+    filename (string): The relative path of the source text file
+    """
+    csr = graph if isinstance(graph, CSRGraph) else CSRGraph.from_graph(graph)
+    stat = os.stat(filename)
+    encoded_ids = '\n'.join(csr.ids).encode('utf-8')
+
+    header = CACHE_HEADER.pack(
+        stat.st_size, stat.st_mtime_ns, csr.is_directed, csr.is_weighted,
+        len(csr.ids), len(csr.targets), len(encoded_ids))
+
+    # Write to a temporary file of our own first, so a half-written cache is
+    # never read and processes writing the same cache at once cannot clash
+    path = _cache_path(filename)
+    descriptor, temporary_path = tempfile.mkstemp(
+        dir=os.path.dirname(path) or '.', prefix=os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'wb') as f:
+            f.write(CACHE_MAGIC + header)
+            f.write(encoded_ids + b'\0' * _pad(len(encoded_ids)))
+            f.write(array('q', csr.offsets).tobytes())
+            targets = array('i', csr.targets).tobytes()
+            f.write(targets + b'\0' * _pad(len(targets)))
+            if csr.is_weighted:
+                f.write(array('d', csr.weights).tobytes())
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
+
+
+def _try_write_graph_cache(graph, filename):
+    """
+    Write the binary cache for filename if possible. The cache only saves
+    parsing the file again, so a directory that cannot be written to (or a
+    full disk) is not an error: the graph is returned without a cache.
+    """
+    try:
+        write_graph_cache(graph, filename)
+    except OSError:
+        pass
+
+
+def read_graph_cache(filename):
+    """
+    Memory-map the binary cache of `filename`, if it exists and is up to date.
+
+    Arguments:
+    filename (string): The relative path of the source text file
+
+    Returns:
+    CSRGraph: A graph whose arrays are views into the mapped cache file, or
+    None if there is no valid cache for the current version of filename.
+    """
+    path = _cache_path(filename)
+    if not os.path.exists(path):
+        return None
+
+    with open(path, 'rb') as f:
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            return None
+
+    position = len(CACHE_MAGIC)
+    if len(buffer) < position + CACHE_HEADER.size or buffer[:position] != CACHE_MAGIC:
+        return None
+
+    (size, mtime_ns, is_directed, is_weighted,
+     vertex_count, edge_count, ids_length) = CACHE_HEADER.unpack_from(buffer, position)
+    stat = os.stat(filename)
+    if size != stat.st_size or mtime_ns != stat.st_mtime_ns:
+        return None
+    position += CACHE_HEADER.size
+
+    # A cache cut short (for example by a full disk) is treated as missing
+    expected_length = (position + ids_length + _pad(ids_length) + 8 * (vertex_count + 1)
+                       + 4 * edge_count + _pad(4 * edge_count) + (8 * edge_count if is_weighted else 0))
+    if len(buffer) < expected_length:
+        return None
+
+    encoded_ids = buffer[position:position + ids_length]
+    ids = encoded_ids.decode('utf-8').split('\n') if vertex_count else []
+    position += ids_length + _pad(ids_length)
+
+    view = memoryview(buffer)
+    offsets = view[position:position + 8 * (vertex_count + 1)].cast('q')
+    position += 8 * (vertex_count + 1)
+    targets = view[position:position + 4 * edge_count].cast('i')
+    position += 4 * edge_count + _pad(4 * edge_count)
+    weights = None
+    if is_weighted:
+        weights = view[position:position + 8 * edge_count].cast('d')
+
+    return CSRGraph(ids, offsets, targets, weights, bool(is_directed))
+
+
+def _parse_graph_file(filename, chunk_size):
+    """Parse an edge-list text file into a Graph or WeightedGraph."""
+    with open(filename, "r") as f:
+        is_directed, vertex_ids = _read_header(f)
+        chunks = _iter_edge_chunks(f, chunk_size, filename)
+
+        # The first edge tells us whether the edges carry weights
+        first_chunk = next(chunks, [])
+        if first_chunk and len(first_chunk[0]) == 3:
+            graph = WeightedGraph(is_directed)
+        else:
+            graph = Graph(is_directed)
+
+        for vertex_id in vertex_ids:
+            graph.add_vertex(vertex_id)
+
+        graph.add_edges(first_chunk)
+        for edges in chunks:
+            graph.add_edges(edges)
+
+    return graph
+
+
+def read_csr_graph_from_file(filename, use_cache=True, chunk_size=CHUNK_SIZE):
+    """
+    Read an edge-list file straight into a CSRGraph, using the binary cache
+    when it is up to date and writing it, where possible, when it is not.
+
+    Arguments:
+    filename (string): The relative path of the file to be processed
+    use_cache (boolean): Whether to read and write the binary cache
+    chunk_size (integer): Roughly how many characters to parse at a time
+
+    Returns:
+    CSRGraph: The compressed graph.
+    """
+    if use_cache:
+        csr = read_graph_cache(filename)
+        if csr is not None:
+            return csr
+
+    csr = CSRGraph.from_graph(_parse_graph_file(filename, chunk_size))
+    if use_cache:
+        _try_write_graph_cache(csr, filename)
+    return csr
+
+
+def read_graph_from_file(filename, use_cache=True, chunk_size=CHUNK_SIZE):
     """
     Read in data from the specified filename, and create and return a graph
     object corresponding to that data.
 
+    The file holds "G" (undirected) or "D" (directed) on the first line, a
+    comma-separated list of vertex ids on the second, and one "(A,B)" or
+    "(A,B,weight)" edge per line after that. If the edges carry weights, a
+    WeightedGraph is returned.
+
     Arguments:
     filename (string): The relative path of the file to be processed
+    use_cache (boolean): Whether to read and write the binary cache next to
+    the file, so unchanged files are not parsed again
+    chunk_size (integer): Roughly how many characters to parse at a time
 
     Returns:
-    Graph: A directed or undirected Graph object containing the specified
-    vertices and edges
+    Graph: A directed or undirected Graph (or WeightedGraph) object containing
+    the specified vertices and edges
     """
+    if use_cache:
+        csr = read_graph_cache(filename)
+        if csr is not None:
+            return csr.to_graph()
 
-    # Use 'open' to open the file
-    f = open(filename, "r")
-
-    # Use the first line (G or D) to determine whether graph is directed 
-    # and create a graph object
-    first_line = f.readline().strip()
-    graph = Graph(False)
-    
-    # If undirected
-    if  first_line == "G":
-        graph = Graph(False)
-    
-    # If directed
-    elif first_line == "D":
-        graph = Graph()
-        
-    else:
-        print("Invalid Input")
-        print(first_line)
-
-    # Use the second line to add the vertices to the graph
-    vertices = f.readline().strip()
-    for _ in vertices:
-        graph.add_vertex(_)
-
-    # Use the 3rd+ line to add the edges to the graph
-    for line in f:
-        if line != '':
-            print(line)
-            curr = line.replace('(', '')
-            curr = curr.replace(')', '').strip()
-            curr = curr.split(",")
-            print("Current line: {}".format(curr))
-            
-            if curr:
-                vert1 = graph.add_vertex(curr[0])
-                vert2 = graph.add_vertex(curr[1])
-                # print("Vert 1: {} Vert 2: {}".format(vert1, vert2))
-                
-                graph.add_edge(vert1.get_id(), vert2.get_id())
-        
-    f.close()
-    return graph
\ No newline at end of file
+    graph = _parse_graph_file(filename, chunk_size)
+    if use_cache:
+        _try_write_graph_cache(graph, filename)
+    return graph
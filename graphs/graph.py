@@ -1,31 +1,75 @@
+from array import array
 from collections import deque
-import random
+from collections.abc import Mapping, Sequence
+from itertools import compress, repeat
+import time
+
+from graphs.path_cache import PathCache
+from graphs.stats import FrontierProbe, Stats
+
+# Vertex colours for depth-first cycle detection, stored in a bytearray
+# indexed by vertex handle; white (unvisited) vertices are 0
+GREY = 1
+BLACK = 2
+
+# Vertices with at least this many neighbors also keep a dict of neighbor ->
+# offset in their slice, so finding one of their arcs does not scan the slice
+HUB_DEGREE = 32
 
 class Vertex(object):
     """
     Defines a single vertex and its neighbors.
+
+    The graph keeps every vertex's data in compact arrays indexed by an
+    integer handle, so a Vertex is only a small view (its graph and handle)
+    that is created on demand. Two views of the same vertex compare equal.
     """
+    __slots__ = ('graph', 'handle')
 
-    def __init__(self, vertex_id):
+    def __init__(self, graph, handle):
         """
-        Initialize a vertex and its neighbors dictionary.
-        
         Parameters:
-        vertex_id (string): A unique identifier to identify this vertex.
+        graph (Graph): The graph the vertex belongs to.
+        handle (integer): The vertex's index in the graph's arrays.
         """
-        self.id = vertex_id
-        self.neighbors_dict = {} # id -> object
+        self.graph = graph
+        self.handle = handle
+
+    @property
+    def id(self):
+        return self.graph.ids[self.handle]
+
+    @property
+    def position(self):
+        return self.graph.positions.get(self.handle)
+
+    @property
+    def neighbors_dict(self):
+        """A live, read-only mapping of neighbor id -> neighbor vertex."""
+        return NeighborMap(self.graph, self.handle)
 
     def add_neighbor(self, vertex_obj):
         """
-        Add a neighbor by storing it in the neighbors dictionary.
+        Add a one-way edge from this vertex to vertex_obj. Listeners are told
+        about it as for add_edge.
 
         Parameters:
-        vertex_obj (Vertex): An instance of Vertex to be stored as a neighbor.
+        vertex_obj (Vertex): The vertex to add as a neighbor.
         """
-        self.neighbors_dict[vertex_obj.id] = vertex_obj
+        graph = self.graph
+        old_weight = graph._add_arc(self.handle, vertex_obj.handle, 1)
+        graph._graph_changed()
+        if old_weight is None:
+            graph._edge_changed(self.id, vertex_obj.id, None, 1)
         return self.neighbors_dict
 
+    def __eq__(self, other):
+        return (isinstance(other, Vertex) and self.graph is other.graph
+                and self.handle == other.handle)
+
+    def __hash__(self):
+        return hash((id(self.graph), self.handle))
+
     def __str__(self):
         """Output the list of neighbors of this vertex."""
         neighbor_ids = list(self.neighbors_dict.keys())
@@ -36,49 +80,463 @@ class Vertex(object):
         return self.__str__()
 
     def get_neighbors(self):
-        """Return the neighbors of this vertex."""
-        return list(self.neighbors_dict.values())
+        """Return the neighbors of this vertex, as a live view rather than a copied list."""
+        return NeighborView(self.graph, self.handle)
 
     def get_id(self):
         """Return the id of this vertex."""
         return self.id
 
+    def get_position(self):
+        """Return the (x, y) coordinates of this vertex, or None if it has none."""
+        return self.position
+
+
+class NeighborView(Sequence):
+    """
+    A read-only sequence of a vertex's neighbor vertices (or, with
+    with_weights, (vertex, weight) pairs) that reads straight from the
+    graph's arrays instead of copying them into a list.
+    """
+    __slots__ = ('graph', 'handle', 'with_weights')
+
+    def __init__(self, graph, handle, with_weights=False):
+        self.graph = graph
+        self.handle = handle
+        self.with_weights = with_weights
+
+    def __len__(self):
+        return self.graph.degrees[self.handle]
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("neighbor index out of range")
+
+        graph = self.graph
+        position = graph.starts[self.handle] + i
+        neighbor = graph._vertex(graph.targets[position])
+        if self.with_weights:
+            return neighbor, graph._arc_weight(position)
+        return neighbor
+
+
+class NeighborMap(Mapping):
+    """
+    A read-only mapping of neighbor id -> neighbor vertex, or -> (neighbor
+    vertex, weight) in a WeightedGraph, read from the graph's arrays.
+    """
+    __slots__ = ('graph', 'handle')
+
+    def __init__(self, graph, handle):
+        self.graph = graph
+        self.handle = handle
+
+    def __len__(self):
+        return self.graph.degrees[self.handle]
+
+    def __iter__(self):
+        return self.graph._neighbor_ids(self.handle)
+
+    def __contains__(self, neighbor_id):
+        neighbor = self.graph.index.get(neighbor_id)
+        return neighbor is not None and self.graph._find_arc(self.handle, neighbor) >= 0
+
+    def __getitem__(self, neighbor_id):
+        graph = self.graph
+        neighbor = graph.index.get(neighbor_id)
+        position = -1 if neighbor is None else graph._find_arc(self.handle, neighbor)
+        if position < 0:
+            raise KeyError(neighbor_id)
+        if graph.weights is not None:
+            return graph._vertex(neighbor), graph.weights[position]
+        return graph._vertex(neighbor)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class VertexMap(Mapping):
+    """A read-only mapping of vertex id -> Vertex over a graph, in insertion order."""
+    __slots__ = ('graph',)
+
+    def __init__(self, graph):
+        self.graph = graph
+
+    def __len__(self):
+        return len(self.graph.index)
+
+    def __iter__(self):
+        return iter(self.graph.index)
+
+    def __contains__(self, vertex_id):
+        return vertex_id in self.graph.index
+
+    def __getitem__(self, vertex_id):
+        return self.graph._vertex(self.graph.index[vertex_id])
+
+    def __repr__(self):
+        return repr(dict(self))
+
 
 class Graph:
     """ Graph Class
     Represents a directed or undirected graph.
+
+    Vertex ids are interned once into dense integer handles. The neighbors of
+    every vertex are a slice of one shared array of handles (plus a parallel
+    array of weights in a WeightedGraph): vertex h's neighbors are
+    targets[starts[h]:starts[h] + degrees[h]], with room reserved up to
+    capacities[h]. A slice that outgrows its room moves to the end of the
+    array, and compact() packs the arrays again once enough space is left
+    behind. High-degree vertices also index their slice by neighbor (see
+    HUB_DEGREE), so adding or removing one of their edges stays O(1); removing
+    one moves the hub's last neighbor into its place.
     """
+    vertex_class = Vertex
+
     def __init__(self, is_directed=True):
         """
-        Initialize a graph object with an empty vertex dictionary.
+        Initialize a graph object with no vertices.
 
         Parameters:
         is_directed (boolean): Whether the graph is directed (edges go in only one direction).
         """
-        self.vertex_dict = {} # id -> object
         self.is_directed = is_directed
-        # print("self.is_directed: {}".format(self.is_directed))
+        self.index = {} # id -> handle
+        self.ids = [] # handle -> id, or None once removed
+        self.positions = {} # handle -> (x, y), for vertices that have one
+        self.starts = array('q') # handle -> first position of its neighbors
+        self.degrees = array('i') # handle -> number of neighbors
+        self.capacities = array('i') # handle -> positions reserved for neighbors
+        self.targets = array('i') # neighbor handles
+        self.weights = None # edge weights, parallel to targets, in a WeightedGraph
+        self.arc_count = 0 # positions in use, one per edge direction stored
+        self.version = 0 # bumped on every change, see _graph_changed
+        self.path_cache = None # opt-in, see enable_path_cache
+        self.listeners = [] # told about each edge change, see add_listener
+        self.stats = None # opt-in, see enable_stats
+        self._reverse = None # incoming arcs, built on demand
+        self.hubs = {} # handle -> {neighbor handle: offset in its slice}, for high-degree vertices
+
+    @property
+    def vertex_dict(self):
+        """A read-only mapping of vertex id -> Vertex."""
+        return VertexMap(self)
+
+    def enable_path_cache(self, max_bytes=64 * 1024 * 1024):
+        """
+        Cache the single-source shortest-path tree of every start vertex that
+        find_shortest_path is called with, so later queries from the same start
+        are answered with a lookup. The cache is cleared whenever the graph
+        changes.
+
+        Parameters:
+        max_bytes (integer): Roughly how much memory the cached trees may use
+        before the least recently used ones are evicted.
+
+        Returns:
+        PathCache: The cache, whose `hits` and `misses` counters can be read.
+        """
+        self.path_cache = PathCache(max_bytes)
+        return self.path_cache
+
+    def disable_path_cache(self):
+        """Stop caching shortest-path trees and drop the cache."""
+        self.path_cache = None
+
+    def enable_stats(self, recorder=None):
+        """
+        Have every algorithm run on this graph report what it did: vertices
+        visited, edges relaxed, frontier pushes and pops, peak frontier size
+        and wall time, grouped by phase. While stats are off (the default)
+        the algorithms skip all of this. See also graphs.stats.collect_stats.
 
-    def add_vertex(self, vertex_id):
+        Parameters:
+        recorder: Where the reports go, a Stats by default. Anything with the
+        same record method will do.
+
+        Returns:
+        The recorder, whose as_dict() exports what has been recorded.
+        """
+        self.stats = Stats() if recorder is None else recorder
+        return self.stats
+
+    def disable_stats(self):
+        """Stop reporting stats."""
+        self.stats = None
+
+    def _timed(self, phase, function, *args):
+        """Return function(*args), recording its wall time as `phase` if stats are on."""
+        stats = self.stats
+        if stats is None:
+            return function(*args)
+        started = time.perf_counter()
+        result = function(*args)
+        stats.record(phase, time.perf_counter() - started)
+        return result
+
+    def _graph_changed(self):
+        """Called after every change to the vertices or edges of the graph."""
+        self.version += 1
+        self._reverse = None
+        if self.path_cache is not None:
+            self.path_cache.clear()
+
+    def add_listener(self, listener):
+        """
+        Tell listener about every edge change from now on, so it can update
+        itself incrementally instead of recomputing from scratch.
+
+        Parameters:
+        listener: An object with an edge_changed(vertex_id1, vertex_id2,
+        old_weight, new_weight) method, where old_weight is None for a new
+        edge and new_weight is None for a removed one, and a
+        vertex_removed(vertex_id) method. Unweighted edges have weight 1.
+        Undirected edges are reported once. Both are called after the graph
+        has been changed.
+        """
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """Stop telling listener about changes."""
+        self.listeners.remove(listener)
+
+    def _edge_changed(self, vertex_id1, vertex_id2, old_weight, new_weight):
+        """Pass an edge change on to every listener."""
+        for listener in self.listeners:
+            listener.edge_changed(vertex_id1, vertex_id2, old_weight, new_weight)
+
+    def _vertex(self, handle):
+        """Return a Vertex view of the given handle."""
+        return self.vertex_class(self, handle)
+
+    def _handle(self, vertex_id):
+        """Return the handle of vertex_id, raising KeyError if it is not in the graph."""
+        handle = self.index.get(vertex_id)
+        if handle is None:
+            raise KeyError(f"Vertex {vertex_id!r} is not in the graph!")
+        return handle
+
+    def _neighbor_ids(self, handle):
+        """Return an iterator over the ids of the neighbors of handle."""
+        start = self.starts[handle]
+        return map(self.ids.__getitem__, self.targets[start:start + self.degrees[handle]])
+
+    def _arc_weight(self, position):
+        """Return the weight stored at a position of the adjacency arrays."""
+        return 1 if self.weights is None else self.weights[position]
+
+    def _find_arc(self, handle, neighbor):
+        """Return the position of the arc handle -> neighbor, or -1 if there is none."""
+        start = self.starts[handle]
+        hub = self.hubs.get(handle)
+        if hub is not None:
+            offset = hub.get(neighbor)
+            return -1 if offset is None else start + offset
+        try:
+            return start + self.targets[start:start + self.degrees[handle]].index(neighbor)
+        except ValueError:
+            return -1
+
+    def _index_hub(self, handle):
+        """Build the neighbor -> offset dict of a vertex that has become a hub."""
+        start = self.starts[handle]
+        neighbors = self.targets[start:start + self.degrees[handle]]
+        self.hubs[handle] = {neighbor: offset for offset, neighbor in enumerate(neighbors)}
+
+    def _grow(self, handle):
+        """Double the room reserved for the neighbors of handle."""
+        targets = self.targets
+        weights = self.weights
+        start = self.starts[handle]
+        degree = self.degrees[handle]
+        capacity = self.capacities[handle]
+        new_capacity = max(2, 2 * capacity)
+
+        if start + capacity == len(targets):
+            # The slice is already at the end of the arrays, so grow it in place
+            targets.frombytes(bytes(targets.itemsize * (new_capacity - capacity)))
+            if weights is not None:
+                weights.frombytes(bytes(weights.itemsize * (new_capacity - capacity)))
+        else:
+            # Move the slice to the end, leaving its old room behind
+            new_start = len(targets)
+            targets.extend(targets[start:start + degree])
+            targets.frombytes(bytes(targets.itemsize * (new_capacity - degree)))
+            if weights is not None:
+                weights.extend(weights[start:start + degree])
+                weights.frombytes(bytes(weights.itemsize * (new_capacity - degree)))
+            self.starts[handle] = new_start
+        self.capacities[handle] = new_capacity
+
+    def compact(self):
+        """
+        Pack the adjacency arrays so each vertex's neighbors take exactly the
+        room they need, dropping the space left by slices that moved. This is
+        done automatically once the arrays are mostly unused space.
+        """
+        targets = self.targets
+        weights = self.weights
+        new_targets = array(targets.typecode)
+        new_weights = array(weights.typecode) if weights is not None else None
+        starts, degrees, capacities = self.starts, self.degrees, self.capacities
+
+        for handle in range(len(self.ids)):
+            start, degree = starts[handle], degrees[handle]
+            starts[handle] = len(new_targets)
+            capacities[handle] = degree
+            new_targets.extend(targets[start:start + degree])
+            if weights is not None:
+                new_weights.extend(weights[start:start + degree])
+
+        # Replace the contents rather than the arrays, so any running
+        # traversal that holds on to them sees the new layout
+        targets[:] = new_targets
+        if weights is not None:
+            weights[:] = new_weights
+
+    def _maybe_compact(self):
+        """Compact once more than a fifth of the adjacency arrays is unused."""
+        if len(self.targets) > 64 and len(self.targets) * 4 > self.arc_count * 5:
+            self.compact()
+
+    def _load_adjacency(self, offsets, targets, weights=None):
+        """
+        Set every vertex's neighbors at once from CSR arrays indexed by handle,
+        for building a graph in bulk: handle h's neighbors are
+        targets[offsets[h]:offsets[h + 1]]. The graph must have no edges yet,
+        there must be no repeated arcs, and undirected edges must be given in
+        both directions. Listeners are not told about the new edges.
+
+        Parameters:
+        offsets (array('q')): len(ids) + 1 positions into targets.
+        targets (array('i')): Neighbor handles.
+        weights (array('d')): Edge weights alongside targets, for a WeightedGraph.
+        """
+        if self.arc_count:
+            raise ValueError("Adjacency can only be loaded into a graph with no edges")
+
+        count = len(self.ids)
+        self.starts[:] = offsets[:count]
+        self.degrees[:] = array('i', [end - start for start, end in zip(offsets, offsets[1:])])
+        self.capacities[:] = self.degrees
+        self.targets[:] = targets
+        if self.weights is not None:
+            self.weights[:] = weights
+        self.arc_count = len(targets)
+        for handle in range(count):
+            if self.degrees[handle] >= HUB_DEGREE:
+                self._index_hub(handle)
+        self._graph_changed()
+
+    def _add_arc(self, handle, neighbor, weight):
+        """
+        Add or reweight the one-way arc handle -> neighbor.
+
+        Returns:
+        number: The arc's old weight, or None if it is new.
+        """
+        position = self._find_arc(handle, neighbor)
+        if position >= 0:
+            old_weight = self._arc_weight(position)
+            if self.weights is not None:
+                self.weights[position] = weight
+            return old_weight
+
+        degree = self.degrees[handle]
+        if degree == self.capacities[handle]:
+            self._grow(handle)
+        position = self.starts[handle] + degree
+        self.targets[position] = neighbor
+        if self.weights is not None:
+            self.weights[position] = weight
+        self.degrees[handle] = degree + 1
+        self.arc_count += 1
+
+        hub = self.hubs.get(handle)
+        if hub is not None:
+            hub[neighbor] = degree
+        elif degree + 1 >= HUB_DEGREE:
+            self._index_hub(handle)
+        return None
+
+    def _remove_arc(self, handle, position):
+        """
+        Remove the arc at position from the neighbors of handle, keeping their
+        order. A hub instead moves its last arc into the gap, so removing
+        from it does not have to shift and reindex the rest of its slice.
+        """
+        start = self.starts[handle]
+        end = start + self.degrees[handle]
+        hub = self.hubs.get(handle)
+        if hub is not None:
+            del hub[self.targets[position]]
+            if position != end - 1:
+                last = self.targets[end - 1]
+                self.targets[position] = last
+                if self.weights is not None:
+                    self.weights[position] = self.weights[end - 1]
+                hub[last] = position - start
+            self.degrees[handle] -= 1
+            self.arc_count -= 1
+            return
+        self.targets[position:end - 1] = self.targets[position + 1:end]
+        if self.weights is not None:
+            self.weights[position:end - 1] = self.weights[position + 1:end]
+        self.degrees[handle] -= 1
+        self.arc_count -= 1
+
+    def _add_edge_handles(self, handle1, handle2, weight):
+        """Add an edge in one direction, or both if undirected, and return its old weight (or None)."""
+        old_weight = self._add_arc(handle1, handle2, weight)
+        if not self.is_directed and handle1 != handle2:
+            self._add_arc(handle2, handle1, weight)
+        return old_weight
+
+    def _new_handle(self, vertex_id, position=None):
+        """Intern vertex_id as a new handle with no neighbors."""
+        handle = len(self.ids)
+        self.index[vertex_id] = handle
+        self.ids.append(vertex_id)
+        self.starts.append(len(self.targets))
+        self.degrees.append(0)
+        self.capacities.append(0)
+        if position is not None:
+            self.positions[handle] = position
+        return handle
+
+    def add_vertex(self, vertex_id, position=None):
         """
         Add a new vertex object to the graph with the given key and return the vertex.
-        
+        If the vertex already exists it keeps its edges, and only its position
+        is updated (if one is given).
+
         Parameters:
         vertex_id (string): The unique identifier for the new vertex.
+        position (tuple): Optional (x, y) coordinates of the vertex.
 
         Returns:
         Vertex: The new vertex object.
         """
-        self.vertex_dict[vertex_id] = Vertex(vertex_id)
-        return self.vertex_dict[vertex_id]
-        
+        handle = self.index.get(vertex_id)
+        if handle is None:
+            handle = self._new_handle(vertex_id, position)
+        elif position is not None:
+            self.positions[handle] = position
+        self._graph_changed()
+        return self._vertex(handle)
+
     def get_vertex(self, vertex_id):
         """Return the vertex if it exists."""
-        if vertex_id not in self.vertex_dict:
+        handle = self.index.get(vertex_id)
+        if handle is None:
             return None
 
-        vertex_obj = self.vertex_dict[vertex_id]
-        return vertex_obj
+        return self._vertex(handle)
 
     def add_edge(self, vertex_id1, vertex_id2):
         """
@@ -88,26 +546,175 @@ class Graph:
         vertex_id1 (string): The unique identifier of the first vertex.
         vertex_id2 (string): The unique identifier of the second vertex.
         """
-        vertex1 = self.get_vertex(vertex_id1)
-        vertex2 = self.get_vertex(vertex_id2)
-        # print("Vertex Id 1 {} Vertex Id 2 {}".format(vertex_id1, vertex_id2))
-        vertex1.add_neighbor(vertex2)
-        
-        if self.is_directed == False:
-            # print("is undirected")
-            vertex2.add_neighbor(vertex1)
-        
+        handle1 = self._handle(vertex_id1)
+        handle2 = self._handle(vertex_id2)
+        old_weight = self._add_edge_handles(handle1, handle2, 1)
+
+        self._graph_changed()
+        if old_weight is None:
+            self._edge_changed(vertex_id1, vertex_id2, None, 1)
+
+    def add_edges(self, edges):
+        """
+        Add many edges at once. Unlike calling add_vertex then add_edge, missing
+        vertices are created and existing vertices keep their neighbors.
+
+        Parameters:
+        edges (iterable<tuple>): (vertex_id1, vertex_id2) pairs.
+        """
+        index = self.index
+        listeners = self.listeners
+
+        for vertex_id1, vertex_id2 in edges:
+            handle1 = index.get(vertex_id1)
+            if handle1 is None:
+                handle1 = self._new_handle(vertex_id1)
+            handle2 = index.get(vertex_id2)
+            if handle2 is None:
+                handle2 = self._new_handle(vertex_id2)
+
+            old_weight = self._add_edge_handles(handle1, handle2, 1)
+            if listeners and old_weight is None:
+                self._edge_changed(vertex_id1, vertex_id2, None, 1)
+
+        self._maybe_compact()
+        self._graph_changed()
+
+    def _remove_edge(self, handle1, handle2, position):
+        """Remove the edge whose arc handle1 -> handle2 is at position and tell the listeners, without bumping the version."""
+        old_weight = self._arc_weight(position)
+        self._remove_arc(handle1, position)
+        if not self.is_directed and handle1 != handle2:
+            self._remove_arc(handle2, self._find_arc(handle2, handle1))
+        self._edge_changed(self.ids[handle1], self.ids[handle2], old_weight, None)
+
+    def _edge_position(self, vertex_id1, vertex_id2):
+        """Return (handle1, handle2, position) of an edge, raising KeyError if there is no such edge."""
+        handle1 = self.index.get(vertex_id1)
+        handle2 = self.index.get(vertex_id2)
+        position = -1
+        if handle1 is not None and handle2 is not None:
+            position = self._find_arc(handle1, handle2)
+        if position < 0:
+            raise KeyError(f"No edge from {vertex_id1!r} to {vertex_id2!r}")
+        return handle1, handle2, position
+
+    def get_edge_weight(self, vertex_id1, vertex_id2):
+        """Return the weight of the edge from `vertex_id1` to `vertex_id2` (1 if unweighted)."""
+        _, _, position = self._edge_position(vertex_id1, vertex_id2)
+        return self._arc_weight(position)
+
+    def remove_edge(self, vertex_id1, vertex_id2):
+        """
+        Remove the edge from `vertex_id1` to `vertex_id2` (in both directions if
+        the graph is undirected).
+
+        Parameters:
+        vertex_id1 (string): The unique identifier of the first vertex.
+        vertex_id2 (string): The unique identifier of the second vertex.
+        """
+        self._remove_edge(*self._edge_position(vertex_id1, vertex_id2))
+        self._graph_changed()
+
+    def remove_vertex(self, vertex_id):
+        """
+        Remove a vertex and every edge into or out of it.
+
+        In an undirected graph this only touches the vertex's own neighbors. A
+        directed graph does not store incoming edges, so finding them takes a
+        pass over every vertex.
+
+        Parameters:
+        vertex_id (string): The unique identifier of the vertex to remove.
+        """
+        handle = self.index.get(vertex_id)
+        if handle is None:
+            raise KeyError("Vertex not in graph")
+
+        while self.degrees[handle]:
+            last = self.starts[handle] + self.degrees[handle] - 1
+            self._remove_edge(handle, self.targets[last], last)
+        if self.is_directed:
+            for other in self.index.values():
+                position = self._find_arc(other, handle)
+                if position >= 0:
+                    self._remove_edge(other, handle, position)
+
+        # The handle is never reused; its room in the arrays is reclaimed by compact()
+        del self.index[vertex_id]
+        self.ids[handle] = None
+        self.positions.pop(handle, None)
+        self.hubs.pop(handle, None)
+        self.capacities[handle] = 0
+        self._graph_changed()
+        for listener in self.listeners:
+            listener.vertex_removed(vertex_id)
+
+    def neighbor_ids(self, vertex_id):
+        """
+        Return an iterator over the ids of the neighbors of vertex_id, without
+        building a list or any Vertex objects.
+        """
+        return self._neighbor_ids(self._handle(vertex_id))
+
+    def neighbors_with_weights(self, vertex_id):
+        """
+        Return an iterator over (neighbor id, edge weight) pairs for vertex_id.
+        Every edge of an unweighted graph has weight 1.
+        """
+        handle = self._handle(vertex_id)
+        neighbor_ids = self._neighbor_ids(handle)
+        if self.weights is None:
+            return zip(neighbor_ids, repeat(1))
+        start = self.starts[handle]
+        return zip(neighbor_ids, self.weights[start:start + self.degrees[handle]])
+
+    def _reverse_arcs(self):
+        """
+        Return (and cache until the graph changes) the incoming arcs of every
+        vertex in CSR form: handle h's in-neighbors are
+        sources[offsets[h]:offsets[h + 1]], with weights alongside if weighted.
+
+        Returns:
+        tuple(array, array, array): offsets, sources and weights (None if unweighted).
+        """
+        if self._reverse is None:
+            n = len(self.ids)
+            starts, degrees, targets, weights = self.starts, self.degrees, self.targets, self.weights
+
+            offsets = array('q', [0]) * (n + 1)
+            for handle in self.index.values():
+                start = starts[handle]
+                for neighbor in targets[start:start + degrees[handle]]:
+                    offsets[neighbor + 1] += 1
+            for handle in range(n):
+                offsets[handle + 1] += offsets[handle]
+
+            fill = array('q', offsets)
+            sources = array('i', [0]) * offsets[n]
+            reverse_weights = array('d', [0.0]) * offsets[n] if weights is not None else None
+            for handle in self.index.values():
+                start = starts[handle]
+                for position in range(start, start + degrees[handle]):
+                    neighbor = targets[position]
+                    sources[fill[neighbor]] = handle
+                    if weights is not None:
+                        reverse_weights[fill[neighbor]] = weights[position]
+                    fill[neighbor] += 1
+            self._reverse = (offsets, sources, reverse_weights)
+        return self._reverse
+
     def get_vertices(self):
         """
         Return all vertices in the graph.
-        
+
         Returns:
         List<Vertex>: The vertex objects contained in the graph.
         """
-        return list(self.vertex_dict.values())
+        return [self._vertex(handle) for handle in self.index.values()]
 
     def contains_id(self, vertex_id):
-        return vertex_id in self.vertex_dict
+        return vertex_id in self.index
 
     def __str__(self):
         """Return a string representation of the graph."""
@@ -117,33 +724,58 @@ class Graph:
         """Return a string representation of the graph."""
         return self.__str__()
 
-    def bfs_traversal(self, start_id):
+    def bfs_order(self, start_id):
         """
-        Traverse the graph using breadth-first search.
+        Generate the ids of all vertices reachable from start_id in
+        breadth-first order.
         """
         if not self.contains_id(start_id):
-            raise KeyError("One or both vertices are not in the graph!")
+            raise KeyError("Start id not in graph")
 
-        # Keep a set to denote which vertices we've seen before
-        seen = set()
-        seen.add(start_id)
+        ids, starts, degrees, targets = self.ids, self.starts, self.degrees, self.targets
+        start = self.index[start_id]
 
-        # Keep a queue so that we visit vertices in the appropriate order
+        # Mark which vertex handles we've seen before
+        seen = bytearray(len(ids))
+        seen[start] = 1
+
+        # Keep a FIFO queue so that we visit vertices in the appropriate order
         queue = deque()
-        queue.append(self.get_vertex(start_id))
+        queue.append(start)
+        append, popleft = queue.append, queue.popleft
+        stats = self.stats
+        if stats is not None:
+            probe = FrontierProbe(queue, degrees)
+            append, popleft = probe.append, probe.popleft
+            started = time.perf_counter()
 
-        while queue:
-            current_vertex_obj = queue.pop()
-            current_vertex_id = current_vertex_obj.get_id()
+        try:
+            while queue:
+                current = popleft()
+                yield ids[current]
+
+                # Add its neighbors to the queue
+                offset = starts[current]
+                for neighbor in targets[offset:offset + degrees[current]]:
+                    if not seen[neighbor]:
+                        seen[neighbor] = 1
+                        append(neighbor)
+        finally:
+            # Also reached if the caller stops early
+            if stats is not None:
+                probe.report(stats, 'bfs', started)
 
-            # Process current node
-            print('Processing vertex {}'.format(current_vertex_id))
+    def bfs_traversal(self, start_id, visit=None):
+        """
+        Traverse the graph using breadth-first search.
 
-            # Add its neighbors to the queue
-            for neighbor in current_vertex_obj.get_neighbors():
-                if neighbor.get_id() not in seen:
-                    seen.add(neighbor.get_id())
-                    queue.append(neighbor)
+        Parameters:
+        start_id (string): The id of the start vertex.
+        visit (callable): Called with each vertex id as it is processed.
+        """
+        for vertex_id in self.bfs_order(start_id):
+            if visit is not None:
+                visit(vertex_id)
 
         return # everything has been processed
 
@@ -161,43 +793,107 @@ class Graph:
         if not self.contains_id(start_id) or not self.contains_id(target_id):
             raise KeyError("One or both vertices are not in the graph!")
 
-        # vertex keys we've seen before and their paths from the start vertex
-        vertex_id_to_path = {
-            start_id: [start_id] # only one thing in the path
-        }
+        if self.path_cache is not None:
+            _, previous = self._cached_tree(start_id)
+            if target_id not in previous: # path not found
+                return None
+            return self._build_path(previous, target_id)
 
-        # queue of vertices to visit next
-        queue = deque() 
-        queue.append(self.get_vertex(start_id))
+        starts, degrees, targets = self.starts, self.degrees, self.targets
+        start = self.index[start_id]
+        target = self.index[target_id]
 
-        # while queue is not empty
-        while queue:
-            current_vertex_obj = queue.pop() # vertex obj to visit next
-            current_vertex_id = current_vertex_obj.get_id()
+        # vertex handles we've seen before -> the handle we reached them from
+        previous = {start: start}
 
-            # found target, can stop the loop early
-            if current_vertex_id == target_id:
-                break
+        # queue of vertex handles to visit next
+        queue = deque()
+        queue.append(start)
+        append, popleft = queue.append, queue.popleft
+        stats = self.stats
+        if stats is not None:
+            probe = FrontierProbe(queue, degrees)
+            append, popleft = probe.append, probe.popleft
+            started = time.perf_counter()
+
+        # while queue is not empty and the target has not been found
+        while queue and target not in previous:
+            current = popleft()
+            offset = starts[current]
+            for neighbor in targets[offset:offset + degrees[current]]:
+                if neighbor not in previous:
+                    previous[neighbor] = current
+                    append(neighbor)
 
-            neighbors = current_vertex_obj.get_neighbors()
-            for neighbor in neighbors:
-                if neighbor.get_id() not in vertex_id_to_path:
-                    current_path = vertex_id_to_path[current_vertex_id]
-                    # extend the path by 1 vertex
-                    next_path = current_path + [neighbor.get_id()]
-                    vertex_id_to_path[neighbor.get_id()] = next_path
-                    queue.append(neighbor)
-                    # print(vertex_id_to_path)
-
-        if target_id not in vertex_id_to_path: # path not found
+        if stats is not None:
+            probe.report(stats, 'bfs_path', started)
+        if target not in previous: # path not found
             return None
 
-        return vertex_id_to_path[target_id]
+        path = [target]
+        while path[-1] != start:
+            path.append(previous[path[-1]])
+        path.reverse()
+        return [self.ids[handle] for handle in path]
+
+    def _shortest_path_tree(self, start_id):
+        """
+        Run a full breadth-first search from start_id.
+
+        Returns:
+        tuple(dict, dict): Vertex id -> number of hops from start_id, and
+        vertex id -> previous vertex id on a fewest-hop path.
+        """
+        ids, starts, degrees, targets = self.ids, self.starts, self.degrees, self.targets
+        distance = {start_id: 0}
+        previous = {start_id: None}
+
+        queue = deque()
+        queue.append(self.index[start_id])
+        append, popleft = queue.append, queue.popleft
+        stats = self.stats
+        if stats is not None:
+            probe = FrontierProbe(queue, degrees)
+            append, popleft = probe.append, probe.popleft
+            started = time.perf_counter()
+
+        while queue:
+            current = popleft()
+            current_id = ids[current]
+            offset = starts[current]
+            for neighbor in targets[offset:offset + degrees[current]]:
+                neighbor_id = ids[neighbor]
+                if neighbor_id not in distance:
+                    distance[neighbor_id] = distance[current_id] + 1
+                    previous[neighbor_id] = current_id
+                    append(neighbor)
+
+        if stats is not None:
+            probe.report(stats, 'bfs_tree', started)
+        return distance, previous
+
+    def _cached_tree(self, start_id):
+        """Return the shortest-path tree from start_id, from the path cache if possible."""
+        tree = self.path_cache.get(start_id)
+        if tree is None:
+            tree = self._shortest_path_tree(start_id)
+            self.path_cache.put(start_id, tree)
+        return tree
+
+    def _build_path(self, previous, target_id):
+        """Walk the `previous` map back from target_id and return the path."""
+        path = []
+        current_id = target_id
+        while current_id is not None:
+            path.append(current_id)
+            current_id = previous[current_id]
+        path.reverse()
+        return path
 
     def find_vertices_n_away(self, start_id, target_distance):
         """
         Find and return all vertices n distance away.
-        
+
         Arguments:
         start_id (string): The id of the start vertex.
         target_distance (integer): The distance from the start vertex we are looking for
@@ -207,290 +903,396 @@ class Graph:
         """
         if not self.contains_id(start_id):
             raise KeyError("Start id not in graph")
-        
-        queue = deque()
-        queue.append((start_id, 0))
-        
-        visited = set()
-        visited.add(start_id)
-        
-        solution = []
 
-        while queue:
-            # Visit the next object after the first
-            current_vert = queue.pop()
-            
-            # Get the neighbors
-            neighbors = self.get_vertex(current_vert[0]).get_neighbors()
-            
-            # If the vertex is at the target distance, add it to the solution
-            if current_vert[1] == target_distance:
-                solution.append(current_vert[0])
-                
-            # Check the current vertex's neighbors
-            for neighbor in neighbors:
-                if neighbor.get_id() not in visited:
-                    queue.append((neighbor.get_id(), current_vert[1] + 1))
-                    visited.add(neighbor.get_id())
-        
-        return solution
+        starts, degrees, targets = self.starts, self.degrees, self.targets
+        start = self.index[start_id]
+        visited = bytearray(len(self.ids))
+        visited[start] = 1
+
+        stats = self.stats
+        if stats is not None:
+            started = time.perf_counter()
+            peak = 1
+
+        # Expand one whole level at a time, stopping at the target distance
+        level = [start]
+        for _ in range(target_distance):
+            next_level = []
+            for current in level:
+                offset = starts[current]
+                for neighbor in targets[offset:offset + degrees[current]]:
+                    if not visited[neighbor]:
+                        visited[neighbor] = 1
+                        next_level.append(neighbor)
+            level = next_level
+            if not level:
+                break
+            if stats is not None:
+                peak = max(peak, len(level))
+
+        if stats is not None:
+            # Every visited vertex was expanded except those in the last level
+            reached = len(visited) - visited.count(0)
+            expanded_edges = sum(compress(degrees, visited)) - sum(degrees[handle] for handle in level)
+            stats.record('bfs_levels', time.perf_counter() - started, reached, expanded_edges,
+                         reached, reached - len(level), peak)
+        return [self.ids[handle] for handle in level]
 
     def is_bipartite(self):
         """
         Return True if the graph is bipartite, and False otherwise.
+
+        Every component is 2-coloured with a breadth-first search; an edge
+        between two vertices of the same colour means there is an odd cycle.
+        Edge directions are ignored, so directed graphs also follow their
+        incoming edges.
         """
-        # Get the starting vertex
-        vertex_list = self.get_vertices()
-        root = vertex_list[0]
-        
-        # Start the queue and first object
+        starts, degrees, targets = self.starts, self.degrees, self.targets
+        if self.is_directed:
+            offsets, sources, _ = self._reverse_arcs()
+
+        # 0 for unvisited, otherwise 1 (red) or 2 (blue)
+        colour = bytearray(len(self.ids))
+
+        # One queue serves every component, since it is empty between them
         queue = deque()
-        queue.append(root)
-        
-        # Keep count of the visited vertices so we don't check them twice
-        visited = set()
-        
-        # Instantiate a red set and blue set
-        red = set()
-        blue = set()
-        
-        i = 0
-        
-        # Set the root for red to build from
-        red.add(root)
-        
-        while queue:
-            color_set = []
-            opp_set = []
-            
-            # Get the color from whatever we pop off the queue
-            # Get the next vertex
-            vertex = queue.popleft()
-            if vertex in red:
-                color_set, opp_set = red, blue
-            else: 
-                color_set, opp_set = blue, red
-                
-            
-            visited.add(vertex)
-
-            # Go through each neighbor from the vertex and add it into the corresponding set
-            for neighbor in vertex.get_neighbors():
-                # Only add the neighboring vertex if it has not been visited
-                if neighbor not in visited:
-                    queue.append(neighbor)
-                    
-                # If it's the same color, return False
-                if neighbor in color_set:
-                    return False
-                
-                # add the neighboring vertexes into the opposite color set
-                opp_set.add(neighbor)
-            i += 1
+        append, popleft = queue.append, queue.popleft
+        stats = self.stats
+        if stats is not None:
+            probe = FrontierProbe(queue, degrees)
+            append, popleft = probe.append, probe.popleft
+            started = time.perf_counter()
+
+        for root in self.index.values():
+            if colour[root]:
+                continue
+            colour[root] = 1
+            append(root)
+
+            while queue:
+                current = popleft()
+                opposite = 3 - colour[current]
+                offset = starts[current]
+                neighbors = targets[offset:offset + degrees[current]]
+                if self.is_directed:
+                    neighbors += sources[offsets[current]:offsets[current + 1]]
+
+                for neighbor in neighbors:
+                    if not colour[neighbor]:
+                        colour[neighbor] = opposite
+                        append(neighbor)
+                    elif colour[neighbor] != opposite:
+                        # If it's the same color, return False
+                        if stats is not None:
+                            probe.report(stats, 'bipartite', started)
+                        return False
+
         # Otherwise, the graph is bipartite
+        if stats is not None:
+            probe.report(stats, 'bipartite', started)
         return True
-    
-    # Got some of this from @github.com/squeaky1273
+
     def get_connected_components(self):
         """
         Return a list of all connected components, with each connected component
         represented as a list of vertex ids.
         """
-        visited = []
-        queue = deque()
-        final = []
-        
-        def connectionHelper(current):
-            connections = []
-            queue.append(current)
-        
-            # While there's still vertexes in the queue
-            while queue:
-                # Get the next vertex
-                current = queue.pop()
-                connections.append(current)
-                
-                # Get the neighbors for the current node
-                print('Current: {}'.format(current))
-                neighbors = self.get_vertex(current).get_neighbors()
-                print(neighbors)
-                
-                # Go through all the neighbors and append them to the current vertex's list[Not working, returning list of vertices]
-                for neighbor in neighbors:
-                    if neighbor.get_id() not in visited:
-                        queue.append(neighbor.get_id())
-                        visited.append(neighbor.get_id())
-                visited.append(current)
-                
-            return connections
-
-        
-        for vertex in self.get_vertices():
-            vert_id = vertex.get_id()
-            if vert_id not in visited:
-                connects = connectionHelper(vert_id)
-                visited.append(vert_id)
-                final.append(connects)
-        
-        return final
-            
-    
+        ids, starts, degrees, targets = self.ids, self.starts, self.degrees, self.targets
+        visited = bytearray(len(ids))
+        components = []
+        if self.stats is not None:
+            started = time.perf_counter()
+
+        for root in self.index.values():
+            if visited[root]:
+                continue
+
+            # Breadth-first search from root, sharing `visited` across components
+            visited[root] = 1
+            component = [root]
+            for current in component:
+                offset = starts[current]
+                for neighbor in targets[offset:offset + degrees[current]]:
+                    if not visited[neighbor]:
+                        visited[neighbor] = 1
+                        component.append(neighbor)
+            components.append([ids[handle] for handle in component])
+
+        if self.stats is not None:
+            # Every vertex is reached and expanded exactly once
+            self.stats.record('components', time.perf_counter() - started, len(self.index),
+                              self.arc_count, len(self.index), len(self.index),
+                              max(map(len, components), default=0))
+        return components
+
+
     def find_path_dfs_iter(self, start_id, target_id):
         """
         Use DFS with a stack to find a path from start_id to target_id.
+
+        Returns:
+        list<string>: The vertex ids on the path found, or None if target_id
+        cannot be reached.
         """
-        # Start by adding the start to the visited
-        visited = {start_id: [start_id]}
-        
+        if not self.contains_id(start_id) or not self.contains_id(target_id):
+            raise KeyError("One or both vertices are not in the graph!")
+
+        starts, degrees, targets = self.starts, self.degrees, self.targets
+        start = self.index[start_id]
+        target = self.index[target_id]
+
+        # Vertex handle -> the handle it was first reached from
+        previous = {start: start}
+
         # Create a stack for DFS
-        stack = set()
-        stack.add(self.get_vertex(start_id))
-        
+        stack = [start]
+        push, pop = stack.append, stack.pop
+        stats = self.stats
+        if stats is not None:
+            probe = FrontierProbe(stack, degrees)
+            push, pop = probe.append, probe.pop
+            started = time.perf_counter()
+
         while stack:
             # Start off by getting a vertex
-            vertex = stack.pop() 
-            vert_id = vertex.get_id()
-            
-            # Get all the neighbors for the current vertex
-            neighbors = vertex.get_neighbors()
-            
+            current = pop()
+
             # Edge case
-            if vert_id == target_id:
+            if current == target:
                 break
-            
-            # Build the path
-            for neighbor in neighbors:
-                n_id = neighbor.get_id()
-                
-                if n_id not in visited:
-                    stack.add(neighbor)
-                    path = visited[vert_id]
-                    path = path + [n_id]
-                    visited[n_id] = path
-        
-        return visited[target_id]
-    
-    def dfs_traversal(self, start_id):
-        """Visit each vertex, starting with start_id, in DFS order."""
-
-        visited = set() # set of vertices we've visited so far
-
-        def dfs_traversal_recursive(start_vertex):
-            print(f'Visiting vertex {start_vertex.get_id()}')
-
-            # recurse for each vertex in neighbors
-            for neighbor in start_vertex.get_neighbors():
-                if neighbor.get_id() not in visited:
-                    visited.add(neighbor.get_id())
-                    dfs_traversal_recursive(neighbor)
-            return
 
-        visited.add(start_id)
-        start_vertex = self.get_vertex(start_id)
-        dfs_traversal_recursive(start_vertex)
-
-    def cycle_helper(self, vertex, visited, stack):
-        """Goes through the neighbors of a vertex and determines if it contains a cycle. 
-        This is better as a helper function because it needs to be run once for each vertex and it's easier to do that recursively"""
-        
-        cycle = False
-        visited.add(vertex)
-        stack.append(vertex)
-        neighbors = vertex.get_neighbors()
-        
-        for neighbor in neighbors:
-            # If it's not already visited, check it's paths for a cycle
-            if neighbor not in visited:
-                cycle = self.cycle_helper(neighbor, visited, stack)
-            
-            # Otherwise, if it finds a neighbor already in a stack, it's a cycle
-            elif neighbor in stack:
-                return True
-            
-        stack.remove(vertex)
-        
-        if cycle == True:
-            return True
+            offset = starts[current]
+            for neighbor in targets[offset:offset + degrees[current]]:
+                if neighbor not in previous:
+                    previous[neighbor] = current
+                    push(neighbor)
+
+        if stats is not None:
+            # The target itself was popped but not expanded
+            probe.report(stats, 'dfs_path', started,
+                         edges_relaxed=probe.edges - (degrees[target] if target in previous else 0))
+        if target not in previous:
+            return None
+
+        # Build the path
+        path = [target]
+        while path[-1] != start:
+            path.append(previous[path[-1]])
+        path.reverse()
+        return [self.ids[handle] for handle in path]
+
+    def dfs_order(self, start_id):
+        """
+        Generate the ids of all vertices reachable from start_id in depth-first
+        (preorder) order, using an explicit stack so long chains cannot hit
+        Python's recursion limit.
+        """
+        if not self.contains_id(start_id):
+            raise KeyError("Start id not in graph")
+
+        ids, starts, degrees, targets = self.ids, self.starts, self.degrees, self.targets
+        start = self.index[start_id]
+        visited = bytearray(len(ids))
+        visited[start] = 1
+        yield start_id
+
+        # Each stack entry is an iterator over the neighbors a vertex has left
+        # to explore, which is exactly what a recursive call keeps
+        stack = [iter(targets[starts[start]:starts[start] + degrees[start]])]
+        push, pop = stack.append, stack.pop
+        stats = self.stats
+        if stats is not None:
+            probe = FrontierProbe(stack)
+            push, pop = probe.append, probe.pop
+            started = time.perf_counter()
+
+        try:
+            while stack:
+                for neighbor in stack[-1]:
+                    if not visited[neighbor]:
+                        visited[neighbor] = 1
+                        yield ids[neighbor]
+                        offset = starts[neighbor]
+                        push(iter(targets[offset:offset + degrees[neighbor]]))
+                        break
+                else:
+                    # Every neighbor has been explored, so backtrack
+                    pop()
+        finally:
+            # Also reached if the caller stops early
+            if stats is not None:
+                probe.report(stats, 'dfs', started, edges_relaxed=sum(compress(degrees, visited)))
+
+    def dfs_traversal(self, start_id, visit=None):
+        """
+        Visit each vertex, starting with start_id, in DFS order.
+
+        Parameters:
+        start_id (string): The id of the start vertex.
+        visit (callable): Called with each vertex id as it is visited.
+        """
+        for vertex_id in self.dfs_order(start_id):
+            if visit is not None:
+                visit(vertex_id)
+
+    def cycle_helper(self, start_id, colour):
+        """
+        Run a depth-first search from start_id and return True if it finds an
+        edge back to a vertex that is still on the search stack.
+
+        Unvisited (white) vertices have colour 0. A vertex is grey while its
+        descendants are being explored and black once they are all done, so
+        the on-stack check is a single array lookup.
+
+        Arguments:
+        start_id (string): The id of an unvisited vertex to search from.
+        colour (bytearray): Vertex handle -> 0, GREY or BLACK, shared between
+        searches.
+        """
+        starts, degrees, targets = self.starts, self.degrees, self.targets
+        start = self.index[start_id]
+        colour[start] = GREY
+
+        # The grey vertices, in order, and the neighbors each has left to explore
+        path = [start]
+        stack = [iter(targets[starts[start]:starts[start] + degrees[start]])]
+        push, pop = path.append, path.pop
+        stats = self.stats
+        if stats is not None:
+            # Each vertex's edges are counted when it turns black
+            probe = FrontierProbe(path, degrees)
+            push, pop = probe.append, probe.pop
+            started = time.perf_counter()
+
+        while stack:
+            for neighbor in stack[-1]:
+                neighbor_colour = colour[neighbor]
+                if neighbor_colour == GREY:
+                    # back edge, so there is a cycle
+                    if stats is not None:
+                        probe.report(stats, 'cycle_search', started,
+                                     edges_relaxed=probe.edges + sum(degrees[handle] for handle in path))
+                    return True
+                if not neighbor_colour:
+                    colour[neighbor] = GREY
+                    push(neighbor)
+                    offset = starts[neighbor]
+                    stack.append(iter(targets[offset:offset + degrees[neighbor]]))
+                    break
+            else:
+                colour[pop()] = BLACK
+                stack.pop()
+
+        if stats is not None:
+            probe.report(stats, 'cycle_search', started)
+        return False
 
     def contains_cycle(self):
         """
         Return True if the directed graph contains a cycle, False otherwise.
         """
-        visited = set()
-        values = self.vertex_dict.values()
-        stack = []
-        
-        # Go through the graph and check if nodes are visited
-        for v in values:
-            if v in visited:
-                return False
-        # If they aren't, check them for cycles
-            else:
-                if self.cycle_helper(v, visited, stack) == True:
-                    return True
-        
+        colour = bytearray(len(self.ids))
+
+        # Search from every vertex that an earlier search has not reached
+        for vertex_id, handle in self.index.items():
+            if not colour[handle] and self.cycle_helper(vertex_id, colour):
+                return True
+
         return False
-    
-    def top_sort_helper(self, vertex, visited, stack):
-        """Helper function to recursively check all neighbors of a vertex"""
-        visited.add(vertex)
-        neighbors = vertex.get_neighbors()
-        
-        for neighbor in neighbors:
-            if neighbor not in visited:
-                self.top_sort_helper(neighbor, visited, stack)
-        
-        stack.append(vertex)
-        return stack
-        
-    
+
+    def topological_order(self):
+        """
+        Generate the vertex ids of a directed acyclic graph in a valid
+        topological order, using Kahn's algorithm.
+
+        Each vertex is yielded as soon as all of the vertices with edges into
+        it have been, so callers can start on the first vertices before the
+        whole order is known. If the graph contains a cycle, the vertices on
+        and after it never become ready and a ValueError is raised once
+        everything else has been yielded.
+        """
+        ids, starts, degrees, targets = self.ids, self.starts, self.degrees, self.targets
+
+        # Count the edges coming into each vertex
+        in_degree = array('i', [0]) * len(ids)
+        for handle in self.index.values():
+            offset = starts[handle]
+            for neighbor in targets[offset:offset + degrees[handle]]:
+                in_degree[neighbor] += 1
+
+        # Start with the vertices nothing points to
+        ready = deque(handle for handle in self.index.values() if in_degree[handle] == 0)
+        emitted = 0
+        append, popleft = ready.append, ready.popleft
+        stats = self.stats
+        if stats is not None:
+            probe = FrontierProbe(ready, degrees)
+            append, popleft = probe.append, probe.popleft
+            started = time.perf_counter()
+
+        try:
+            while ready:
+                current = popleft()
+                yield ids[current]
+                emitted += 1
+
+                # Removing this vertex may leave some of its neighbors ready
+                offset = starts[current]
+                for neighbor in targets[offset:offset + degrees[current]]:
+                    in_degree[neighbor] -= 1
+                    if in_degree[neighbor] == 0:
+                        append(neighbor)
+        finally:
+            # Also reached if the caller stops early or there is a cycle
+            if stats is not None:
+                probe.report(stats, 'topological_sort', started, vertices_visited=probe.pops)
+
+        if emitted < len(self.index):
+            raise ValueError("Graph contains a cycle, so it has no topological order")
+
     def topological_sort(self):
         """
         Return a valid ordering of vertices in a directed acyclic graph.
         If the graph contains a cycle, throw a ValueError.
         """
-        # Create a stack to hold the vertex ordering.
-        stack = []
-        visited = set()
-        vertices = self.vertex_dict.values()
-        
-        # For each unvisited vertex, execute a DFS from that vertex.
-        # On the way back up the recursion tree (that is, after visiting a 
-        # vertex's neighbors), add the vertex to the stack.
-        if self.contains_cycle() == False:
-            for vertex in vertices:
-                if vertex not in visited:
-                    self.top_sort_helper(vertex, visited, stack) == True
-                    
-            # Reverse the contents of the stack and return it as a valid ordering.
-            order = list()
-            for _ in range(len(self.vertex_dict)):
-                order.append(stack.pop().get_id())
-            return order
-    
-    
-    
-    
+        return list(self.topological_order())
+
+    def betweenness_centrality(self, samples=None, seed=None, workers=1):
+        """
+        Return (vertex id -> betweenness, (start_id, dest_id) -> betweenness),
+        i.e. how many shortest paths run through each vertex and edge, using
+        Brandes' algorithm. Weighted graphs follow their edge weights. See
+        graphs/centrality.py.
+
+        Parameters:
+        samples (integer): Estimate from this many random sources instead of all.
+        seed (integer): Seed for choosing the sampled sources.
+        workers (integer): Number of worker processes to split the sources over.
+        """
+        from graphs.centrality import betweenness_centrality
+
+        return self._timed('betweenness_centrality', betweenness_centrality,
+                           self, samples, seed, workers)
+
     # NP-hard heuristic problem
-    def greedy_coloring(self):
-        """Return a dictionary of vertex id -> color."""
-        vertex_id_color = {}
-        
-        # Establish the list of vertices
-        vertices = self.get_vertices()
-        seen = {}
-        
-
-        # Fill in the dictionary by visiting each vertex and checking the 
-        # colors of its neighbors, then assigning the “smallest” color which has 
-        # not yet been assigned.
-        for vertex in vertices:
-            q = deque()
-            q.append((vertex, 0))
-            while q:
-                curr_vert, curr_color = q.popleft()
-                for neighbor in curr_vert.get_neighbors():
-                    if neighbor in seen:
-                        pass
-
-        return vertex_id_color
\ No newline at end of file
+    def greedy_coloring(self, strategy='greedy'):
+        """
+        Return a dictionary of vertex id -> color, where no two adjacent
+        vertices share a color. See graphs/coloring.py for the strategies.
+
+        Parameters:
+        strategy (string): 'greedy' (in insertion order), 'largest_first' or
+        'dsatur', which usually needs the fewest colors.
+        """
+        from graphs.coloring import color_graph
+
+        return self._timed('coloring', color_graph, self, strategy)
+
+    def compare_colorings(self):
+        """
+        Color the graph with every strategy and return strategy name ->
+        {'colors', 'seconds', 'coloring'} so they can be compared.
+        """
+        from graphs.coloring import compare_colorings
+
+        return self._timed('compare_colorings', compare_colorings, self)
@@ -0,0 +1,118 @@
+class MoldGrowth(object):
+    """
+    Grows a mold outwards from a start vertex one hop at a time, using a single
+    level-synchronous breadth-first search.
+
+    Each call to `step` only looks at the edges of the current frontier, so
+    advancing the mold by one tick costs time proportional to the new ring,
+    not to everything reached so far.
+    """
+
+    def __init__(self, graph, start_id):
+        """
+        Start a new growth at start_id.
+
+        Parameters:
+        graph (Graph): The graph (or WeightedGraph) to grow over. Weights are ignored.
+        start_id (string): The vertex where the mold is introduced.
+        """
+        if not graph.contains_id(start_id):
+            raise KeyError("Start id not in graph")
+
+        self.graph = graph
+        self.start_id = start_id
+        self.radius = 0  # hop distance of the current frontier
+        self.frontier = [start_id]
+        self.visited = {start_id}
+
+    def step(self):
+        """
+        Advance the mold by one hop.
+
+        Returns:
+        list<string>: The ids of the vertices reached for the first time, which
+        become the new frontier. Empty once the mold can grow no further.
+        """
+        graph = self.graph
+        visited = self.visited
+        ring = []
+
+        for vertex_id in self.frontier:
+            for neighbor_id in graph.neighbor_ids(vertex_id):
+                if neighbor_id not in visited:
+                    visited.add(neighbor_id)
+                    ring.append(neighbor_id)
+
+        if ring:
+            self.radius += 1
+        self.frontier = ring
+        return ring
+
+    def rings(self, max_radius=None):
+        """
+        Generate each new ring of the growth until the mold reaches max_radius
+        hops or stops growing. Iteration can be stopped and resumed at any point.
+
+        Parameters:
+        max_radius (integer): The hop distance to stop at, or None for no limit.
+
+        Yields:
+        list<string>: The ids of the vertices reached on each step.
+        """
+        while max_radius is None or self.radius < max_radius:
+            ring = self.step()
+            if not ring:
+                return
+            yield ring
+
+    def get_state(self):
+        """
+        Return the growth state as a plain dict that can be saved (e.g. as JSON)
+        and passed to `from_state` to resume later.
+        """
+        return {
+            'start_id': self.start_id,
+            'radius': self.radius,
+            'frontier': list(self.frontier),
+            'visited': list(self.visited),
+        }
+
+    @classmethod
+    def from_state(cls, graph, state):
+        """
+        Resume a growth from a state returned by `get_state`.
+
+        Parameters:
+        graph (Graph): The graph the growth was running on.
+        state (dict): The saved growth state.
+
+        Returns:
+        MoldGrowth: A growth that continues from the saved frontier.
+        """
+        growth = cls(graph, state['start_id'])
+        growth.radius = state['radius']
+        growth.frontier = list(state['frontier'])
+        growth.visited = set(state['visited'])
+        return growth
+
+
+def growth_rings(graph, start_id, radius):
+    """
+    Return the food reached as the mold grows from start_id, where ring n
+    holds the vertices n hops away, for n < radius.
+
+    Parameters:
+    graph (Graph): The food map. Weights are ignored.
+    start_id (string): Where the mold is introduced.
+    radius (integer): How many rings to return.
+
+    Returns:
+    list<list<string>>: The rings, starting with [start_id]; empty if radius is 0.
+    """
+    if radius < 0:
+        raise ValueError(f"The growth radius must be at least 0, got {radius}")
+    if radius == 0:
+        return []
+    rings = [[start_id]]
+    rings.extend(MoldGrowth(graph, start_id).rings(radius - 1))
+    return rings
@@ -0,0 +1,308 @@
+from array import array
+import heapq
+import mmap
+import os
+import struct
+import tempfile
+import zlib
+
+from graphs.csr_graph import CSRGraph
+from graphs.weighted_graph import INFINITY
+
+# File layout: magic, the header below, the vertex ids (utf-8, newline
+# separated, padded to 8 bytes), the int32 landmark indices (padded to 8
+# bytes), then K from-landmark and K to-landmark float64 distance arrays.
+INDEX_MAGIC = b'GRAPHALT'
+# landmark count, vertex count, graph checksum, length of the encoded ids
+INDEX_HEADER = struct.Struct('<qqQq')
+
+
+def graph_checksum(csr):
+    """Return a checksum of a CSR graph's structure and weights."""
+    checksum = zlib.crc32('\n'.join(csr.ids).encode('utf-8'))
+    checksum = zlib.crc32(bytes(csr.offsets), checksum)
+    checksum = zlib.crc32(bytes(csr.targets), checksum)
+    if csr.is_weighted:
+        checksum = zlib.crc32(bytes(csr.weights), checksum)
+    return checksum
+
+
+def _pad(length):
+    """Return the number of bytes needed to round length up to a multiple of 8."""
+    return -length % 8
+
+
+class LandmarkIndex(object):
+    """
+    An ALT (A*, Landmarks, Triangle inequality) index over a WeightedGraph.
+
+    For each of K landmark vertices L it stores the distance from L to every
+    vertex and from every vertex to L. For any vertex v and target t the
+    triangle inequality then gives the lower bounds
+
+        d(v, t) >= d(L, t) - d(L, v)   and   d(v, t) >= d(v, L) - d(t, L)
+
+    which guide an A* search towards t without needing vertex coordinates.
+    """
+
+    def __init__(self, graph, ids, landmarks, from_landmark, to_landmark, checksum):
+        """
+        Use `build` or `load` rather than calling this directly.
+
+        Parameters:
+        graph (WeightedGraph): The graph the index answers queries on.
+        ids (list<string>): The vertex id for each dense index.
+        landmarks (list<int>): The dense indices of the landmark vertices.
+        from_landmark (list<array>): Per landmark, the distance to each vertex.
+        to_landmark (list<array>): Per landmark, the distance from each vertex.
+        checksum (integer): graph_checksum of the graph the index was built on.
+        """
+        self.graph = graph
+        self.ids = ids
+        self.index = {vertex_id: i for i, vertex_id in enumerate(ids)}
+        self.landmarks = landmarks
+        self.from_landmark = from_landmark
+        self.to_landmark = to_landmark
+        self.checksum = checksum
+        self.auto_rebuild = False
+        self.built_version = graph.version
+
+    @classmethod
+    def build(cls, graph, landmark_count=8):
+        """
+        Choose landmarks by farthest-point selection and compute their distance arrays.
+
+        Each new landmark is the vertex whose distance to the nearest landmark
+        chosen so far is largest, which spreads the landmarks towards the edges
+        of the map where they give the tightest bounds. Vertices that no
+        landmark reaches yet are picked first, so every component gets one.
+
+        Parameters:
+        graph (WeightedGraph): The graph to index.
+        landmark_count (integer): How many landmarks (K) to use.
+
+        Returns:
+        LandmarkIndex: The index, valid until the graph changes.
+        """
+        csr = CSRGraph.from_graph(graph)
+        reverse = csr.reverse()
+        n = len(csr.ids)
+
+        landmarks = []
+        from_landmark = []
+        to_landmark = []
+        if n:
+            # Start from the vertex farthest from an arbitrary one
+            first, _ = csr._dijkstra([0])
+            nearest_landmark = [INFINITY] * n
+            candidate = max(range(n), key=lambda i: (first[i] != INFINITY, first[i]))
+
+            while len(landmarks) < min(landmark_count, n):
+                landmarks.append(candidate)
+                distances, _ = csr._dijkstra([candidate])
+                from_landmark.append(array('d', distances))
+                distances_to, _ = reverse._dijkstra([candidate])
+                to_landmark.append(array('d', distances_to))
+
+                nearest_landmark = [min(a, b) for a, b in zip(nearest_landmark, distances)]
+                chosen = set(landmarks)
+                candidate = max(
+                    (i for i in range(n) if i not in chosen),
+                    key=lambda i: nearest_landmark[i],
+                    default=None)
+                if candidate is None:
+                    break
+
+        return cls(graph, csr.ids, landmarks, from_landmark, to_landmark,
+                   graph_checksum(csr))
+
+    def is_stale(self):
+        """Return True if the graph has changed since the index was built or loaded."""
+        return self.graph.version != self.built_version
+
+    def rebuild(self):
+        """Rebuild the index in place from the current graph, keeping the landmark count."""
+        fresh = LandmarkIndex.build(self.graph, len(self.landmarks))
+        auto_rebuild = self.auto_rebuild
+        self.__dict__.update(fresh.__dict__)
+        self.auto_rebuild = auto_rebuild
+
+    def save(self, filename):
+        """
+        Write the index to a binary file that `load` can memory-map.
+
+        Parameters:
+        filename (string): The path to write to.
+        """
+        encoded_ids = '\n'.join(self.ids).encode('utf-8')
+        landmarks = array('i', self.landmarks).tobytes()
+
+        # Write to a temporary file of our own first, so a half-written index
+        # is never read and processes saving the same index cannot clash
+        descriptor, temporary_path = tempfile.mkstemp(
+            dir=os.path.dirname(filename) or '.', prefix=os.path.basename(filename) + '.',
+            suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'wb') as f:
+                f.write(INDEX_MAGIC)
+                f.write(INDEX_HEADER.pack(len(self.landmarks), len(self.ids),
+                                          self.checksum, len(encoded_ids)))
+                f.write(encoded_ids + b'\0' * _pad(len(encoded_ids)))
+                f.write(landmarks + b'\0' * _pad(len(landmarks)))
+                for distances in self.from_landmark + self.to_landmark:
+                    f.write(bytes(distances))
+            os.replace(temporary_path, filename)
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
+
+    @classmethod
+    def load(cls, graph, filename, auto_rebuild=False, landmark_count=8):
+        """
+        Memory-map an index written by `save` and attach it to graph.
+
+        Parameters:
+        graph (WeightedGraph): The graph the index was built on.
+        filename (string): The path of the saved index.
+        auto_rebuild (boolean): Whether queries should rebuild the index
+        themselves once the graph changes, instead of raising.
+        landmark_count (integer): How many landmarks to rebuild with if the
+        file was cut off before its header says how many it had.
+
+        Returns:
+        LandmarkIndex: The loaded index. If the file was built from a
+        different version of the graph, or was cut short anywhere (even
+        left empty), a fresh index is built instead and saved over the file.
+        """
+        with open(filename, 'rb') as f:
+            # An empty file cannot be memory-mapped
+            if os.fstat(f.fileno()).st_size:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                buffer = b''
+
+        position = len(INDEX_MAGIC)
+        if buffer[:position] != INDEX_MAGIC[:len(buffer)]:
+            raise ValueError(f"{filename} is not a landmark index")
+        if len(buffer) < position + INDEX_HEADER.size:
+            return cls._rebuild_file(graph, filename, landmark_count, auto_rebuild)
+        landmark_count, vertex_count, checksum, ids_length = \
+            INDEX_HEADER.unpack_from(buffer, position)
+        position += INDEX_HEADER.size
+
+        # A file cut short is rebuilt, the same as one from another graph
+        expected_length = (position + ids_length + _pad(ids_length) + 4 * landmark_count
+                           + _pad(4 * landmark_count) + 16 * landmark_count * vertex_count)
+        csr = CSRGraph.from_graph(graph)
+        if len(buffer) < expected_length or checksum != graph_checksum(csr):
+            return cls._rebuild_file(graph, filename, landmark_count, auto_rebuild)
+
+        encoded_ids = buffer[position:position + ids_length]
+        ids = encoded_ids.decode('utf-8').split('\n') if vertex_count else []
+        position += ids_length + _pad(ids_length)
+
+        view = memoryview(buffer)
+        landmarks = list(view[position:position + 4 * landmark_count].cast('i'))
+        position += 4 * landmark_count + _pad(4 * landmark_count)
+
+        arrays = []
+        for _ in range(2 * landmark_count):
+            arrays.append(view[position:position + 8 * vertex_count].cast('d'))
+            position += 8 * vertex_count
+
+        index = cls(graph, ids, landmarks, arrays[:landmark_count],
+                    arrays[landmark_count:], checksum)
+        index.auto_rebuild = auto_rebuild
+        return index
+
+    @classmethod
+    def _rebuild_file(cls, graph, filename, landmark_count, auto_rebuild):
+        """Build a fresh index in place of a saved one that cannot be used, and save it."""
+        index = cls.build(graph, landmark_count)
+        index.save(filename)
+        index.auto_rebuild = auto_rebuild
+        return index
+
+    def _check_fresh(self):
+        if self.is_stale():
+            if not self.auto_rebuild:
+                raise ValueError("The graph changed since the landmark index was built")
+            self.rebuild()
+
+    def lower_bound(self, vertex_id, target_id):
+        """Return the landmark lower bound on the distance from vertex_id to target_id."""
+        self._check_fresh()
+        v, t = self.index[vertex_id], self.index[target_id]
+        bound = 0
+        for from_distances, to_distances in zip(self.from_landmark, self.to_landmark):
+            from_v, from_t = from_distances[v], from_distances[t]
+            if from_v != INFINITY and from_t != INFINITY:
+                bound = max(bound, from_t - from_v)
+            to_v, to_t = to_distances[v], to_distances[t]
+            if to_v != INFINITY and to_t != INFINITY:
+                bound = max(bound, to_v - to_t)
+        return bound
+
+    def find_shortest_path(self, start_id, target_id):
+        """
+        Use A* search guided by the landmark lower bounds to find the shortest
+        path from a start vertex to a destination.
+
+        Parameters:
+        start_id (string): The id of the start vertex.
+        target_id (string): The id of the target (end) vertex.
+
+        Returns:
+        tuple(number, list<string>, integer): The total weight of the path, the
+        ids of the vertices on it, and how many vertices were settled. The
+        first two are None if the target cannot be reached.
+        """
+        self._check_fresh()
+        graph = self.graph
+        if not graph.contains_id(start_id) or not graph.contains_id(target_id):
+            raise KeyError("One or both vertices are not in the graph!")
+
+        index = self.index
+        t = index[target_id]
+        # Per landmark: (distances from L, d(L, t), distances to L, d(t, L))
+        bounds = [
+            (from_distances, from_distances[t], to_distances, to_distances[t])
+            for from_distances, to_distances in zip(self.from_landmark, self.to_landmark)
+        ]
+
+        def estimate(vertex_id):
+            v = index[vertex_id]
+            bound = 0
+            for from_distances, from_t, to_distances, to_t in bounds:
+                from_v = from_distances[v]
+                if from_v != INFINITY and from_t != INFINITY and from_t - from_v > bound:
+                    bound = from_t - from_v
+                to_v = to_distances[v]
+                if to_v != INFINITY and to_t != INFINITY and to_v - to_t > bound:
+                    bound = to_v - to_t
+            return bound
+
+        settled = set()
+        best = {start_id: 0}
+        previous = {start_id: None}
+        heap = [(estimate(start_id), 0, start_id)]
+
+        while heap:
+            _, current_distance, current_id = heapq.heappop(heap)
+            if current_id in settled:
+                continue
+            settled.add(current_id)
+
+            if current_id == target_id:
+                return current_distance, graph._build_path(previous, target_id), len(settled)
+
+            for neighbor_id, weight in graph.neighbors_with_weights(current_id):
+                if neighbor_id in settled:
+                    continue
+                new_distance = current_distance + weight
+                if new_distance < best.get(neighbor_id, INFINITY):
+                    best[neighbor_id] = new_distance
+                    previous[neighbor_id] = current_id
+                    heapq.heappush(heap, (new_distance + estimate(neighbor_id), new_distance, neighbor_id))
+
+        return None, None, len(settled)
@@ -0,0 +1,72 @@
+from collections import OrderedDict
+import sys
+
+
+class PathCache(object):
+    """
+    A least-recently-used cache of single-source shortest-path trees, keyed by
+    source vertex id.
+
+    Each entry is a (distance, previous) pair of dicts as produced by a full
+    Dijkstra or breadth-first search from the source. The cache tracks an
+    estimate of the memory those dicts use and evicts the least recently used
+    sources once it goes over `max_bytes`.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        """
+        Parameters:
+        max_bytes (integer): The memory budget for cached trees, in bytes.
+        """
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.entries = OrderedDict()  # source id -> (tree, size in bytes)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, source_id):
+        return source_id in self.entries
+
+    def get(self, source_id):
+        """Return the cached (distance, previous) tree for source_id, or None on a miss."""
+        entry = self.entries.get(source_id)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.entries.move_to_end(source_id)
+        return entry[0]
+
+    def put(self, source_id, tree):
+        """Store the (distance, previous) tree for source_id, evicting old entries if needed."""
+        size = sum(sys.getsizeof(part) for part in tree)
+        if size > self.max_bytes:
+            return  # would evict everything and still not fit
+
+        if source_id in self.entries:
+            self.current_bytes -= self.entries.pop(source_id)[1]
+
+        self.entries[source_id] = (tree, size)
+        self.current_bytes += size
+        while self.current_bytes > self.max_bytes:
+            _, (_, evicted_size) = self.entries.popitem(last=False)
+            self.current_bytes -= evicted_size
+
+    def clear(self):
+        """Drop every cached tree, keeping the hit and miss counters."""
+        self.entries.clear()
+        self.current_bytes = 0
+
+    def stats(self):
+        """Return the hit/miss counters and current size as a dict."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(self.entries),
+            'bytes': self.current_bytes,
+            'max_bytes': self.max_bytes,
+        }
@@ -0,0 +1,176 @@
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import spsolve
+
+from graphs.csr_graph import CSRGraph
+from graphs.weighted_graph import WeightedGraph
+
+
+class PhysarumSimulator(object):
+    """
+    Simulates the Tero/Nakagaki Physarum solver over the tubes of a WeightedGraph.
+
+    Every undirected edge is a tube with a length (its weight) and a
+    conductance. On each step one food vertex pushes `inflow` units of flux
+    into the network and the other food vertices draw it out equally. The
+    pressures come from solving the Kirchhoff system L p = b, where L is the
+    graph Laplacian weighted by conductance / length. Each tube's conductance
+    then grows with the flux through it and decays otherwise:
+
+        dD/dt = |Q|^mu - decay * D
+
+    Tubes carrying little flux die away, and what survives approximates the
+    network a real slime mold would build between the food sources.
+    """
+
+    def __init__(self, graph, food_ids, inflow=1.0, mu=1.0, decay=1.0, dt=0.1,
+                 initial_conductance=1.0, seed=None):
+        """
+        Parameters:
+        graph (WeightedGraph): The food map. Edge weights are tube lengths and
+        must be positive. Directed edges are treated as undirected tubes.
+        food_ids (list<string>): At least two food vertex ids.
+        inflow (number): Total flux entering at the source food on each step.
+        mu (number): Exponent of the flux response; above 1 favours fewer,
+        thicker tubes.
+        decay (number): Rate at which unused tubes shrink.
+        dt (number): Size of each time step.
+        initial_conductance (number): Starting conductance of every tube.
+        seed (integer): Seed for choosing the source food on each step.
+        """
+        if len(set(food_ids)) < 2:
+            raise ValueError("At least two distinct food vertices are needed")
+
+        csr = graph if isinstance(graph, CSRGraph) else CSRGraph.from_graph(graph)
+        for food_id in food_ids:
+            if not csr.contains_id(food_id):
+                raise KeyError(f"Food vertex {food_id!r} is not in the graph!")
+
+        self.ids = csr.ids
+        self.food = np.array([csr.index[food_id] for food_id in dict.fromkeys(food_ids)])
+        self.inflow = inflow
+        self.mu = mu
+        self.decay = decay
+        self.dt = dt
+        self.rng = np.random.default_rng(seed)
+        self.iterations = 0
+
+        # Keep one copy of every tube, u < v, taking the shortest parallel edge
+        offsets = np.frombuffer(csr.offsets, dtype=np.int64)
+        sources = np.repeat(np.arange(len(csr.ids)), np.diff(offsets))
+        targets = np.frombuffer(csr.targets, dtype=np.int32).astype(np.int64)
+        if csr.is_weighted:
+            lengths = np.frombuffer(csr.weights, dtype=np.float64)
+        else:
+            lengths = np.ones(len(targets))
+
+        low, high = np.minimum(sources, targets), np.maximum(sources, targets)
+        keep = low != high
+        low, high, lengths = low[keep], high[keep], lengths[keep]
+        order = np.lexsort((lengths, high, low))
+        low, high, lengths = low[order], high[order], lengths[order]
+        first = np.ones(len(low), dtype=bool)
+        first[1:] = (low[1:] != low[:-1]) | (high[1:] != high[:-1])
+        self.tail, self.head, self.length = low[first], high[first], lengths[first]
+
+        if np.any(self.length <= 0):
+            raise ValueError("Tube lengths (edge weights) must be positive")
+
+        self.conductance = np.full(len(self.length), float(initial_conductance))
+        self.flux = np.zeros(len(self.length))
+        self.pressure = np.zeros(len(self.ids))
+
+        # Laplacian entries for a tube are +g at (t,t), (h,h) and -g at (t,h),
+        # (h,t); the pattern never changes, only the values g = D / L
+        self._rows = np.concatenate((self.tail, self.head, self.tail, self.head))
+        self._cols = np.concatenate((self.tail, self.head, self.head, self.tail))
+
+    def step(self):
+        """
+        Advance the simulation by one time step.
+
+        Returns:
+        numpy.ndarray: The flux through every tube on this step.
+        """
+        # Pick the food that acts as the source this step; the rest are sinks
+        source = self.food[self.rng.integers(len(self.food))]
+        sinks = self.food[self.food != source]
+
+        demand = np.zeros(len(self.ids))
+        demand[source] = self.inflow
+        demand[sinks] = -self.inflow / len(sinks)
+
+        edge_conductance = self.conductance / self.length
+
+        # Ground the first sink at pressure 0 to make the system non-singular by
+        # leaving its row and column out of the Laplacian
+        grounded = sinks[0]
+        size = len(self.ids) - 1
+        data = np.concatenate((edge_conductance, edge_conductance,
+                               -edge_conductance, -edge_conductance))
+        keep = (self._rows != grounded) & (self._cols != grounded)
+        rows = self._rows[keep]
+        cols = self._cols[keep]
+        rows -= rows > grounded
+        cols -= cols > grounded
+
+        # A tiny diagonal shift keeps vertices cut off from every food solvable
+        diagonal = np.arange(size)
+        laplacian = sparse.csc_matrix(
+            (np.concatenate((data[keep], np.full(size, 1e-12))),
+             (np.concatenate((rows, diagonal)), np.concatenate((cols, diagonal)))),
+            shape=(size, size))
+
+        # The Laplacian is symmetric, so order columns for A^T + A
+        reduced_pressure = spsolve(laplacian, np.delete(demand, grounded),
+                                   permc_spec='MMD_AT_PLUS_A')
+        pressure = np.insert(reduced_pressure, grounded, 0.0)
+        self.pressure = pressure
+
+        self.flux = edge_conductance * (pressure[self.tail] - pressure[self.head])
+        response = np.abs(self.flux) ** self.mu
+        self.conductance += self.dt * (response - self.decay * self.conductance)
+        np.maximum(self.conductance, 0, out=self.conductance)
+
+        self.iterations += 1
+        return self.flux
+
+    def run(self, iterations, tolerance=None):
+        """
+        Run up to `iterations` steps, stopping early once no conductance changes
+        by more than `tolerance` in one step (if given).
+
+        Returns:
+        PhysarumSimulator: self, so calls can be chained with to_graph().
+        """
+        for _ in range(iterations):
+            previous = self.conductance.copy()
+            self.step()
+            if tolerance is not None and np.max(np.abs(self.conductance - previous)) < tolerance:
+                break
+        return self
+
+    def to_graph(self, threshold=1e-3):
+        """
+        Return the surviving tube network.
+
+        Parameters:
+        threshold (number): Tubes whose conductance is below this are dropped.
+
+        Returns:
+        WeightedGraph: An undirected graph of the surviving tubes (weighted by
+        their original length) and every vertex they touch, plus the food.
+        """
+        alive = self.conductance >= threshold
+        graph = WeightedGraph(is_directed=False)
+
+        for i in self.food:
+            graph.add_vertex(self.ids[i])
+
+        ids = self.ids
+        graph.add_edges(
+            (ids[tail], ids[head], length) for tail, head, length
+            in zip(self.tail[alive].tolist(), self.head[alive].tolist(),
+                   self.length[alive].tolist())
+        )
+        return graph
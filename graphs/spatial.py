@@ -0,0 +1,205 @@
+from array import array
+
+import numpy as np
+from scipy.spatial import cKDTree, Delaunay, QhullError
+
+from graphs.weighted_graph import WeightedGraph
+
+
+def _as_points(points):
+    """Return the points as an n x 2 float array, checking their shape."""
+    points = np.asarray(points, dtype=np.float64)
+    if points.ndim != 2 or points.shape[1] != 2:
+        raise ValueError(f"Expected an array of (x, y) points, got shape {points.shape}")
+    return points
+
+
+def _unique_pairs(first, second):
+    """
+    Return the distinct undirected pairs among first[i]-second[i] as an
+    m x 2 array with the smaller index first, dropping self-pairs.
+    """
+    first = np.asarray(first, dtype=np.int64)
+    second = np.asarray(second, dtype=np.int64)
+    pairs = np.stack([np.minimum(first, second), np.maximum(first, second)], axis=1)
+    pairs = pairs[pairs[:, 0] != pairs[:, 1]]
+    return np.unique(pairs, axis=0)
+
+
+def radius_edges(points, radius):
+    """
+    Join every pair of points at most `radius` apart, using a k-d tree so
+    only nearby points are compared.
+
+    Returns:
+    numpy.ndarray: m x 2 point index pairs (i, j) with i < j.
+    """
+    if radius is None or radius < 0:
+        raise ValueError("The radius mode needs a radius of at least 0")
+    pairs = cKDTree(points).query_pairs(radius, output_type='ndarray')
+    return pairs.reshape(-1, 2).astype(np.int64)
+
+
+def knn_edges(points, k):
+    """
+    Join every point to its k nearest other points. A pair is joined if
+    either point is among the other's nearest, so most points end up with
+    slightly more than k neighbors.
+
+    Returns:
+    numpy.ndarray: m x 2 point index pairs (i, j) with i < j.
+    """
+    if k is None or k < 1:
+        raise ValueError("The knn mode needs k of at least 1")
+    count = len(points)
+    k = min(k, count - 1)
+    if k < 1:
+        return np.empty((0, 2), dtype=np.int64)
+
+    # Each point is its own nearest neighbor, so ask for one more. With
+    # repeated points it may not come first, which _unique_pairs sorts out
+    _, nearest = cKDTree(points).query(points, k + 1)
+    sources = np.repeat(np.arange(count), k + 1)
+    return _unique_pairs(sources, nearest.ravel())
+
+
+def _triangles(points):
+    """
+    Return the Delaunay triangles as an m x 3 array of point indices, plus
+    extra pairs joining each repeated point to the copy Qhull kept.
+    Returns (None, pairs) if the points are all on one line, where there
+    are no triangles.
+    """
+    try:
+        triangulation = Delaunay(points)
+    except (QhullError, ValueError):
+        # Too few points or all collinear: both graphs are then the path
+        # through the points in order along the line
+        order = np.lexsort((points[:, 1], points[:, 0]))
+        return None, _unique_pairs(order[:-1], order[1:])
+
+    # Qhull leaves out repeated points; coplanar lists each with its nearest kept point
+    coplanar = triangulation.coplanar
+    return triangulation.simplices, _unique_pairs(coplanar[:, 0], coplanar[:, 2])
+
+
+def delaunay_edges(points):
+    """
+    Join the points by their Delaunay triangulation: a planar graph with
+    fewer than 3n edges that keeps every point's nearest neighbor and
+    contains the Euclidean minimum spanning tree.
+
+    Returns:
+    numpy.ndarray: m x 2 point index pairs (i, j) with i < j.
+    """
+    triangles, extra = _triangles(points)
+    if triangles is None:
+        return extra
+    first = triangles[:, [0, 1, 2]].ravel()
+    second = triangles[:, [1, 2, 0]].ravel()
+    return _unique_pairs(np.concatenate([first, extra[:, 0]]),
+                         np.concatenate([second, extra[:, 1]]))
+
+
+def gabriel_edges(points):
+    """
+    Join two points if no other point lies inside the circle that has them
+    as diameter. The Gabriel graph is the part of the Delaunay triangulation
+    where that holds, and in the plane a Delaunay edge only has to be
+    checked against the far corners of the (at most two) triangles beside
+    it: the edge a-b fails when the angle at a corner c is obtuse, that is
+    when (a - c) . (b - c) < 0.
+
+    Returns:
+    numpy.ndarray: m x 2 point index pairs (i, j) with i < j.
+    """
+    triangles, extra = _triangles(points)
+    if triangles is None:
+        return extra
+
+    # Each triangle gives three (a, b, opposite corner) triples
+    first = triangles[:, [0, 1, 2]].ravel()
+    second = triangles[:, [1, 2, 0]].ravel()
+    opposite = triangles[:, [2, 0, 1]].ravel()
+    obtuse = np.einsum('ij,ij->i', points[first] - points[opposite],
+                       points[second] - points[opposite]) < 0
+
+    pairs = _unique_pairs(first, second)
+    blocked = _unique_pairs(first[obtuse], second[obtuse])
+    # Compare pairs as single integers i * n + j
+    count = len(points)
+    pairs = pairs[~np.isin(pairs[:, 0] * count + pairs[:, 1],
+                           blocked[:, 0] * count + blocked[:, 1])]
+    return np.concatenate([pairs, extra]) if len(extra) else pairs
+
+
+# Mode name -> function(points, radius, k) returning m x 2 index pairs
+MODES = {
+    'radius': lambda points, radius, k: radius_edges(points, radius),
+    'knn': lambda points, radius, k: knn_edges(points, k),
+    'delaunay': lambda points, radius, k: delaunay_edges(points),
+    'gabriel': lambda points, radius, k: gabriel_edges(points),
+}
+
+
+def build_spatial_graph(points, mode='radius', radius=None, k=None, ids=None):
+    """
+    Build an undirected WeightedGraph from point coordinates, such as food
+    locations from a plate scan, joining points that are near each other and
+    weighting each edge by the distance between its ends.
+
+    The neighbors are found with a k-d tree or a Delaunay triangulation
+    instead of comparing every pair of points, the distances are computed
+    for all edges at once, and the edges are loaded straight into the
+    graph's adjacency arrays, so a map of 100,000 points takes seconds.
+
+    Parameters:
+    points (array-like): n (x, y) coordinates; each becomes a vertex with
+    that position, so A* works on the result.
+    mode (string): How to choose edges:
+        'radius': every pair of points at most `radius` apart.
+        'knn': each point and its `k` nearest points.
+        'delaunay': the Delaunay triangulation.
+        'gabriel': the Gabriel graph, a sparser subgraph of the triangulation.
+    radius (number): The distance for the 'radius' mode.
+    k (integer): The neighbor count for the 'knn' mode.
+    ids (list<string>): A distinct id for each point; defaults to '0', '1', ...
+
+    Returns:
+    WeightedGraph: The food map.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode {mode!r}, expected one of {sorted(MODES)}")
+    points = _as_points(points)
+    count = len(points)
+    if ids is None:
+        ids = [str(i) for i in range(count)]
+    else:
+        ids = list(ids)
+        if len(ids) != count:
+            raise ValueError(f"Got {len(ids)} ids for {count} points")
+        if len(set(ids)) != count:
+            raise ValueError("Point ids must be distinct")
+
+    graph = WeightedGraph(is_directed=False)
+    # A new graph hands out handles 0, 1, ... in order, so point i gets handle i
+    for vertex_id, position in zip(ids, points.tolist()):
+        graph.add_vertex(vertex_id, tuple(position))
+
+    pairs = MODES[mode](points, radius, k) if count > 1 else np.empty((0, 2), dtype=np.int64)
+    first, second = pairs[:, 0], pairs[:, 1]
+    delta = points[first] - points[second]
+    distances = np.hypot(delta[:, 0], delta[:, 1])
+
+    # Store each edge in both directions, grouped by tail handle
+    tails = np.concatenate([first, second])
+    heads = np.concatenate([second, first])
+    order = np.argsort(tails, kind='stable')
+    offsets = np.zeros(count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(tails, minlength=count), out=offsets[1:])
+
+    graph._load_adjacency(
+        array('q', offsets.tobytes()),
+        array('i', heads[order].astype(np.intc).tobytes()),
+        array('d', np.concatenate([distances, distances])[order].tobytes()))
+    return graph
@@ -0,0 +1,194 @@
+from contextlib import contextmanager
+import heapq
+import time
+
+# Counters every algorithm reports, in the order they are exported
+COUNTERS = ('calls', 'seconds', 'vertices_visited', 'edges_relaxed',
+            'heap_pushes', 'heap_pops', 'peak_frontier')
+
+
+class Stats(object):
+    """
+    Collects what graph algorithms report while it is attached to a graph
+    (see Graph.enable_stats), grouped by phase.
+
+    A phase is one algorithm, such as 'dijkstra' or 'bfs', or one step of a
+    larger one, such as 'kruskal.sort'. Each report adds to the phase's
+    totals; peak_frontier keeps the largest frontier (queue, stack or heap)
+    any single call reached.
+
+    Any object with the same record method can be attached instead, for
+    example to log every call as it happens.
+    """
+
+    def __init__(self):
+        self.phases = {} # phase -> {counter: value}
+        self.wall_seconds = None # set by collect_stats when its block ends
+
+    def record(self, phase, seconds, vertices_visited=0, edges_relaxed=0,
+               heap_pushes=0, heap_pops=0, peak_frontier=0):
+        """
+        Add one call of an algorithm to the totals of its phase.
+
+        Parameters:
+        phase (string): The name of the algorithm or step.
+        seconds (number): The wall time the call took.
+        vertices_visited (integer): Vertices the call reached.
+        edges_relaxed (integer): Edges it examined, counted as the edges out
+        of every vertex it expanded.
+        heap_pushes (integer): Entries pushed onto its frontier.
+        heap_pops (integer): Entries popped off its frontier, including stale ones.
+        peak_frontier (integer): The largest its frontier got.
+        """
+        totals = self.phases.get(phase)
+        if totals is None:
+            totals = self.phases[phase] = dict.fromkeys(COUNTERS, 0)
+        totals['calls'] += 1
+        totals['seconds'] += seconds
+        totals['vertices_visited'] += vertices_visited
+        totals['edges_relaxed'] += edges_relaxed
+        totals['heap_pushes'] += heap_pushes
+        totals['heap_pops'] += heap_pops
+        if peak_frontier > totals['peak_frontier']:
+            totals['peak_frontier'] = peak_frontier
+
+    def merge(self, other):
+        """Add the totals of another Stats to this one."""
+        for phase, counts in other.phases.items():
+            totals = self.phases.get(phase)
+            if totals is None:
+                self.phases[phase] = dict(counts)
+                continue
+            for counter in COUNTERS:
+                if counter == 'peak_frontier':
+                    totals[counter] = max(totals[counter], counts[counter])
+                else:
+                    totals[counter] += counts[counter]
+
+    def reset(self):
+        """Forget everything recorded so far."""
+        self.phases.clear()
+
+    def as_dict(self):
+        """
+        Export the totals as plain data, ready for JSON.
+
+        Returns:
+        dict: {'phases': phase -> {counter: value}, 'totals': counter -> value
+        summed over every phase (peak_frontier is the largest of any phase),
+        'wall_seconds': how long the collect_stats block took, or None}.
+        """
+        totals = dict.fromkeys(COUNTERS, 0)
+        for counts in self.phases.values():
+            for counter in COUNTERS:
+                if counter == 'peak_frontier':
+                    totals[counter] = max(totals[counter], counts[counter])
+                else:
+                    totals[counter] += counts[counter]
+        return {
+            'phases': {phase: dict(counts) for phase, counts in self.phases.items()},
+            'totals': totals,
+            'wall_seconds': self.wall_seconds,
+        }
+
+
+class FrontierProbe(object):
+    """
+    Stands in for the push and pop operations on one search frontier while
+    stats are being collected, counting them and tracking the frontier's
+    largest size. Searches bind their push and pop functions once, to
+    either the real operations or a probe's, so nothing is counted (and
+    nothing is paid) when stats are off.
+    """
+    __slots__ = ('frontier', 'degrees', 'pushes', 'pops', 'edges', 'peak')
+
+    def __init__(self, frontier, degrees=None):
+        """
+        Parameters:
+        frontier (list | deque): The queue, stack or heap to watch. Anything
+        already in it counts as pushed.
+        degrees (array): If given, vertex handle -> out-degree, so the edges
+        out of each popped handle are added to `edges`.
+        """
+        self.frontier = frontier
+        self.degrees = degrees
+        self.pushes = len(frontier)
+        self.pops = 0
+        self.edges = 0
+        self.peak = len(frontier)
+
+    def _pushed(self):
+        self.pushes += 1
+        if len(self.frontier) > self.peak:
+            self.peak = len(self.frontier)
+
+    def append(self, handle):
+        """Push onto a queue or stack."""
+        self.frontier.append(handle)
+        self._pushed()
+
+    def popleft(self):
+        """Pop from the front of a queue."""
+        handle = self.frontier.popleft()
+        self.pops += 1
+        if self.degrees is not None:
+            self.edges += self.degrees[handle]
+        return handle
+
+    def pop(self):
+        """Pop from the top of a stack."""
+        handle = self.frontier.pop()
+        self.pops += 1
+        if self.degrees is not None:
+            self.edges += self.degrees[handle]
+        return handle
+
+    def heappush(self, heap, item):
+        """Push onto a heap, like heapq.heappush."""
+        heapq.heappush(heap, item)
+        self._pushed()
+
+    def heappop(self, heap):
+        """Pop from a heap, like heapq.heappop."""
+        self.pops += 1
+        return heapq.heappop(heap)
+
+    def report(self, stats, phase, started, vertices_visited=None, edges_relaxed=None):
+        """
+        Record one call of a search with this probe's counts. Unless given,
+        the vertices visited are the handles pushed and the edges relaxed are
+        those out of the handles popped.
+        """
+        stats.record(phase, time.perf_counter() - started,
+                     self.pushes if vertices_visited is None else vertices_visited,
+                     self.edges if edges_relaxed is None else edges_relaxed,
+                     self.pushes, self.pops, self.peak)
+
+
+@contextmanager
+def collect_stats(*graphs):
+    """
+    Attach one Stats to each of the given graphs for the length of a with
+    block, so every algorithm run on them in the block adds to it. Whatever
+    the graphs were recording to before is put back afterwards.
+
+    Example:
+        with collect_stats(graph) as stats:
+            for start_id, target_id in queries:
+                graph.find_shortest_path(start_id, target_id)
+        report = stats.as_dict()
+
+    Yields:
+    Stats: The aggregated stats.
+    """
+    stats = Stats()
+    previous = [graph.stats for graph in graphs]
+    for graph in graphs:
+        graph.stats = stats
+    started = time.perf_counter()
+    try:
+        yield stats
+    finally:
+        for graph, recorder in zip(graphs, previous):
+            graph.stats = recorder
+        stats.wall_seconds = time.perf_counter() - started
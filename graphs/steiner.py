@@ -0,0 +1,105 @@
+from graphs.weighted_graph import kruskal_from_edges
+
+
+def steiner_tree(graph, terminal_ids):
+    """
+    Approximate the minimum Steiner tree connecting terminal_ids with
+    Mehlhorn's algorithm, which is within a factor of 2 of optimal.
+
+    1. One multi-source Dijkstra from all terminals splits the graph into
+       Voronoi regions, one per terminal.
+    2. Every edge (u, v) between two regions gives a candidate link between
+       their terminals of length d(u) + w(u, v) + d(v).
+    3. A minimum spanning tree over those links picks which terminals to join,
+       and each chosen link is expanded back into its graph path.
+    4. A final spanning tree over the expanded edges, with non-terminal leaves
+       pruned, removes any redundancy.
+
+    This takes one Dijkstra plus two sorts, instead of shortest paths between
+    every pair of terminals.
+
+    Parameters:
+    graph (WeightedGraph): An undirected graph with non-negative weights.
+    terminal_ids (iterable<string>): The ids of the vertices to connect.
+
+    Returns:
+    tuple(list<tuple>, number): The tree edges as (start_id, dest_id, weight)
+    tuples, and their total weight. If the terminals lie in different
+    components, one tree is returned per component.
+    """
+    if graph.is_directed:
+        raise ValueError("Steiner trees are only defined here for undirected graphs")
+
+    terminals = list(dict.fromkeys(terminal_ids))
+    if len(terminals) < 2:
+        for terminal_id in terminals:
+            if not graph.contains_id(terminal_id):
+                raise KeyError("Terminal not in graph")
+        return [], 0
+
+    distance, previous = graph._dijkstra(terminals)
+
+    # Vertices are settled after their predecessor, so one pass in settle
+    # order labels each vertex with the terminal whose region it is in
+    region = {}
+    for vertex_id in distance:
+        previous_id = previous[vertex_id]
+        region[vertex_id] = vertex_id if previous_id is None else region[previous_id]
+
+    # For each pair of neighboring regions, keep the shortest bridging edge
+    links = {}  # (terminal, terminal) -> (length, u, v, w)
+    for u in distance:
+        for v, weight in graph.neighbors_with_weights(u):
+            region_u, region_v = region[u], region.get(v)
+            if region_v is None or region_u == region_v:
+                continue
+            key = (region_u, region_v) if region_u < region_v else (region_v, region_u)
+            length = distance[u] + weight + distance[v]
+            if key not in links or length < links[key][0]:
+                links[key] = (length, u, v, weight)
+
+    terminal_edges = sorted(
+        ((key[0], key[1], link[0]) for key, link in links.items()),
+        key=lambda edge: edge[2])
+    chosen = kruskal_from_edges(terminal_edges, terminals)
+
+    # Expand each chosen link into the graph edges along its path
+    expanded = {}
+    for terminal1, terminal2, _ in chosen:
+        _, u, v, weight = links[(terminal1, terminal2)]
+        expanded[frozenset((u, v))] = (u, v, weight)
+        for end in (u, v):
+            while previous[end] is not None:
+                parent = previous[end]
+                expanded[frozenset((parent, end))] = (
+                    parent, end, graph.get_edge_weight(parent, end))
+                end = parent
+
+    tree_edges = kruskal_from_edges(sorted(expanded.values(), key=lambda edge: edge[2]))
+    tree_edges = _prune_leaves(tree_edges, set(terminals))
+    return tree_edges, sum(weight for _, _, weight in tree_edges)
+
+
+def _prune_leaves(edges, terminals):
+    """Repeatedly remove tree edges that end in a non-terminal leaf."""
+    adjacency = {}
+    for index, (u, v, _) in enumerate(edges):
+        adjacency.setdefault(u, set()).add(index)
+        adjacency.setdefault(v, set()).add(index)
+
+    removed = set()
+    leaves = [vertex_id for vertex_id, incident in adjacency.items()
+              if len(incident) == 1 and vertex_id not in terminals]
+    while leaves:
+        leaf = leaves.pop()
+        if len(adjacency[leaf]) != 1:
+            continue
+        index = adjacency[leaf].pop()
+        removed.add(index)
+        u, v, _ = edges[index]
+        other = v if u == leaf else u
+        adjacency[other].discard(index)
+        if len(adjacency[other]) == 1 and other not in terminals:
+            leaves.append(other)
+
+    return [edge for index, edge in enumerate(edges) if index not in removed]
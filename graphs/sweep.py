@@ -0,0 +1,315 @@
+"""
+Run the three mold questions from main.py (shortest path, growth rings and
+minimum spanning tree) over a grid of scenarios, spread across a process
+pool, streaming every result to a JSON-lines file as it completes.
+
+A scenario is a dict such as
+    {'map': 'plates/plate_07.txt', 'start': 'A', 'target': 'J', 'radius': 6}
+where 'map' names a food map, 'start' is where the mold is introduced,
+'target' is the food to find the shortest path to, and 'radius' is how many
+growth rings to report. 'target' and 'radius' may be left out to skip those
+questions. Extra keys are kept in the output but otherwise ignored.
+
+Maps may be weighted or not. On an unweighted map the shortest path is
+the one with the fewest hops and every edge of the spanning tree counts 1.
+
+Each line of the output holds one finished scenario, so a sweep that was
+stopped part way can be resumed: scenarios that already have a result are
+skipped, and those that failed are run again.
+
+Run from the repository root with, for example:
+    python -m graphs.sweep plates/*.txt --starts A B --targets J --radii 3 6 \\
+        --output sweep.jsonl --workers 4
+"""
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import product
+import json
+import os
+import sys
+import time
+
+from graphs.file_reader import read_csr_graph_from_file, read_graph_from_file
+from graphs.growth import growth_rings
+from graphs.weighted_graph import WeightedGraph
+
+# The maps each worker process has loaded, by name, and the graphs it was
+# given when it started; set by _init_worker so no map is loaded or pickled
+# more than once per worker
+_worker_maps = {}
+_worker_graphs = {}
+
+
+def _init_worker(graphs):
+    global _worker_maps, _worker_graphs
+    _worker_maps = {}
+    _worker_graphs = graphs or {}
+
+
+def scenario_grid(**axes):
+    """
+    Build every combination of the given values.
+
+    Example:
+        scenario_grid(map=['a.txt', 'b.txt'], start=['A'], radius=[3, 6])
+    gives four scenarios, one per map and radius.
+
+    Parameters:
+    axes (iterable): Scenario key -> the values to try for it.
+
+    Returns:
+    list<dict>: One scenario per combination.
+    """
+    keys = list(axes)
+    return [dict(zip(keys, values)) for values in product(*(list(axes[key]) for key in keys))]
+
+
+def scenario_key(scenario):
+    """Return a string that identifies a scenario, for matching it against saved results."""
+    return json.dumps(scenario, sort_keys=True)
+
+
+def _load_map(name):
+    """
+    Return (graph, cached answers) for a map in this process, loading it on
+    first use. The answers that do not depend on the scenario, like the
+    spanning tree weight, are kept with it so each worker works them out once.
+    """
+    loaded = _worker_maps.get(name)
+    if loaded is None:
+        graph = _worker_graphs[name] if name in _worker_graphs else read_graph_from_file(name)
+        loaded = _worker_maps[name] = (graph, {})
+    return loaded
+
+
+def solve_scenario(graph, scenario, answers=None):
+    """
+    Answer the mold questions for one scenario.
+
+    Parameters:
+    graph (Graph | WeightedGraph): The food map.
+    scenario (dict): The scenario, see the module docstring.
+    answers (dict): Scenario-independent answers already worked out for this
+    map; filled in as they are computed.
+
+    Returns:
+    dict: 'distance' and 'path' of the shortest route from start to target
+    (None if it cannot be reached), 'rings', where ring n holds the food n
+    hops from start for n < radius, and 'spanning_tree_weight', the total
+    weight of the minimum spanning tree (or forest). On an unweighted map
+    distances are hop counts and the spanning tree weight is its edge count.
+    """
+    if answers is None:
+        answers = {}
+    start_id = scenario['start']
+    result = {}
+
+    is_weighted = isinstance(graph, WeightedGraph)
+
+    if scenario.get('target') is not None:
+        if is_weighted:
+            result['distance'], result['path'] = graph.find_shortest_route(start_id, scenario['target'])
+        else:
+            path = graph.find_shortest_path(start_id, scenario['target'])
+            result['distance'] = None if path is None else len(path) - 1
+            result['path'] = path
+
+    if scenario.get('radius') is not None:
+        result['rings'] = growth_rings(graph, start_id, scenario['radius'])
+
+    if 'spanning_tree_weight' not in answers:
+        if is_weighted:
+            answers['spanning_tree_weight'] = graph.minimum_spanning_tree_prim()
+        else:
+            # A spanning forest has one edge fewer than vertices per component
+            answers['spanning_tree_weight'] = (len(graph.vertex_dict)
+                                               - len(graph.get_connected_components()))
+    result['spanning_tree_weight'] = answers['spanning_tree_weight']
+    return result
+
+
+def _run_scenario(scenario):
+    """
+    Solve one scenario in this process.
+
+    Returns:
+    dict: {'scenario', 'result', 'seconds'}, or {'scenario', 'error'} if it
+    failed (for example because a vertex is not on the map).
+    """
+    started = time.perf_counter()
+    try:
+        graph, answers = _load_map(scenario['map'])
+        result = solve_scenario(graph, scenario, answers)
+    except Exception as error:
+        # Any failure is recorded with its type, so one bad scenario or map
+        # does not stop the rest of the sweep
+        return {'scenario': scenario, 'error': f'{type(error).__name__}: {error}'}
+    return {'scenario': scenario, 'result': result, 'seconds': time.perf_counter() - started}
+
+
+def _run_chunk(scenarios):
+    return [_run_scenario(scenario) for scenario in scenarios]
+
+
+def completed_keys(filename):
+    """
+    Return the keys of the scenarios that already have a result in an
+    output file. Scenarios that failed, and any line left half-written by an
+    interrupted sweep, are left out so they are run again.
+    """
+    done = set()
+    if not os.path.exists(filename):
+        return done
+    with open(filename) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict) and 'scenario' in record and 'result' in record:
+                done.add(scenario_key(record['scenario']))
+    return done
+
+
+def _chunks(scenarios, chunk_size):
+    """
+    Split scenarios into chunks of at most chunk_size, keeping scenarios on
+    the same map together so each chunk touches as few maps as possible.
+    """
+    ordered = sorted(scenarios, key=lambda scenario: str(scenario['map']))
+    return [ordered[i:i + chunk_size] for i in range(0, len(ordered), chunk_size)]
+
+
+def _cache_maps(names, maps):
+    """
+    Read each map file once in this process, writing its binary cache if it
+    is missing or out of date, so the workers only ever read the cache and
+    never race to write it. Maps that fail to load are left for the workers
+    to report as errors.
+    """
+    for name in names:
+        if maps and name in maps:
+            continue
+        try:
+            read_csr_graph_from_file(name)
+        except Exception:
+            pass
+
+
+def run_sweep(scenarios, output, maps=None, workers=1, chunk_size=16, resume=True):
+    """
+    Solve every scenario, appending one JSON line per scenario to output as
+    soon as its chunk finishes.
+
+    Every map file is read once up front to make sure its binary cache is
+    current. With workers > 1 the scenarios are then sent to a process pool
+    in chunks of chunk_size, grouped by map. Each worker loads a map from
+    its cache the first time one of its chunks needs it and keeps it for the
+    rest of the sweep, along with the map's spanning tree weight.
+
+    Parameters:
+    scenarios (iterable<dict>): The scenarios, e.g. from scenario_grid.
+    output (string): The JSON-lines file to append results to.
+    maps (dict): Map name -> graph for maps that are already in memory, sent
+    to each worker once when it starts. Any other map name is read with
+    read_graph_from_file, which uses its binary cache.
+    workers (integer): Number of worker processes. 1 runs everything in
+    this process; None uses one worker per CPU.
+    chunk_size (integer): How many scenarios to send to a worker per task.
+    resume (boolean): Skip scenarios that already have a result in output.
+
+    Returns:
+    tuple(integer, integer): How many scenarios were run, and how many of
+    those failed.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+
+    scenarios = list(scenarios)
+    for scenario in scenarios:
+        if 'map' not in scenario or 'start' not in scenario:
+            raise ValueError(f"Scenario {scenario!r} needs a 'map' and a 'start'")
+    if resume:
+        done = completed_keys(output)
+        scenarios = [scenario for scenario in scenarios if scenario_key(scenario) not in done]
+
+    # Drop duplicate scenarios, which would only be answered twice
+    scenarios = list({scenario_key(scenario): scenario for scenario in scenarios}.values())
+    chunks = _chunks(scenarios, chunk_size)
+    _cache_maps(dict.fromkeys(scenario['map'] for scenario in scenarios), maps)
+
+    run_count = 0
+    error_count = 0
+    # Start on a fresh line if the last sweep stopped part way through one
+    needs_newline = False
+    if os.path.exists(output) and os.path.getsize(output) > 0:
+        with open(output, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            needs_newline = f.read(1) != b'\n'
+
+    with open(output, 'a') as f:
+        if needs_newline:
+            f.write('\n')
+
+        def write(records):
+            nonlocal run_count, error_count
+            for record in records:
+                f.write(json.dumps(record) + '\n')
+                run_count += 1
+                error_count += 'error' in record
+            f.flush()
+
+        if workers == 1 or len(chunks) <= 1:
+            _init_worker(maps)
+            for chunk in chunks:
+                write(_run_chunk(chunk))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(maps,)) as executor:
+                futures = [executor.submit(_run_chunk, chunk) for chunk in chunks]
+                for future in as_completed(futures):
+                    write(future.result())
+
+    return run_count, error_count
+
+
+def load_results(filename):
+    """
+    Read the results of a sweep.
+
+    Returns:
+    list<dict>: The records written by run_sweep, in the order they finished.
+    """
+    records = []
+    with open(filename) as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+    return records
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('maps', nargs='+', help='food map files to sweep over')
+    parser.add_argument('--starts', nargs='+', required=True, help='vertex ids to introduce the mold at')
+    parser.add_argument('--targets', nargs='+', default=[None], help='vertex ids to find shortest paths to')
+    parser.add_argument('--radii', type=int, nargs='+', default=[None], help='growth ring counts')
+    parser.add_argument('--output', required=True, help='JSON-lines file to append results to')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes; one per CPU by default')
+    parser.add_argument('--chunk-size', type=int, default=16)
+    parser.add_argument('--restart', action='store_true', help='run every scenario, even those already in the output')
+    args = parser.parse_args(argv)
+
+    scenarios = scenario_grid(map=args.maps, start=args.starts, target=args.targets, radius=args.radii)
+    started = time.perf_counter()
+    run_count, error_count = run_sweep(scenarios, args.output, workers=args.workers,
+                                       chunk_size=args.chunk_size, resume=not args.restart)
+    print(f'Ran {run_count} of {len(scenarios)} scenarios ({error_count} failed) '
+          f'in {time.perf_counter() - started:.2f}s', file=sys.stderr)
+    return 1 if error_count else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,265 +1,822 @@
-from graphs.graph import Graph, Vertex
+from array import array
+import heapq
+import math
+import time
+from itertools import compress
 
-class WeightedVertex(Vertex):
-    def __init__(self, vertex_id):
-        """
-        Initialize a vertex and its neighbors.
+from graphs.disjoint_set import DisjointSet
+from graphs.graph import Graph, NeighborView, Vertex
+from graphs.stats import FrontierProbe
 
-        Parameters:
-        vertex_id (string): A unique identifier to identify this vertex.
-        """
-        self.id = vertex_id
-        self.neighbors_dict = {} # id -> (obj, weight)
+INFINITY = float('inf')
+
+class WeightedVertex(Vertex):
+    """A vertex of a WeightedGraph, whose edges each carry a weight."""
+    __slots__ = ()
 
     def add_neighbor(self, vertex_obj, weight):
         """
-        Add a neighbor along a weighted edge by storing it in the neighbors dictionary.
+        Add a one-way weighted edge from this vertex to vertex_obj, or change
+        its weight. Listeners are told about it as for add_edge.
 
         Parameters:
-        vertex_obj (Vertex): An instance of Vertex to be stored as a neighbor.
+        vertex_obj (Vertex): The vertex to add as a neighbor.
         weight (int): The edge weight from self -> neighbor.
         """
-        self.neighbors_dict[vertex_obj.id] = (vertex_obj, weight)
+        graph = self.graph
+        old_weight = graph._add_arc(self.handle, vertex_obj.handle, weight)
+        graph._graph_changed()
+        graph._edge_changed(self.id, vertex_obj.id, old_weight, weight)
         return self.neighbors_dict
 
-    def get_neighbors(self):
-        """Return the neighbors of this vertex as a list of neighbor ids."""
-        neighbor_ids = [
-            neighbor for neighbor, weight 
-            in list(self.neighbors_dict.values())
-        ]
-        return neighbor_ids
-
     def get_neighbors_with_weights(self):
-        """Return the neighbors of this vertex as a list of tuples of (neighbor_id, weight)."""
-        return list(self.neighbors_dict.values())
-    
-    def get_id(self):
-        """Return the id of this vertex."""
-        return self.id
+        """Return the neighbors of this vertex as a live view of (neighbor, weight) tuples."""
+        return NeighborView(self.graph, self.handle, with_weights=True)
+
+
+def kruskal_from_edges(sorted_edges, vertex_ids=None):
+    """
+    Run Kruskal's Algorithm over a stream of edges that is already sorted by
+    weight, such as a pre-sorted edge file read with
+    `graphs.file_reader.iter_edges_from_file`. Edges are consumed one at a
+    time, so the full edge list never has to be held in memory.
 
-    def __str__(self):
-        """Output the list of neighbors of this vertex."""
-        neighbor_ids = [neighbor.get_id() for neighbor in self.get_neighbors()]
-        return f'{self.id} adjacent to {neighbor_ids}'
+    Parameters:
+    sorted_edges (iterable<tuple>): (start_id, dest_id, weight) edges in
+    non-decreasing weight order.
+    vertex_ids (iterable<string>): All vertex ids, if known. When given, the
+    stream stops being read once the tree spans every vertex.
 
-    def __repr__(self):
-        """Output the list of neighbors of this vertex."""
-        neighbor_ids = [neighbor.get_id() for neighbor in self.get_neighbors()]
-        return f'{self.id} adjacent to {neighbor_ids}'
+    Returns:
+    list<tuple>: The (start_id, dest_id, weight) edges of the minimum
+    spanning tree (or forest).
+    """
+    components = DisjointSet(vertex_ids or ())
+    # A spanning tree has V-1 edges, so stop early once every vertex is joined
+    edges_needed = len(components) - 1 if vertex_ids is not None else None
+
+    solution = []
+    for edge in sorted_edges:
+        if edges_needed is not None and len(solution) >= edges_needed:
+            break
+        if components.union(edge[0], edge[1]):
+            solution.append(edge)
+
+    return solution
 
 
 class WeightedGraph(Graph):
+    vertex_class = WeightedVertex
+
     def __init__(self, is_directed=True):
         """
-        Initialize a weighted graph object with an empty vertex dictionary.
+        Initialize a weighted graph object with no vertices.
 
         Parameters:
         is_directed (boolean): Whether the graph is directed (edges go in only one direction).
         """
-        self.vertex_dict = {} # id -> object
-        self.is_directed = is_directed
+        super(WeightedGraph, self).__init__(is_directed)
+        self.weights = array('d') # edge weights, parallel to targets
+        self.contraction_hierarchy = None # opt-in, see enable_contraction_hierarchy
 
-    def add_vertex(self, vertex_id):
+    @classmethod
+    def from_points(cls, points, mode='radius', radius=None, k=None, ids=None):
         """
-        Add a new vertex object to the graph with the given key and return the vertex.
+        Build an undirected food map from (x, y) point coordinates, joining
+        nearby points and weighting each edge by its length. See
+        graphs/spatial.py for the modes.
 
         Parameters:
-        vertex_id (string): The unique identifier for the new vertex.
+        points (array-like): The coordinates of the food sources.
+        mode (string): 'radius', 'knn', 'delaunay' or 'gabriel'.
+        radius (number): The distance for the 'radius' mode.
+        k (integer): The neighbor count for the 'knn' mode.
+        ids (list<string>): A distinct id for each point; defaults to '0', '1', ...
 
         Returns:
-        Vertex: The new vertex object.
+        WeightedGraph: The food map.
         """
-        vertex = Vertex(vertex_id)
-        self.vertex_dict[vertex_id] = vertex
-        return vertex
+        # SciPy is only needed here, so import it lazily
+        from graphs.spatial import build_spatial_graph
+
+        return build_spatial_graph(points, mode, radius, k, ids)
+
+    def _graph_changed(self):
+        """Called after every change to the vertices or edges of the graph."""
+        super(WeightedGraph, self)._graph_changed()
+        self.contraction_hierarchy = None
+
+    def enable_contraction_hierarchy(self):
+        """
+        Preprocess this (static) graph into a contraction hierarchy, after which
+        find_shortest_path and find_shortest_route are answered by a small
+        bidirectional upward search instead of a full Dijkstra. Any change to
+        the graph drops the hierarchy and queries go back to plain Dijkstra.
+
+        Returns:
+        ContractionHierarchy: The hierarchy, for inspecting its size.
+        """
+        from graphs.contraction import ContractionHierarchy
+
+        self.contraction_hierarchy = self._timed('contraction_hierarchy', ContractionHierarchy, self)
+        return self.contraction_hierarchy
 
     def add_edge(self, vertex_id1, vertex_id2, weight):
         """
         Add an edge from vertex with id `vertex_id1` to vertex with id `vertex_id2`.
+        Adding an edge that already exists changes its weight.
 
         Parameters:
         vertex_id1 (string): The unique identifier of the first vertex.
         vertex_id2 (string): The unique identifier of the second vertex.
+        weight (number): The edge weight.
         """
-        vertex1 = self.get_vertex(vertex_id1)
-        vertex2 = self.get_vertex(vertex_id2)
-        
-        # print("Vertex Id 1 {} Vertex Id 2 {}".format(vertex_id1, vertex_id2))
-        vertex1.add_neighbor(vertex2, weight)
-        
-        if self.is_directed == False:
-            vertex2.add_neighbor(vertex1, weight)
-    
-    # Kruskal's Algorithm - Find Edges of a Minimum-Spanning Tree
-    def union(self, parent_map, vertex_id1, vertex_id2):
-        """Combine vertex_id1 and vertex_id2 into the same group."""
-        vertex1_root = self.find(parent_map, vertex_id1)
-        vertex2_root = self.find(parent_map, vertex_id2)
-        parent_map[vertex1_root] = vertex2_root
+        handle1 = self._handle(vertex_id1)
+        handle2 = self._handle(vertex_id2)
+        old_weight = self._add_edge_handles(handle1, handle2, weight)
 
+        self._graph_changed()
+        self._edge_changed(vertex_id1, vertex_id2, old_weight, weight)
 
-    def find(self, parent_map, vertex_id):
-        """Get the root (or, group label) for vertex_id."""
-        if(parent_map[vertex_id] == vertex_id):
-            return vertex_id
-        return self.find(parent_map, parent_map[vertex_id])
+    def add_edges(self, edges):
+        """
+        Add many weighted edges at once. Missing vertices are created and
+        existing vertices keep their neighbors.
+
+        Parameters:
+        edges (iterable<tuple>): (vertex_id1, vertex_id2, weight) triples.
+        """
+        index = self.index
+        listeners = self.listeners
+
+        for vertex_id1, vertex_id2, weight in edges:
+            handle1 = index.get(vertex_id1)
+            if handle1 is None:
+                handle1 = self._new_handle(vertex_id1)
+            handle2 = index.get(vertex_id2)
+            if handle2 is None:
+                handle2 = self._new_handle(vertex_id2)
+
+            old_weight = self._add_edge_handles(handle1, handle2, weight)
+            if listeners:
+                self._edge_changed(vertex_id1, vertex_id2, old_weight, weight)
+
+        self._maybe_compact()
+        self._graph_changed()
 
+    def update_weight(self, vertex_id1, vertex_id2, weight):
+        """
+        Change the weight of the existing edge from `vertex_id1` to `vertex_id2`
+        (in both directions if the graph is undirected).
+
+        Parameters:
+        vertex_id1 (string): The unique identifier of the first vertex.
+        vertex_id2 (string): The unique identifier of the second vertex.
+        weight (number): The new edge weight.
+        """
+        handle1, handle2, position = self._edge_position(vertex_id1, vertex_id2)
+        old_weight = self.weights[position]
+        self.weights[position] = weight
+        if not self.is_directed:
+            self.weights[self._find_arc(handle2, handle1)] = weight
+
+        self._graph_changed()
+        self._edge_changed(vertex_id1, vertex_id2, old_weight, weight)
+
+    # Kruskal's Algorithm - Find Edges of a Minimum-Spanning Tree
     def minimum_spanning_tree_kruskal(self):
         """
         Use Kruskal's Algorithm to return a list of edges, as tuples of 
         (start_id, dest_id, weight) in the graph's minimum spanning tree.
+        If the graph is disconnected, the edges of a minimum spanning forest
+        are returned.
         """
-        # Create a list of all edges in the graph, sort them by weight 
-        # from smallest to largest
+        # Create a list of all edges in the graph, listing each undirected
+        # edge only once, and sort them by weight from smallest to largest
+        ids, starts, degrees, targets, weights = (
+            self.ids, self.starts, self.degrees, self.targets, self.weights)
+        stats = self.stats
+        if stats is not None:
+            started = time.perf_counter()
+
         edges = []
+        for handle in self.index.values():
+            for position in range(starts[handle], starts[handle] + degrees[handle]):
+                neighbor = targets[position]
+                # An undirected edge is stored at both ends; keep the copy
+                # whose far end has the higher handle
+                if self.is_directed or neighbor >= handle:
+                    edges.append((ids[handle], ids[neighbor], weights[position]))
+        if stats is not None:
+            collected = time.perf_counter()
+            stats.record('kruskal.collect', collected - started, len(self.index), self.arc_count)
+
+        edges.sort(key=lambda item: item[2])
+        if stats is not None:
+            started = time.perf_counter()
+            stats.record('kruskal.sort', started - collected)
 
-        # Got this from github.com/squeaky1273, clever way to simply sort the edges using sorted and an anonymous function
-        for vertex in self.get_vertices():
-            for neighbor, weight in vertex.get_neighbors_with_weights():
-                edges.append((vertex.get_id(), neighbor.get_id(), weight))
-        edges = sorted(edges, key=lambda item: item[2])
-
-        # Create a dictionary `parent_map` to map vertex -> its "parent". 
-        # Initialize it so that each vertex is its own parent.
-        parent_map = {x[0]:x[0] for x in edges}
-
-        # Create an empty list to hold the solution (i.e. all edges in the 
-        # final spanning tree)
-        solution = list()
-
-        # While the spanning tree holds < V-1 edges, get the smallest 
-        # edge. If the two vertices connected by the edge are in different sets 
-        # (i.e. calling `find()` gets two different roots), then it will not 
-        # create a cycle, so add it to the solution set and call `union()` on 
-        # the two vertices.
-        while len(solution) <= len(edges) - 1:
-            current_edge = edges.pop(0)
-            (v1, v2, weight) = current_edge
-            if self.find(parent_map, v1) != self.find(parent_map, v2):
-                solution.append(current_edge)
-                self.union(parent_map, v1, v2)        
-
-        # Return the solution list.
-        return solution
+        tree = kruskal_from_edges(edges, self.index.keys())
+        if stats is not None:
+            stats.record('kruskal.union', time.perf_counter() - started)
+        return tree
     
     
-    # Prim's Algorithm - Find the weight of a MST
+    # Prim's Algorithm - Find the edges and weight of a MST
+    def prim_spanning_tree(self, start_id=None, forest=False):
+        """
+        Use Prim's Algorithm with a binary heap to find a minimum spanning tree
+        in O(E log V) time.
+
+        Parameters:
+        start_id (string): The vertex to grow the tree from. Defaults to the
+        first vertex in the graph.
+        forest (boolean): If True, keep starting new trees from unreached
+        vertices, so a disconnected graph gives a minimum spanning forest.
+        Otherwise only the component containing start_id is spanned.
+
+        Returns:
+        tuple(list<tuple>, number): The tree edges as (start_id, dest_id, weight)
+        tuples, and their total weight.
+        """
+        if not self.index:
+            return [], 0
+        if start_id is None:
+            start_id = next(iter(self.index))
+        elif not self.contains_id(start_id):
+            raise KeyError("Start id not in graph")
+
+        ids, starts, degrees, targets, weights = (
+            self.ids, self.starts, self.degrees, self.targets, self.weights)
+        in_tree = bytearray(len(ids))
+        edges = []
+        total_weight = 0
+
+        roots = [self.index[start_id]]
+        if forest:
+            roots.extend(self.index.values())
+
+        push, pop = heapq.heappush, heapq.heappop
+        stats = self.stats
+        if stats is not None:
+            started = time.perf_counter()
+            probe = FrontierProbe([])
+            push, pop = probe.heappush, probe.heappop
+
+        for root in roots:
+            if in_tree[root]:
+                continue
+
+            # Heap of (edge weight, vertex handle, handle of the tree vertex it hangs from)
+            heap = [(0, root, -1)]
+            if stats is not None:
+                probe.frontier = heap
+                probe.pushes += 1
+            while heap:
+                weight, current, parent = pop(heap)
+                # Skip stale entries for vertices already in the tree
+                if in_tree[current]:
+                    continue
+                in_tree[current] = 1
+
+                if parent >= 0:
+                    edges.append((ids[parent], ids[current], weight))
+                    total_weight += weight
+
+                for position in range(starts[current], starts[current] + degrees[current]):
+                    neighbor = targets[position]
+                    if not in_tree[neighbor]:
+                        push(heap, (weights[position], neighbor, current))
+
+        if stats is not None:
+            reached = len(in_tree) - in_tree.count(0)
+            probe.report(stats, 'prim', started, reached, sum(compress(degrees, in_tree)))
+        return edges, total_weight
+
     def minimum_spanning_tree_prim(self):
         """
         Use Prim's Algorithm to return the total weight of all edges in the
-        graph's spanning tree.
-
-        Assume that the graph is connected.
-        """
-        # Create a dictionary `vertex_to_weight` and initialize all
-        # vertices to INFINITY - hint: use `float('inf')`
-        vertex_to_weight = {}
-        for vertex in self.vertex_dict.values():
-            vertex_to_weight[vertex] = float('inf')
-
-        # Choose one vertex and set its weight to 0
-        start = self.get_vertices()[0]
-        vertex_to_weight[start] = 0 
-        MST_weight = 0
-
-        # While `vertex_to_weight` is not empty:
-        while vertex_to_weight:
-        # 1. Get the minimum-weighted remaining vertex, remove it from the
-        #    dictionary, & add its weight to the total MST weight
-        # 2. Update that vertex's neighbors, if edge weights are smaller than
-        #    previous weights
-            min_weight = min(vertex_to_weight.items(), key=lambda x: x[1])
-            current_vertex = min_weight[0]
-            vertex_to_weight.pop(current_vertex, None)
-            MST_weight += min_weight[1]
-            
-            for vertex in current_vertex.get_neighbors_with_weights():
-                neighbor, weight = vertex
-                if neighbor in vertex_to_weight:
-                    if weight < vertex_to_weight[neighbor]:
-                        vertex_to_weight[neighbor] = weight
-
-        # Return total weight of MST
-        return MST_weight
+        graph's spanning tree. If the graph is disconnected, this is the total
+        weight of its minimum spanning forest.
+        """
+        _, total_weight = self.prim_spanning_tree(forest=True)
+        return total_weight
+        
+    
+    def steiner_tree(self, terminal_ids):
+        """
+        Approximate the cheapest tree connecting the given food vertices, which
+        unlike a minimum spanning tree may skip vertices that are not needed.
+        See graphs/steiner.py for the method (Mehlhorn's 2-approximation).
+
+        Parameters:
+        terminal_ids (iterable<string>): The ids of the vertices to connect.
+
+        Returns:
+        tuple(list<tuple>, number): The tree edges as (start_id, dest_id, weight)
+        tuples, and their total weight.
+        """
+        from graphs.steiner import steiner_tree
+
+        return self._timed('steiner_tree', steiner_tree, self, terminal_ids)
+
+    def dynamic_shortest_path_tree(self, start_id):
+        """
+        Return a shortest-path tree from start_id that repairs itself as edges
+        are added, removed or reweighted, instead of being recomputed. See
+        graphs/dynamic.py.
+
+        Returns:
+        DynamicShortestPathTree: Answers distance_to(id) and path_to(id).
+        """
+        from graphs.dynamic import DynamicShortestPathTree
+
+        return self._timed('dynamic_shortest_path_tree', DynamicShortestPathTree, self, start_id)
+
+    def dynamic_spanning_tree(self):
+        """
+        Return a minimum spanning forest of this undirected graph that swaps
+        edges in and out as the graph changes, instead of being recomputed.
+        See graphs/dynamic.py.
+
+        Returns:
+        DynamicSpanningTree: Holds the tree edges and their total weight.
+        """
+        from graphs.dynamic import DynamicSpanningTree
+
+        return self._timed('dynamic_spanning_tree', DynamicSpanningTree, self)
         
     
     # Dijkstra's Algorithm - Shortest Path
+    def _dijkstra(self, start_ids, target_ids=None, max_distance=None):
+        """
+        Run Dijkstra's Algorithm using a binary heap with lazy deletion: instead
+        of decreasing a key in place, a new (distance, id) entry is pushed and
+        stale entries are skipped when they are popped.
+
+        Several start vertices behave like one super-source joined to each of
+        them by a zero-weight edge, so every vertex ends up with its distance
+        to the nearest start.
+
+        Parameters:
+        start_ids (list<string>): The ids of the start vertices.
+        target_ids (collection<string>): If given, stop as soon as all of
+        these vertices are settled.
+        max_distance (number): If given, never reach past this total weight,
+        so only the region within the budget is explored.
+
+        Returns:
+        tuple(dict, dict): The settled vertex id -> distance map, and the
+        vertex id -> previous vertex id map used to rebuild paths. The
+        distance map is in the order the vertices were settled.
+        """
+        for start_id in start_ids:
+            if not self.contains_id(start_id):
+                raise KeyError("Start id not in graph")
+
+        ids, index = self.ids, self.index
+        starts, degrees, targets, weights = self.starts, self.degrees, self.targets, self.weights
+
+        # The search runs on vertex handles and only the results are keyed by id
+        start_handles = [index[start_id] for start_id in start_ids]
+        distance = {}  # settled vertices only
+        best = {start: 0 for start in start_handles}  # best known (tentative) distances
+        previous = {start: -1 for start in start_handles}
+        heap = [(0, start) for start in start_handles]
+        if max_distance is None:
+            max_distance = INFINITY
+        remaining = {index[target_id] for target_id in target_ids if target_id in index} if target_ids else None
+        push, pop = heapq.heappush, heapq.heappop
+        stats = self.stats
+        if stats is not None:
+            probe = FrontierProbe(heap)
+            push, pop = probe.heappush, probe.heappop
+            started = time.perf_counter()
+
+        while heap:
+            current_distance, current = pop(heap)
+
+            # Skip stale heap entries for vertices we already settled
+            if current in distance:
+                continue
+            distance[current] = current_distance
+
+            if remaining is not None and current in remaining:
+                remaining.discard(current)
+                if not remaining:
+                    break
+
+            # Relax every outgoing edge of the settled vertex
+            offset = starts[current]
+            for neighbor, weight in zip(targets[offset:offset + degrees[current]],
+                                        weights[offset:offset + degrees[current]]):
+                if neighbor in distance:
+                    continue
+                new_distance = current_distance + weight
+                if new_distance > max_distance:
+                    continue
+                if new_distance < best.get(neighbor, INFINITY):
+                    best[neighbor] = new_distance
+                    previous[neighbor] = current
+                    push(heap, (new_distance, neighbor))
+
+        if stats is not None:
+            # The last vertex settled is only expanded if the search ran out
+            # of heap instead of reaching all its targets
+            expanded = list(distance)
+            if remaining is not None and not remaining:
+                expanded.pop()
+            probe.report(stats, 'dijkstra', started, len(distance),
+                         sum(degrees[handle] for handle in expanded))
+        return ({ids[handle]: cost for handle, cost in distance.items()},
+                {ids[handle]: ids[parent] if parent >= 0 else None
+                 for handle, parent in previous.items()})
+
+    def _shortest_path_tree(self, start_id):
+        """Run a full Dijkstra from start_id and return its (distance, previous) maps."""
+        return self._dijkstra([start_id])
+
     def find_shortest_path(self, start_id, target_id):
         """
         Use Dijkstra's Algorithm to return the total weight of the shortest path
         from a start vertex to a destination.
+
+        Parameters:
+        start_id (string): The id of the start vertex.
+        target_id (string): The id of the target (end) vertex.
+
+        Returns:
+        number: The total weight of the shortest path, or None if the target
+        cannot be reached.
         """
-        # Create a dictionary `vertex_to_distance` and initialize all
-        # vertices to INFINITY - hint: use `float('inf')`
-        vertex_to_distance = {}
-        for vertex in self.vertex_dict.values():
-            vertex_to_distance[vertex] = float('inf')
-            
-        start_vertex = self.vertex_dict[start_id]
-        vertex_to_distance[start_vertex] = 0
-
-        # While `vertex_to_distance` is not empty:
-        while vertex_to_distance:
-        # 1. Get the minimum-distance remaining vertex, remove it from the
-        #    dictionary. If it is the target vertex, return its distance.
-            min_distance = min(vertex_to_distance.values())
-            min_vertex = None
-            
-            for vertex in vertex_to_distance:
-                if vertex_to_distance[vertex] == min_distance:
-                    min_vertex = vertex
-        
-        # 2. Update that vertex's neighbors by adding the edge weight to the
-        #    vertex's distance, if it is lower than previous.
-            weight_of_neighbor = (
-                list(min_vertex.neighbors_dict.values())
-            )
-            
-            if min_vertex.id == target_id:
-                return vertex_to_distance[min_vertex]
-            
-            for neighbor, weight in weight_of_neighbor:
-                if neighbor in vertex_to_distance:
-                    current_distance = vertex_to_distance[neighbor]
-                    new_distance = weight + vertex_to_distance[min_vertex]
-                    if new_distance < current_distance:
-                        vertex_to_distance[neighbor] = new_distance
-
-            del vertex_to_distance[min_vertex]
-
-        # Return None if target vertex not found.
-        return None
+        if not self.contains_id(start_id) or not self.contains_id(target_id):
+            raise KeyError("One or both vertices are not in the graph!")
+
+        if self.contraction_hierarchy is not None:
+            return self._timed('contraction_hierarchy.query',
+                               self.contraction_hierarchy.find_shortest_path, start_id, target_id)
+
+        if self.path_cache is not None:
+            distance, _ = self._cached_tree(start_id)
+        else:
+            distance, _ = self._dijkstra([start_id], [target_id])
+        return distance.get(target_id)
+
+    def find_shortest_route(self, start_id, target_id):
+        """
+        Use Dijkstra's Algorithm to find the shortest path from a start vertex
+        to a destination, along with the vertices on that path.
+
+        Parameters:
+        start_id (string): The id of the start vertex.
+        target_id (string): The id of the target (end) vertex.
+
+        Returns:
+        tuple(number, list<string>): The total weight of the path and the ids
+        of the vertices on it, from start to end, or (None, None) if the
+        target cannot be reached.
+        """
+        if not self.contains_id(start_id) or not self.contains_id(target_id):
+            raise KeyError("One or both vertices are not in the graph!")
+
+        if self.contraction_hierarchy is not None:
+            return self._timed('contraction_hierarchy.query',
+                               self.contraction_hierarchy.find_shortest_route, start_id, target_id)
+
+        if self.path_cache is not None:
+            distance, previous = self._cached_tree(start_id)
+        else:
+            distance, previous = self._dijkstra([start_id], [target_id])
+        if target_id not in distance:
+            return None, None
+        return distance[target_id], self._build_path(previous, target_id)
+
+    def find_all_distances(self, start_id):
+        """
+        Use a single run of Dijkstra's Algorithm to find the shortest distance
+        from a start vertex to every vertex reachable from it.
+
+        Parameters:
+        start_id (string): The id of the start vertex.
+
+        Returns:
+        dict: Vertex id -> total weight of the shortest path from start_id.
+        Unreachable vertices are left out.
+        """
+        if self.path_cache is not None:
+            distance, _ = self._cached_tree(start_id)
+            return dict(distance)
+
+        distance, _ = self._dijkstra([start_id])
+        return distance
+
+    def find_vertices_within(self, start_id, budget, band_width=1):
+        """
+        Find all vertices whose shortest-path cost from start_id is at most
+        `budget`, grouped into cost bands. Dijkstra's Algorithm is cut off at the
+        budget, so nothing beyond it is ever visited.
+
+        Parameters:
+        start_id (string): The id of the start vertex.
+        budget (number): The largest total edge weight the mold may travel.
+        Must be finite; use find_all_distances for everything reachable.
+        band_width (number): The cost range covered by each band.
+
+        Returns:
+        list<list<string>>: Band n holds the ids of the vertices with cost in
+        [n * band_width, (n + 1) * band_width), in increasing cost order. The
+        list stops at the last band any vertex reached, so a large budget
+        costs nothing for the bands beyond the mold's reach.
+        """
+        if not math.isfinite(budget) or budget < 0:
+            raise ValueError(f"budget must be a finite number of at least 0, got {budget}")
+        if not band_width > 0:
+            raise ValueError(f"band_width must be positive, got {band_width}")
+
+        distance, _ = self._dijkstra([start_id], max_distance=budget)
+
+        # Only the bands that were reached get a list
+        reached = {}
+        for vertex_id, cost in distance.items():
+            reached.setdefault(int(cost // band_width), []).append(vertex_id)
+        return [reached.get(n, []) for n in range(max(reached) + 1)]
+
+    def find_shortest_path_astar(self, start_id, target_id):
+        """
+        Use A* search with a straight-line (Euclidean) distance heuristic to
+        find the shortest path from a start vertex to a destination. Every
+        vertex needs a position, and no edge weight may be shorter than the
+        straight-line distance between its ends, or the path may not be optimal.
+
+        Parameters:
+        start_id (string): The id of the start vertex.
+        target_id (string): The id of the target (end) vertex.
+
+        Returns:
+        tuple(number, list<string>, integer): The total weight of the path, the
+        ids of the vertices on it, and how many vertices were settled. The
+        first two are None if the target cannot be reached.
+        """
+        if not self.contains_id(start_id) or not self.contains_id(target_id):
+            raise KeyError("One or both vertices are not in the graph!")
+
+        ids, positions = self.ids, self.positions
+        starts, degrees, targets, weights = self.starts, self.degrees, self.targets, self.weights
+        start = self.index[start_id]
+        target = self.index[target_id]
+
+        target_position = positions.get(target)
+        if target_position is None:
+            raise ValueError("A* needs vertex positions, but the target has none")
+        target_x, target_y = target_position
+
+        def estimate(handle):
+            position = positions.get(handle)
+            if position is None:
+                raise ValueError(f"Vertex {ids[handle]!r} has no position")
+            x, y = position
+            return math.hypot(x - target_x, y - target_y)
+
+        settled = set()
+        best = {start: 0}
+        previous = {start: -1}
+        # Heap of (distance so far + estimate to target, distance so far, handle)
+        heap = [(estimate(start), 0, start)]
+        push, pop = heapq.heappush, heapq.heappop
+        stats = self.stats
+        if stats is not None:
+            probe = FrontierProbe(heap)
+            push, pop = probe.heappush, probe.heappop
+            started = time.perf_counter()
+
+        while heap:
+            _, current_distance, current = pop(heap)
+            if current in settled:
+                continue
+            settled.add(current)
+
+            if current == target:
+                if stats is not None:
+                    probe.report(stats, 'astar', started, len(settled),
+                                 sum(degrees[handle] for handle in settled) - degrees[target])
+                path = [current]
+                while previous[path[-1]] >= 0:
+                    path.append(previous[path[-1]])
+                path.reverse()
+                return current_distance, [ids[handle] for handle in path], len(settled)
+
+            offset = starts[current]
+            for neighbor, weight in zip(targets[offset:offset + degrees[current]],
+                                        weights[offset:offset + degrees[current]]):
+                if neighbor in settled:
+                    continue
+                new_distance = current_distance + weight
+                if new_distance < best.get(neighbor, INFINITY):
+                    best[neighbor] = new_distance
+                    previous[neighbor] = current
+                    push(heap, (new_distance + estimate(neighbor), new_distance, neighbor))
+
+        if stats is not None:
+            probe.report(stats, 'astar', started, len(settled),
+                         sum(degrees[handle] for handle in settled))
+        return None, None, len(settled)
+
+    def find_shortest_path_bidirectional(self, start_id, target_id):
+        """
+        Use bidirectional Dijkstra to find the shortest path from a start
+        vertex to a destination, searching forwards from the start and
+        backwards from the target until the two searches meet. Needs no
+        vertex positions.
+
+        Parameters:
+        start_id (string): The id of the start vertex.
+        target_id (string): The id of the target (end) vertex.
+
+        Returns:
+        tuple(number, list<string>, integer): The total weight of the path, the
+        ids of the vertices on it, and how many vertices were settled by both
+        searches together. The first two are None if the target cannot be reached.
+        """
+        if not self.contains_id(start_id) or not self.contains_id(target_id):
+            raise KeyError("One or both vertices are not in the graph!")
+
+        ids, starts, degrees, targets, weights = (
+            self.ids, self.starts, self.degrees, self.targets, self.weights)
+        start = self.index[start_id]
+        target = self.index[target_id]
+
+        def forward_neighbors(handle):
+            offset = starts[handle]
+            return zip(targets[offset:offset + degrees[handle]],
+                       weights[offset:offset + degrees[handle]])
+        if self.is_directed:
+            offsets, sources, source_weights = self._reverse_arcs()
+            backward_neighbors = lambda handle: zip(
+                sources[offsets[handle]:offsets[handle + 1]],
+                source_weights[offsets[handle]:offsets[handle + 1]])
+        else:
+            backward_neighbors = forward_neighbors
+
+        # Index 0 is the forward search, index 1 the backward search
+        neighbors = (forward_neighbors, backward_neighbors)
+        best = ({start: 0}, {target: 0})
+        previous = ({start: -1}, {target: -1})
+        settled = (set(), set())
+        heaps = ([(0, start)], [(0, target)])
+
+        shortest = INFINITY
+        meeting = -1
+
+        pushes = (heapq.heappush, heapq.heappush)
+        pops = (heapq.heappop, heapq.heappop)
+        stats = self.stats
+        if stats is not None:
+            probes = (FrontierProbe(heaps[0]), FrontierProbe(heaps[1]))
+            pushes = (probes[0].heappush, probes[1].heappush)
+            pops = (probes[0].heappop, probes[1].heappop)
+            started = time.perf_counter()
+
+        while heaps[0] and heaps[1]:
+            # Stop once no path through unsettled vertices can be shorter
+            if heaps[0][0][0] + heaps[1][0][0] >= shortest:
+                break
+
+            # Advance whichever search has the smaller frontier
+            side = 0 if len(heaps[0]) <= len(heaps[1]) else 1
+            current_distance, current = pops[side](heaps[side])
+            if current in settled[side]:
+                continue
+            settled[side].add(current)
+
+            other_best = best[1 - side]
+            for neighbor, weight in neighbors[side](current):
+                new_distance = current_distance + weight
+                if new_distance < best[side].get(neighbor, INFINITY):
+                    best[side][neighbor] = new_distance
+                    previous[side][neighbor] = current
+                    pushes[side](heaps[side], (new_distance, neighbor))
+                # A path through this edge joins the two searches
+                if neighbor in other_best:
+                    total = best[side][neighbor] + other_best[neighbor]
+                    if total < shortest:
+                        shortest = total
+                        meeting = neighbor
+
+        settled_count = len(settled[0]) + len(settled[1])
+        if stats is not None:
+            backward_edges = (sum(offsets[handle + 1] - offsets[handle] for handle in settled[1])
+                              if self.is_directed else sum(degrees[handle] for handle in settled[1]))
+            stats.record('bidirectional', time.perf_counter() - started, settled_count,
+                         sum(degrees[handle] for handle in settled[0]) + backward_edges,
+                         probes[0].pushes + probes[1].pushes, probes[0].pops + probes[1].pops,
+                         probes[0].peak + probes[1].peak)
+        if start_id == target_id:
+            return 0, [start_id], settled_count
+        if meeting < 0:
+            return None, None, settled_count
+
+        # Join the forward path to the meeting vertex with the backward path from it
+        path = [meeting]
+        while previous[0][path[-1]] >= 0:
+            path.append(previous[0][path[-1]])
+        path.reverse()
+        current = previous[1][meeting]
+        while current >= 0:
+            path.append(current)
+            current = previous[1][current]
+        return shortest, [ids[handle] for handle in path], settled_count
+
+    def build_landmark_index(self, landmark_count=8):
+        """
+        Preprocess the graph for repeated point-to-point queries by building an
+        ALT landmark index (see graphs/landmarks.py). Query it with
+        `index.find_shortest_path(start_id, target_id)`, and save it with
+        `index.save(filename)` to reload later with `LandmarkIndex.load`.
+
+        Parameters:
+        landmark_count (integer): How many landmarks to pick.
+
+        Returns:
+        LandmarkIndex: The index, which reports itself stale once the graph changes.
+        """
+        from graphs.landmarks import LandmarkIndex
+
+        return self._timed('landmark_index', LandmarkIndex.build, self, landmark_count)
+
+    def search_effort(self, start_id, target_id):
+        """
+        Report how many vertices each point-to-point search settles on the same
+        query, to measure how much the goal-directed searches save.
+
+        Returns:
+        dict: Search name -> number of settled vertices. 'astar' is only
+        included if every vertex has a position.
+        """
+        distance, _ = self._dijkstra([start_id], [target_id])
+        effort = {
+            'dijkstra': len(distance),
+            'bidirectional': self.find_shortest_path_bidirectional(start_id, target_id)[2],
+        }
+        if len(self.positions) == len(self.index):
+            effort['astar'] = self.find_shortest_path_astar(start_id, target_id)[2]
+        return effort
+
+    def find_nearest_sources(self, source_ids):
+        """
+        Use a single multi-source run of Dijkstra's Algorithm to find, for
+        every reachable vertex, the nearest of several source vertices (for
+        example, the nearest food source to every colony).
+
+        Parameters:
+        source_ids (iterable<string>): The ids of the source vertices.
+
+        Returns:
+        dict: Vertex id -> (distance, id of the nearest source). Vertices that
+        no source can reach are left out.
+        """
+        distance, previous = self._dijkstra(list(source_ids))
+
+        # Vertices are settled after their predecessor, so one pass in settle
+        # order is enough to copy each source down its shortest-path tree
+        nearest = {}
+        for vertex_id, cost in distance.items():
+            previous_id = previous[vertex_id]
+            source_id = vertex_id if previous_id is None else nearest[previous_id][1]
+            nearest[vertex_id] = (cost, source_id)
+        return nearest
         
         
     def floyd_warshall(self):
         """
         Return the All-Pairs-Shortest-Paths dictionary, containing the shortest
         paths from each vertex to each other vertex.
+
+        The work is done by `graphs.all_pairs`, which runs either a vectorized
+        Floyd-Warshall over a NumPy distance matrix or repeated heap Dijkstra,
+        whichever is estimated to be cheaper for this graph. Use
+        `all_pairs_shortest_paths` directly to get the matrix itself.
+
+        Returns:
+        dict: Start vertex id -> (target vertex id -> distance), with
+        INFINITY for unreachable pairs.
         """
-        
-        dist = {}
-        vertex_ids = self.vertex_dict.keys()
-        
-        # Create a dictionary of all vertices and their possible connections
-        for v1 in vertex_ids:
-            dist[vertex1] = dict()
-            for v2 in vertex_ids:
-                dist[v1][v2] = WeightedGraph.INFINITY
-            dist[v1][v1] = 0
-        
-        # Add all edge weights to the dict
-        vertices = self.get_vertices()
-        
-        for vertex in vertices:
-            weighted_neighbors = vertex.get_neighbors_with_weights()
-            
-            for neighbor, weight in weighted_neighbors:
-                dist[vertex.get_id()][neighbor.get_id()] = weight
-        
-        for i in vertices:
-            for j in vertices:
-                for k in vertices:
-                    dist[i][j] = min(dist[i][j], dist[i][k] + dist[k][j])
-                    
-        return dist
\ No newline at end of file
+        # NumPy is only needed here, so import it lazily
+        from graphs.all_pairs import all_pairs_shortest_paths
+
+        return self._timed('all_pairs', all_pairs_shortest_paths, self).to_dict()
+
+    def all_pairs_shortest_paths(self, method='auto', predecessors=False):
+        """
+        Compute the shortest distance between every pair of vertices.
+
+        Parameters:
+        method (string): 'floyd_warshall', 'dijkstra' or 'auto'.
+        predecessors (boolean): Whether to build the predecessor matrix for
+        path reconstruction.
+
+        Returns:
+        AllPairsResult: The distance matrix and the id <-> index mapping.
+        """
+        from graphs.all_pairs import all_pairs_shortest_paths
+
+        return self._timed('all_pairs', all_pairs_shortest_paths, self, method, predecessors)
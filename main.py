@@ -1,5 +1,5 @@
 from graphs.weighted_graph import WeightedGraph
-from graphs.graph import Graph
+from graphs.growth import growth_rings
 
 """ The questions:
 - How the slime mold will go from one vertex to another(Dijkstra's Algorithm), 
@@ -8,17 +8,13 @@ from graphs.graph import Graph
 """
 
 # Find all nodes n away as the slime mold expands in growth
-def mold_growth(self, start, search_range):
+def mold_growth(graph, start, search_range):
     """ For finding all of the nodes around within a certain range, simulating mold exploring around itself for food
+
+    Returns a list of rings, where ring n holds the food n steps away from start, for n < search_range
     """
-    food = list()
-    
-    # Find all nodes of food around the starting point, simulating the mold growing out in all directions
-    for dist in range(search_range):
-        current_found = Graph.find_vertices_n_away(graph, start, dist)
-        if current_found not in food:
-            food.append(current_found)
-    return food
+    # Grow the mold out in all directions one ring at a time, only visiting each node once
+    return growth_rings(graph, start, search_range)
 
 
 # Create a large, weighted, undirected graph of food nodes
@@ -58,7 +54,7 @@ if __name__ == "__main__":
     shortest_path = graph.find_shortest_path('A', 'J')
     
     # Finding all nodes of food around the start of mold growth, in this case within a distance of 6
-    food_in_vicinity = mold_growth(graph, 'a', 6)
+    food_in_vicinity = mold_growth(graph, 'A', 6)
     
     # Finding what the slime mold would look like if it didn't have the extra connections between nodes
     mold_no_extra = graph.minimum_spanning_tree_prim()
\ No newline at end of file
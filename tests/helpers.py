@@ -0,0 +1,99 @@
+"""Random graphs and slow, obviously correct reference algorithms to check the real ones against."""
+import heapq
+import random
+
+import pytest
+
+from graphs.graph import Graph
+from graphs.weighted_graph import WeightedGraph
+
+
+def random_graph(seed, vertex_count=30, edge_count=60, directed=False, weighted=True):
+    """
+    Return (graph, model), where model is a plain vertex id -> {neighbor id:
+    weight} dict holding the same edges, with undirected edges both ways.
+    """
+    rng = random.Random(seed)
+    graph = WeightedGraph(directed) if weighted else Graph(directed)
+    model = {}
+    for i in range(vertex_count):
+        graph.add_vertex(str(i))
+        model[str(i)] = {}
+    for _ in range(edge_count):
+        vertex_id1, vertex_id2 = str(rng.randrange(vertex_count)), str(rng.randrange(vertex_count))
+        if weighted:
+            weight = rng.randint(1, 20)
+            graph.add_edge(vertex_id1, vertex_id2, weight)
+        else:
+            weight = 1
+            graph.add_edge(vertex_id1, vertex_id2)
+        model[vertex_id1][vertex_id2] = weight
+        if not directed:
+            model[vertex_id2][vertex_id1] = weight
+    return graph, model
+
+
+def model_of(graph):
+    """Read a graph back into the model form of random_graph."""
+    return {vertex_id: dict(graph.neighbors_with_weights(vertex_id)) for vertex_id in graph.vertex_dict}
+
+
+def reference_distances(model, start_id):
+    """Textbook Dijkstra over a model, returning vertex id -> distance for reachable vertices."""
+    distance = {start_id: 0}
+    heap = [(0, start_id)]
+    done = set()
+    while heap:
+        cost, vertex_id = heapq.heappop(heap)
+        if vertex_id in done:
+            continue
+        done.add(vertex_id)
+        for neighbor_id, weight in model[vertex_id].items():
+            if cost + weight < distance.get(neighbor_id, float('inf')):
+                distance[neighbor_id] = cost + weight
+                heapq.heappush(heap, (cost + weight, neighbor_id))
+    return distance
+
+
+def reference_spanning_weight(model):
+    """Total weight of a minimum spanning forest of an undirected model, by Kruskal with a plain dict union-find."""
+    parent = {vertex_id: vertex_id for vertex_id in model}
+
+    def find(vertex_id):
+        while parent[vertex_id] != vertex_id:
+            vertex_id = parent[vertex_id]
+        return vertex_id
+
+    edges = sorted((weight, vertex_id1, vertex_id2)
+                   for vertex_id1, neighbors in model.items()
+                   for vertex_id2, weight in neighbors.items() if vertex_id1 < vertex_id2)
+    total = 0
+    for weight, vertex_id1, vertex_id2 in edges:
+        root1, root2 = find(vertex_id1), find(vertex_id2)
+        if root1 != root2:
+            parent[root1] = root2
+            total += weight
+    return total
+
+
+def path_weight(model, path):
+    """Sum the model weights along a path of vertex ids."""
+    return sum(model[a][b] for a, b in zip(path, path[1:]))
+
+
+def queries(model, seed, count=15):
+    """Return count random (start id, target id) pairs over a model's vertices."""
+    rng = random.Random(seed)
+    ids = sorted(model)
+    return [(rng.choice(ids), rng.choice(ids)) for _ in range(count)]
+
+
+def check_route(model, start_id, target_id, distance, path):
+    """Check a (distance, path) answer against the reference Dijkstra."""
+    expected = reference_distances(model, start_id).get(target_id)
+    if expected is None:
+        assert distance is None and path is None
+        return
+    assert distance == pytest.approx(expected)
+    assert path[0] == start_id and path[-1] == target_id
+    assert path_weight(model, path) == pytest.approx(expected)
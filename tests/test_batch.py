@@ -0,0 +1,39 @@
+import pytest
+
+from graphs.batch import batch_shortest_paths, nearest_source_distances
+from graphs.csr_graph import CSRGraph
+from tests.helpers import queries, random_graph, reference_distances
+
+
+@pytest.mark.parametrize('directed', [False, True])
+@pytest.mark.parametrize('seed', range(3))
+def test_batch_matches_single_queries(seed, directed):
+    graph, model = random_graph(seed, directed=directed)
+    pairs = queries(model, seed, count=40)
+    expected = {(start_id, target_id): graph.find_shortest_path(start_id, target_id)
+                for start_id, target_id in pairs}
+
+    assert batch_shortest_paths(graph, pairs) == expected
+    assert batch_shortest_paths(graph, pairs, workers=2, chunk_size=3) == expected
+    assert batch_shortest_paths(CSRGraph.from_graph(graph), pairs, workers=2) == expected
+
+
+def test_batch_rejects_unknown_vertex():
+    graph, _ = random_graph(0)
+    with pytest.raises(KeyError):
+        batch_shortest_paths(graph, [('0', 'missing')])
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_nearest_source(seed):
+    graph, model = random_graph(seed, directed=True)
+    sources = ['0', '1', '2']
+    reached = {source_id: reference_distances(model, source_id) for source_id in sources}
+
+    for target_id, nearest in nearest_source_distances(graph, sources).items():
+        distances = [reached[source_id][target_id] for source_id in sources if target_id in reached[source_id]]
+        if not distances:
+            assert nearest is None
+            continue
+        distance, source_id = nearest
+        assert distance == min(distances) == reached[source_id][target_id]
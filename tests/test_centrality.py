@@ -0,0 +1,61 @@
+import itertools
+
+import pytest
+
+from tests.helpers import random_graph, reference_distances
+
+
+def brute_force_betweenness(model, directed):
+    """Count shortest paths through every vertex and edge, pair by pair."""
+    distance = {s: reference_distances(model, s) for s in model}
+
+    def path_count(s, t):
+        # Number of shortest s-t paths, by dynamic programming in distance order
+        counts = {s: 1}
+        for v in sorted(distance[s], key=distance[s].get):
+            for w, weight in model[v].items():
+                if distance[s][v] + weight == distance[s].get(w) and w != s:
+                    counts[w] = counts.get(w, 0) + counts[v]
+        return counts.get(t, 0)
+
+    sigma = {(s, t): path_count(s, t) for s in model for t in model}
+    vertices = dict.fromkeys(model, 0.0)
+    edges = {}
+    for s, t in itertools.permutations(model, 2):
+        if t not in distance[s]:
+            continue
+        total = sigma[s, t]
+        for v in model:
+            if v not in (s, t) and v in distance[s] and t in distance[v] \
+                    and distance[s][v] + distance[v][t] == distance[s][t]:
+                vertices[v] += sigma[s, v] * sigma[v, t] / total
+        for u in model:
+            for v, weight in model[u].items():
+                if u in distance[s] and t in distance[v] \
+                        and distance[s][u] + weight + distance[v][t] == distance[s][t]:
+                    key = (u, v) if directed else frozenset((u, v))
+                    edges[key] = edges.get(key, 0.0) + sigma[s, u] * sigma[v, t] / total
+    if not directed:
+        vertices = {v: score / 2 for v, score in vertices.items()}
+        edges = {e: score / 2 for e, score in edges.items()}
+    return vertices, edges
+
+
+@pytest.mark.parametrize('weighted', [False, True])
+@pytest.mark.parametrize('directed', [False, True])
+@pytest.mark.parametrize('seed', range(4))
+def test_betweenness_matches_brute_force(seed, directed, weighted):
+    graph, model = random_graph(seed, vertex_count=12, edge_count=24, directed=directed, weighted=weighted)
+    # Self-loops are on no shortest path, so leave them out of the brute force
+    for vertex_id, neighbors in model.items():
+        if vertex_id in neighbors:
+            del neighbors[vertex_id]
+            graph.remove_edge(vertex_id, vertex_id)
+
+    expected_vertices, expected_edges = brute_force_betweenness(model, directed)
+    vertices, edges = graph.betweenness_centrality()
+
+    assert vertices == pytest.approx(expected_vertices)
+    for (u, v), score in edges.items():
+        key = (u, v) if directed else frozenset((u, v))
+        assert score == pytest.approx(expected_edges.get(key, 0.0))
@@ -0,0 +1,12 @@
+import pytest
+
+from tests.helpers import random_graph
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_coloring_is_proper(seed):
+    graph, model = random_graph(seed, weighted=False)
+    for strategy in ('greedy', 'largest_first', 'dsatur'):
+        colors = graph.greedy_coloring(strategy)
+        assert set(colors) == set(model)
+        assert all(colors[a] != colors[b] for a in model for b in model[a] if a != b)
@@ -0,0 +1,35 @@
+import pytest
+
+from graphs.csr_graph import CSRGraph
+from graphs.graph import Graph
+from tests.helpers import model_of, queries, random_graph, reference_distances
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_csr_graph_round_trip(seed):
+    graph, model = random_graph(seed)
+    graph.remove_vertex('3')
+    model = model_of(graph)
+    csr = CSRGraph.from_graph(graph)
+    assert model_of(csr.to_graph()) == model
+    for start_id, target_id in queries(model, seed):
+        assert csr.find_shortest_path(start_id, target_id) == \
+            reference_distances(model, start_id).get(target_id)
+
+
+@pytest.mark.parametrize('directed', [False, True])
+@pytest.mark.parametrize('seed', range(4))
+def test_connected_components_match_graph(seed, directed):
+    graph, _ = random_graph(seed, edge_count=25, directed=directed, weighted=False)
+    components = CSRGraph.from_graph(graph).get_connected_components()
+
+    assert components == graph.get_connected_components()
+    assert sorted(sum(components, [])) == sorted(graph.vertex_dict)
+
+
+def test_connected_components_of_isolated_vertices():
+    graph = Graph()
+    for i in range(20000):
+        graph.add_vertex(str(i))
+    components = CSRGraph.from_graph(graph).get_connected_components()
+    assert components == [[str(i)] for i in range(20000)]
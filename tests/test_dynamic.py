@@ -0,0 +1,151 @@
+import random
+
+import pytest
+
+from graphs.graph import Graph
+from graphs.weighted_graph import WeightedGraph
+from tests.helpers import model_of, path_weight, random_graph, reference_distances, reference_spanning_weight
+
+
+class Recorder(object):
+    """A listener that keeps every change it is told about."""
+
+    def __init__(self):
+        self.changes = []
+
+    def edge_changed(self, vertex_id1, vertex_id2, old_weight, new_weight):
+        self.changes.append(('edge', vertex_id1, vertex_id2, old_weight, new_weight))
+
+    def vertex_removed(self, vertex_id):
+        self.changes.append(('vertex', vertex_id))
+
+
+def mutate(graph, rng):
+    """Make one random edge change: add, reweight, remove an edge, or remove a vertex."""
+    ids = list(graph.vertex_dict)
+    edges = [(a, b) for a in ids for b in graph.neighbor_ids(a)]
+    action = rng.random()
+    if action < 0.35 or not edges:
+        graph.add_edge(rng.choice(ids), rng.choice(ids), rng.randint(1, 20))
+    elif action < 0.7:
+        graph.update_weight(*rng.choice(edges), rng.randint(1, 20))
+    elif action < 0.95:
+        graph.remove_edge(*rng.choice(edges))
+    elif len(ids) > 5:
+        graph.remove_vertex(rng.choice(ids[1:]))
+
+
+@pytest.mark.parametrize('directed', [False, True])
+@pytest.mark.parametrize('seed', range(10))
+def test_dynamic_shortest_path_tree(seed, directed):
+    rng = random.Random(seed)
+    graph, _ = random_graph(seed, vertex_count=20, edge_count=45, directed=directed)
+    tree = graph.dynamic_shortest_path_tree('0')
+
+    for _ in range(60):
+        mutate(graph, rng)
+        model = model_of(graph)
+        expected = reference_distances(model, '0')
+        for vertex_id in model:
+            assert tree.distance_to(vertex_id) == expected.get(vertex_id)
+            path = tree.path_to(vertex_id)
+            if vertex_id in expected:
+                assert path[0] == '0' and path[-1] == vertex_id
+                assert path_weight(model, path) == expected[vertex_id]
+            else:
+                assert path is None
+
+    tree.close()
+    assert tree not in graph.listeners
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_dynamic_spanning_tree(seed):
+    rng = random.Random(seed)
+    graph, _ = random_graph(seed, vertex_count=20, edge_count=45)
+    tree = graph.dynamic_spanning_tree()
+
+    for _ in range(60):
+        mutate(graph, rng)
+        model = model_of(graph)
+        edges = tree.edges()
+        for vertex_id1, vertex_id2, weight in edges:
+            assert model[vertex_id1][vertex_id2] == weight
+        assert tree.total_weight == sum(weight for _, _, weight in edges)
+        assert tree.total_weight == reference_spanning_weight(model)
+        assert len(edges) == len(graph.minimum_spanning_tree_kruskal())
+
+
+def test_dynamic_spanning_tree_needs_undirected_graph():
+    graph, _ = random_graph(0, directed=True)
+    with pytest.raises(ValueError):
+        graph.dynamic_spanning_tree()
+
+
+def test_listeners_hear_every_change():
+    graph = WeightedGraph(is_directed=False)
+    for vertex_id in 'ABC':
+        graph.add_vertex(vertex_id)
+    recorder = Recorder()
+    graph.add_listener(recorder)
+
+    graph.add_edge('A', 'B', 2)
+    graph.update_weight('A', 'B', 4)
+    graph.add_edges([('B', 'C', 1)])
+    graph.remove_edge('A', 'B')
+    graph.remove_vertex('C')
+    graph.remove_listener(recorder)
+    graph.add_edge('A', 'B', 9)
+
+    assert recorder.changes == [
+        ('edge', 'A', 'B', None, 2),
+        ('edge', 'A', 'B', 2, 4),
+        ('edge', 'B', 'C', None, 1),
+        ('edge', 'A', 'B', 4, None),
+        ('edge', 'C', 'B', 1, None),
+        ('vertex', 'C'),
+    ]
+
+
+def test_listeners_hear_add_neighbor():
+    unweighted = Graph(is_directed=True)
+    weighted = WeightedGraph(is_directed=True)
+    recorders = []
+    for graph in (unweighted, weighted):
+        graph.add_vertex('A')
+        graph.add_vertex('B')
+        recorders.append(Recorder())
+        graph.add_listener(recorders[-1])
+
+    unweighted.get_vertex('A').add_neighbor(unweighted.get_vertex('B'))
+    unweighted.get_vertex('A').add_neighbor(unweighted.get_vertex('B'))
+    weighted.get_vertex('A').add_neighbor(weighted.get_vertex('B'), 3)
+    weighted.get_vertex('A').add_neighbor(weighted.get_vertex('B'), 5)
+
+    assert recorders[0].changes == [('edge', 'A', 'B', None, 1)]
+    assert recorders[1].changes == [('edge', 'A', 'B', None, 3), ('edge', 'A', 'B', 3, 5)]
+
+
+def test_dynamic_tree_follows_add_neighbor():
+    graph = WeightedGraph(is_directed=True)
+    graph.add_edges([('A', 'B', 5)])
+    tree = graph.dynamic_shortest_path_tree('A')
+    graph.add_vertex('C')
+    graph.get_vertex('A').add_neighbor(graph.get_vertex('C'), 1)
+    graph.get_vertex('C').add_neighbor(graph.get_vertex('B'), 1)
+    assert tree.distance_to('B') == 2
+    assert tree.path_to('B') == ['A', 'C', 'B']
+
+
+def test_traversals_skip_removed_vertices():
+    graph = Graph(is_directed=False)
+    for vertex_id in 'ABCDE':
+        graph.add_vertex(vertex_id)
+    graph.add_edges([('A', 'B'), ('B', 'C'), ('C', 'D'), ('D', 'E')])
+    graph.remove_vertex('C')
+
+    assert sorted(graph.bfs_order('A')) == ['A', 'B']
+    assert sorted(sorted(component) for component in graph.get_connected_components()) == \
+        [['A', 'B'], ['D', 'E']]
+    assert graph.find_shortest_path('A', 'E') is None
+    assert graph.find_path_dfs_iter('A', 'E') is None
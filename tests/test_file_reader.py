@@ -0,0 +1,99 @@
+import os
+import tempfile
+
+import pytest
+
+from graphs.file_reader import (_cache_path, iter_edges_from_file, read_csr_graph_from_file,
+                                read_graph_cache, read_graph_from_file)
+from graphs.weighted_graph import WeightedGraph
+
+WEIGHTED_MAP = 'G\nA,B,C,D\n(A,B,4)\n(B,C,2.5)\n(A,C,8)\n(C,D,1)\n'
+
+
+def write_map(tmp_path, text, name='map.txt'):
+    filename = str(tmp_path / name)
+    with open(filename, 'w') as f:
+        f.write(text)
+    return filename
+
+
+def edge_set(graph):
+    return {(vertex_id, neighbor_id, weight)
+            for vertex_id in graph.vertex_dict
+            for neighbor_id, weight in graph.neighbors_with_weights(vertex_id)}
+
+
+def test_reads_weighted_map(tmp_path):
+    graph = read_graph_from_file(write_map(tmp_path, WEIGHTED_MAP), use_cache=False)
+    assert isinstance(graph, WeightedGraph)
+    assert not graph.is_directed
+    assert graph.get_edge_weight('B', 'C') == 2.5
+    assert graph.find_shortest_path('A', 'D') == 7.5
+
+
+def test_reads_unweighted_map():
+    graph = read_graph_from_file('graphs/food_map.txt', use_cache=False)
+    assert not isinstance(graph, WeightedGraph)
+    assert sorted(graph.neighbor_ids('A')) == ['B', 'C']
+
+
+def test_mixed_edge_forms_report_line(tmp_path):
+    filename = write_map(tmp_path, 'G\nA,B,C\n(A,B,1)\n(B,C,2)\n(A,C)\n')
+    with pytest.raises(ValueError, match=r'line 5'):
+        read_graph_from_file(filename, use_cache=False)
+    with pytest.raises(ValueError, match=r'line 5'):
+        list(iter_edges_from_file(filename))
+
+
+def test_bad_weight_reports_line(tmp_path):
+    filename = write_map(tmp_path, 'D\nA,B\n(A,B,heavy)\n')
+    with pytest.raises(ValueError, match=r'map\.txt, line 3'):
+        read_graph_from_file(filename, use_cache=False)
+
+
+def test_cache_round_trip(tmp_path):
+    filename = write_map(tmp_path, WEIGHTED_MAP)
+    parsed = read_graph_from_file(filename)
+    assert os.path.exists(_cache_path(filename))
+    assert [name for name in os.listdir(tmp_path) if name.endswith('.tmp')] == []
+
+    cached = read_graph_cache(filename)
+    assert cached is not None and cached.ids == list(parsed.vertex_dict)
+    assert edge_set(read_graph_from_file(filename)) == edge_set(parsed)
+    assert read_csr_graph_from_file(filename).ids == cached.ids
+
+
+def test_stale_cache_is_ignored(tmp_path):
+    filename = write_map(tmp_path, WEIGHTED_MAP)
+    read_graph_from_file(filename)
+    write_map(tmp_path, WEIGHTED_MAP + '(D,A,3)\n')
+
+    assert read_graph_cache(filename) is None
+    assert read_graph_from_file(filename).get_edge_weight('A', 'D') == 3
+    assert read_graph_cache(filename) is not None
+
+
+@pytest.mark.parametrize('keep', [0, 5, 40, -8])
+def test_corrupt_cache_is_ignored(tmp_path, keep):
+    filename = write_map(tmp_path, WEIGHTED_MAP)
+    expected = edge_set(read_graph_from_file(filename))
+    with open(_cache_path(filename), 'rb') as f:
+        data = f.read()
+    with open(_cache_path(filename), 'wb') as f:
+        f.write(data[:keep])
+
+    assert read_graph_cache(filename) is None
+    assert edge_set(read_graph_from_file(filename)) == expected
+
+
+def test_unwritable_cache_is_skipped(tmp_path, monkeypatch):
+    filename = write_map(tmp_path, WEIGHTED_MAP)
+    expected = edge_set(read_graph_from_file(filename, use_cache=False))
+
+    def refuse(*args, **kwargs):
+        raise PermissionError('read-only directory')
+
+    monkeypatch.setattr(tempfile, 'mkstemp', refuse)
+    assert edge_set(read_graph_from_file(filename)) == expected
+    assert read_csr_graph_from_file(filename).ids == ['A', 'B', 'C', 'D']
+    assert not os.path.exists(_cache_path(filename))
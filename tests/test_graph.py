@@ -0,0 +1,143 @@
+import random
+
+import pytest
+
+from graphs.graph import Graph, HUB_DEGREE
+from graphs.weighted_graph import WeightedGraph
+from tests.helpers import model_of
+
+
+@pytest.mark.parametrize('directed', [False, True])
+@pytest.mark.parametrize('seed', range(20))
+def test_random_mutations_match_model(seed, directed):
+    rng = random.Random(seed)
+    graph = WeightedGraph(directed)
+    model = {}
+    next_id = 0
+
+    for _ in range(300):
+        action = rng.random()
+        ids = list(model)
+        if action < 0.15 or len(ids) < 2:
+            vertex_id = f'v{next_id}'
+            next_id += 1
+            graph.add_vertex(vertex_id)
+            model[vertex_id] = {}
+        elif action < 0.6:
+            vertex_id1, vertex_id2 = rng.choice(ids), rng.choice(ids)
+            weight = rng.randint(1, 9)
+            graph.add_edge(vertex_id1, vertex_id2, weight)
+            model[vertex_id1][vertex_id2] = weight
+            if not directed:
+                model[vertex_id2][vertex_id1] = weight
+        elif action < 0.8:
+            edges = [(a, b) for a in model for b in model[a]]
+            if edges:
+                vertex_id1, vertex_id2 = rng.choice(edges)
+                graph.remove_edge(vertex_id1, vertex_id2)
+                del model[vertex_id1][vertex_id2]
+                if not directed:
+                    model[vertex_id2].pop(vertex_id1, None)
+        elif action < 0.9:
+            vertex_id = rng.choice(ids)
+            graph.remove_vertex(vertex_id)
+            del model[vertex_id]
+            for neighbors in model.values():
+                neighbors.pop(vertex_id, None)
+        else:
+            graph.compact()
+
+        assert model_of(graph) == model
+
+    assert set(graph.vertex_dict) == set(model)
+    for vertex_id, neighbors in model.items():
+        for neighbor_id, weight in neighbors.items():
+            assert graph.get_edge_weight(vertex_id, neighbor_id) == weight
+
+
+def test_add_edge_needs_vertices():
+    graph = Graph(is_directed=False)
+    graph.add_vertex('A')
+    with pytest.raises(KeyError):
+        graph.add_edge('A', 'B')
+
+
+def test_add_vertex_again_keeps_edges():
+    graph = WeightedGraph(is_directed=False)
+    graph.add_edges([('A', 'B', 2)])
+    graph.add_vertex('A', (1.0, 2.0))
+    assert graph.get_edge_weight('A', 'B') == 2
+    assert graph.get_vertex('A').position == (1.0, 2.0)
+
+
+def test_add_edge_twice_updates_weight():
+    graph = WeightedGraph(is_directed=False)
+    graph.add_edges([('A', 'B', 2), ('A', 'B', 5)])
+    assert graph.get_edge_weight('B', 'A') == 5
+    assert graph.arc_count == 2
+
+
+def test_undirected_self_loop_stored_once():
+    graph = Graph(is_directed=False)
+    graph.add_vertex('A')
+    graph.add_edge('A', 'A')
+    assert list(graph.neighbor_ids('A')) == ['A']
+    assert graph.contains_cycle() is not None
+
+
+def test_views_are_live_and_read_only():
+    graph = WeightedGraph(is_directed=False)
+    graph.add_edges([('A', 'B', 1)])
+    vertex = graph.get_vertex('A')
+    neighbors = vertex.neighbors_dict
+    vertices = graph.vertex_dict
+
+    graph.add_vertex('C')
+    graph.add_edge('A', 'C', 3)
+    assert set(neighbors) == {'B', 'C'}
+    assert neighbors['C'][1] == 3
+    assert [v.id for v, _ in vertex.get_neighbors_with_weights()] == ['B', 'C']
+    assert set(vertices) == {'A', 'B', 'C'}
+
+    graph.remove_vertex('B')
+    assert set(neighbors) == {'C'}
+    assert 'B' not in vertices
+    with pytest.raises(TypeError):
+        neighbors['D'] = None
+
+
+def test_vertex_views_compare_by_graph_and_handle():
+    graph = Graph()
+    graph.add_vertex('A')
+    assert graph.get_vertex('A') == graph.get_vertex('A')
+    assert len({graph.get_vertex('A'), graph.get_vertex('A')}) == 1
+
+
+@pytest.mark.parametrize('directed', [False, True])
+def test_hub_edges_match_model(directed):
+    rng = random.Random(0)
+    graph = WeightedGraph(directed)
+    model = {'hub': {}}
+    graph.add_vertex('hub')
+    for i in range(4 * HUB_DEGREE):
+        graph.add_vertex(str(i))
+        model[str(i)] = {}
+
+    for _ in range(600):
+        vertex_id = str(rng.randrange(4 * HUB_DEGREE))
+        if rng.random() < 0.6:
+            weight = rng.randint(1, 9)
+            graph.add_edge('hub', vertex_id, weight)
+            model['hub'][vertex_id] = weight
+            if not directed:
+                model[vertex_id]['hub'] = weight
+        elif vertex_id in model['hub']:
+            graph.remove_edge('hub', vertex_id)
+            del model['hub'][vertex_id]
+            if not directed:
+                del model[vertex_id]['hub']
+        if rng.random() < 0.05:
+            graph.compact()
+        assert model_of(graph) == model
+
+    assert graph.index['hub'] in graph.hubs
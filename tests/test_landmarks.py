@@ -0,0 +1,96 @@
+import os
+
+import pytest
+
+from graphs.landmarks import LandmarkIndex
+from tests.helpers import check_route, model_of, queries, random_graph, reference_distances
+
+
+@pytest.fixture
+def graph():
+    return random_graph(5, vertex_count=40, edge_count=100)[0]
+
+
+def test_save_and_load(graph, tmp_path):
+    filename = str(tmp_path / 'index.alt')
+    graph.build_landmark_index(4).save(filename)
+    assert os.listdir(tmp_path) == ['index.alt']
+
+    index = LandmarkIndex.load(graph, filename)
+    assert len(index.landmarks) == 4
+    expected = reference_distances(model_of(graph), '0')
+    for target_id, distance in expected.items():
+        assert index.find_shortest_path('0', target_id)[0] == pytest.approx(distance)
+
+
+def test_load_rebuilds_for_changed_graph(graph, tmp_path):
+    filename = str(tmp_path / 'index.alt')
+    graph.build_landmark_index(4).save(filename)
+    with open(filename, 'rb') as f:
+        saved = f.read()
+
+    graph.add_edge('0', '39', 1)
+    index = LandmarkIndex.load(graph, filename)
+    assert index.find_shortest_path('0', '39')[0] == 1
+    with open(filename, 'rb') as f:
+        assert f.read() != saved
+
+
+def test_stale_index(graph):
+    index = graph.build_landmark_index(3)
+    graph.add_edge('0', '39', 1)
+    assert index.is_stale()
+    with pytest.raises(ValueError):
+        index.find_shortest_path('0', '39')
+
+    index.auto_rebuild = True
+    assert index.find_shortest_path('0', '39')[0] == 1
+    assert not index.is_stale()
+
+
+def test_load_rejects_other_files(graph, tmp_path):
+    filename = str(tmp_path / 'index.alt')
+    with open(filename, 'wb') as f:
+        f.write(b'not a landmark index at all')
+    with pytest.raises(ValueError):
+        LandmarkIndex.load(graph, filename)
+
+
+# Bytes of a saved 4-landmark index to keep: none, part of the magic, part
+# of the header, and all but the end of the body
+@pytest.mark.parametrize('keep', [0, 5, 20, -16, -200])
+@pytest.mark.parametrize('auto_rebuild', [False, True])
+def test_load_rebuilds_truncated_file(graph, tmp_path, keep, auto_rebuild):
+    filename = str(tmp_path / 'index.alt')
+    graph.build_landmark_index(4).save(filename)
+    with open(filename, 'rb') as f:
+        saved = f.read()
+    with open(filename, 'wb') as f:
+        f.write(saved[:keep])
+
+    index = LandmarkIndex.load(graph, filename, auto_rebuild=auto_rebuild, landmark_count=4)
+    assert index.auto_rebuild == auto_rebuild
+    expected = reference_distances(model_of(graph), '0')
+    for target_id, distance in expected.items():
+        assert index.find_shortest_path('0', target_id)[0] == pytest.approx(distance)
+    assert os.path.getsize(filename) == len(saved)
+
+
+def test_load_rebuilds_short_header_with_default_count(graph, tmp_path):
+    filename = str(tmp_path / 'index.alt')
+    with open(filename, 'wb') as f:
+        f.write(b'GRAPHALT')
+    assert len(LandmarkIndex.load(graph, filename).landmarks) == 8
+
+
+@pytest.mark.parametrize('directed', [False, True])
+@pytest.mark.parametrize('seed', range(12))
+def test_landmark_routes_match_reference(seed, directed):
+    graph, model = random_graph(seed, directed=directed)
+    index = graph.build_landmark_index(4)
+    for start_id, target_id in queries(model, seed):
+        distance, path, _ = index.find_shortest_path(start_id, target_id)
+        check_route(model, start_id, target_id, distance, path)
+        expected = reference_distances(model, start_id).get(target_id)
+        if expected is not None:
+            assert index.lower_bound(start_id, target_id) <= expected + 1e-9
@@ -0,0 +1,20 @@
+import pytest
+
+from main import make_food_table, mold_growth
+
+
+def test_mold_growth_rings():
+    graph = make_food_table()
+    rings = mold_growth(graph, 'A', 3)
+    assert rings[0] == ['A']
+    assert sorted(rings[1]) == ['B', 'C']
+    assert sorted(rings[2]) == ['D', 'E', 'F']
+
+
+def test_mold_growth_empty_range():
+    assert mold_growth(make_food_table(), 'A', 0) == []
+
+
+def test_mold_growth_negative_range():
+    with pytest.raises(ValueError):
+        mold_growth(make_food_table(), 'A', -1)
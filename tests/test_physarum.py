@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from graphs.physarum import PhysarumSimulator
+from graphs.weighted_graph import WeightedGraph
+
+
+def two_path_graph():
+    """Food at A and Z, joined by a short path through B and a longer one through C."""
+    graph = WeightedGraph(is_directed=False)
+    graph.add_edges([('A', 'B', 1), ('B', 'Z', 1), ('A', 'C', 2), ('C', 'Z', 2)])
+    return graph
+
+
+@pytest.mark.parametrize('mu', [1.0, 1.5])
+def test_shorter_tube_survives(mu):
+    simulator = PhysarumSimulator(two_path_graph(), ['A', 'Z'], mu=mu, seed=0)
+    simulator.run(2000, tolerance=1e-9)
+    assert simulator.iterations < 2000
+
+    network = simulator.to_graph()
+    assert set(network.vertex_dict) == {'A', 'B', 'Z'}
+    assert sorted(network.neighbor_ids('B')) == ['A', 'Z']
+    assert network.get_edge_weight('A', 'B') == 1
+
+
+def test_flux_is_conserved():
+    simulator = PhysarumSimulator(two_path_graph(), ['A', 'Z'], inflow=2.0, seed=0)
+    flux = simulator.step()
+    ids = list(simulator.ids)
+    # Either food may be the source this step: all the inflow leaves one
+    # and enters the other, and every other vertex passes its flux on
+    net = np.zeros(len(ids))
+    np.add.at(net, simulator.tail, flux)
+    np.add.at(net, simulator.head, -flux)
+    net = dict(zip(ids, net.tolist()))
+    assert abs(net['A']) == pytest.approx(2.0)
+    assert net['Z'] == pytest.approx(-net['A'])
+    assert net['B'] == pytest.approx(0.0, abs=1e-9)
+    assert net['C'] == pytest.approx(0.0, abs=1e-9)
+
+
+def test_needs_two_food_sources():
+    with pytest.raises(ValueError):
+        PhysarumSimulator(two_path_graph(), ['A', 'A'])
+    with pytest.raises(KeyError):
+        PhysarumSimulator(two_path_graph(), ['A', 'missing'])
+
+
+def test_rejects_zero_length_tubes():
+    graph = two_path_graph()
+    graph.add_edge('A', 'Z', 0)
+    with pytest.raises(ValueError):
+        PhysarumSimulator(graph, ['A', 'Z'])
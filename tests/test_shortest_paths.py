@@ -0,0 +1,72 @@
+import math
+
+import pytest
+
+from benchmarks.generators import geometric
+from tests.helpers import check_route, model_of, queries, random_graph, reference_distances
+
+SEEDS = range(12)
+
+
+@pytest.mark.parametrize('directed', [False, True])
+@pytest.mark.parametrize('seed', SEEDS)
+def test_dijkstra(seed, directed):
+    graph, model = random_graph(seed, directed=directed)
+    for start_id, target_id in queries(model, seed):
+        check_route(model, start_id, target_id, *graph.find_shortest_route(start_id, target_id))
+        assert graph.find_shortest_path(start_id, target_id) == \
+            reference_distances(model, start_id).get(target_id)
+    assert graph.find_all_distances('0') == pytest.approx(reference_distances(model, '0'))
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_all_pairs(seed):
+    graph, model = random_graph(seed, vertex_count=15, edge_count=30, directed=True)
+    table = graph.floyd_warshall()
+    for start_id in model:
+        reachable = reference_distances(model, start_id)
+        for target_id in model:
+            assert table[start_id][target_id] == pytest.approx(reachable.get(target_id, math.inf))
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_path_cache_gives_same_answers(seed):
+    graph, model = random_graph(seed)
+    graph.enable_path_cache()
+    for start_id, target_id in queries(model, seed) * 2:
+        check_route(model, start_id, target_id, *graph.find_shortest_route(start_id, target_id))
+
+    graph.add_edge('0', '1', 1)
+    check_route(model_of(graph), '0', '1', *graph.find_shortest_route('0', '1'))
+
+
+@pytest.mark.parametrize('directed', [False, True])
+@pytest.mark.parametrize('seed', SEEDS)
+def test_bidirectional(seed, directed):
+    graph, model = random_graph(seed, directed=directed)
+    for start_id, target_id in queries(model, seed):
+        distance, path, _ = graph.find_shortest_path_bidirectional(start_id, target_id)
+        check_route(model, start_id, target_id, distance, path)
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_astar_on_geometric_map(seed):
+    graph = geometric(400, seed)
+    model = model_of(graph)
+    for start_id, target_id in queries(model, seed):
+        distance, path, _ = graph.find_shortest_path_astar(start_id, target_id)
+        check_route(model, start_id, target_id, distance, path)
+
+
+@pytest.mark.parametrize('directed', [False, True])
+@pytest.mark.parametrize('seed', SEEDS)
+def test_contraction_hierarchy(seed, directed):
+    graph, model = random_graph(seed, directed=directed)
+    graph.enable_contraction_hierarchy()
+    for start_id, target_id in queries(model, seed):
+        check_route(model, start_id, target_id, *graph.find_shortest_route(start_id, target_id))
+
+    # Any change drops the hierarchy and queries fall back to Dijkstra
+    graph.add_edge('0', '1', 1)
+    assert graph.contraction_hierarchy is None
+    check_route(model_of(graph), '0', '1', *graph.find_shortest_route('0', '1'))
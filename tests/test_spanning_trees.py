@@ -0,0 +1,82 @@
+import random
+
+import pytest
+
+from graphs.weighted_graph import kruskal_from_edges
+from tests.helpers import random_graph, reference_distances, reference_spanning_weight
+
+
+def spans_forest(model, edges):
+    """Check the edges exist in the model and join the same vertices as the model does."""
+    parent = {vertex_id: vertex_id for vertex_id in model}
+
+    def find(vertex_id):
+        while parent[vertex_id] != vertex_id:
+            vertex_id = parent[vertex_id]
+        return vertex_id
+
+    for vertex_id1, vertex_id2, weight in edges:
+        assert model[vertex_id1][vertex_id2] == weight
+        root1, root2 = find(vertex_id1), find(vertex_id2)
+        assert root1 != root2, 'the edges contain a cycle'
+        parent[root1] = root2
+    for vertex_id1 in model:
+        for vertex_id2 in model[vertex_id1]:
+            assert find(vertex_id1) == find(vertex_id2)
+
+
+@pytest.mark.parametrize('seed', range(15))
+def test_prim(seed):
+    graph, model = random_graph(seed, edge_count=45)
+    expected = reference_spanning_weight(model)
+
+    edges, total = graph.prim_spanning_tree(forest=True)
+    spans_forest(model, edges)
+    assert total == expected == graph.minimum_spanning_tree_prim()
+
+
+@pytest.mark.parametrize('seed', range(15))
+def test_kruskal(seed):
+    graph, model = random_graph(seed, edge_count=45)
+    kruskal = graph.minimum_spanning_tree_kruskal()
+    spans_forest(model, kruskal)
+    assert sum(weight for _, _, weight in kruskal) == reference_spanning_weight(model)
+
+
+def test_kruskal_from_sorted_stream():
+    graph, model = random_graph(1)
+    edges = sorted(((a, b, w) for a in model for b, w in model[a].items() if a < b),
+                   key=lambda edge: edge[2])
+    tree = kruskal_from_edges(iter(edges), list(model))
+    assert sum(weight for _, _, weight in tree) == reference_spanning_weight(model)
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_steiner_tree_within_twice_optimal(seed):
+    graph, model = random_graph(seed, vertex_count=25, edge_count=70)
+    rng = random.Random(seed)
+    component = reference_distances(model, '0')
+    terminals = rng.sample(sorted(component), min(5, len(component)))
+
+    edges, total = graph.steiner_tree(terminals)
+    for vertex_id1, vertex_id2, weight in edges:
+        assert model[vertex_id1][vertex_id2] == weight
+    assert total == sum(weight for _, _, weight in edges)
+
+    # The tree connects every terminal
+    tree = {vertex_id: set() for vertex_id in model}
+    for vertex_id1, vertex_id2, _ in edges:
+        tree[vertex_id1].add(vertex_id2)
+        tree[vertex_id2].add(vertex_id1)
+    reached, stack = {terminals[0]}, [terminals[0]]
+    while stack:
+        for neighbor_id in tree[stack.pop()]:
+            if neighbor_id not in reached:
+                reached.add(neighbor_id)
+                stack.append(neighbor_id)
+    assert set(terminals) <= reached
+
+    # Mehlhorn's tree is no heavier than a spanning tree of the terminals'
+    # shortest-path distances, which is itself at most twice the optimum
+    closure = {a: {b: reference_distances(model, a)[b] for b in terminals if b != a} for a in terminals}
+    assert total <= reference_spanning_weight(closure) + 1e-9
@@ -0,0 +1,79 @@
+import math
+import random
+
+import pytest
+
+from graphs.weighted_graph import WeightedGraph
+from tests.helpers import model_of
+
+
+def random_points(seed, count):
+    rng = random.Random(seed)
+    return [(rng.random(), rng.random()) for _ in range(count)]
+
+
+def edge_pairs(graph):
+    return {frozenset((a, b)) for a, neighbors in model_of(graph).items() for b in neighbors}
+
+
+def brute_force(points, mode, radius=None, k=None):
+    pairs = set()
+    count = len(points)
+    for i in range(count):
+        for j in range(i + 1, count):
+            distance = math.dist(points[i], points[j])
+            if mode == 'radius' and distance <= radius:
+                pairs.add(frozenset((str(i), str(j))))
+            if mode == 'gabriel':
+                middle = ((points[i][0] + points[j][0]) / 2, (points[i][1] + points[j][1]) / 2)
+                if all(math.dist(points[c], middle) >= distance / 2 - 1e-12
+                       for c in range(count) if c not in (i, j)):
+                    pairs.add(frozenset((str(i), str(j))))
+        if mode == 'knn':
+            nearest = sorted(range(count), key=lambda j: math.dist(points[i], points[j]))
+            pairs.update(frozenset((str(i), str(j))) for j in nearest if j != i and j in nearest[:k + 1])
+    return pairs
+
+
+@pytest.mark.parametrize('mode, options', [('radius', {'radius': 0.3}), ('knn', {'k': 3}), ('gabriel', {})])
+@pytest.mark.parametrize('seed', range(8))
+def test_modes_match_brute_force(seed, mode, options):
+    points = random_points(seed, 40)
+    graph = WeightedGraph.from_points(points, mode, **options)
+    assert edge_pairs(graph) == brute_force(points, mode, **options)
+    for a, neighbors in model_of(graph).items():
+        for b, weight in neighbors.items():
+            assert weight == pytest.approx(math.dist(points[int(a)], points[int(b)]))
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_delaunay_contains_gabriel_and_is_planar_sized(seed):
+    points = random_points(seed, 50)
+    delaunay = edge_pairs(WeightedGraph.from_points(points, 'delaunay'))
+    assert brute_force(points, 'gabriel') <= delaunay
+    assert len(delaunay) <= 3 * len(points) - 6
+
+
+def test_collinear_points_form_a_path():
+    graph = WeightedGraph.from_points([(0, 0), (2, 0), (1, 0), (3, 0)], 'delaunay')
+    assert edge_pairs(graph) == {frozenset(p) for p in (('0', '2'), ('1', '2'), ('1', '3'))}
+
+
+def test_graph_stays_mutable_with_positions():
+    graph = WeightedGraph.from_points(random_points(0, 30), 'gabriel', ids=[f'p{i}' for i in range(30)])
+    assert graph.get_vertex('p0').position is not None
+    graph.add_vertex('extra', (0.5, 0.5))
+    graph.add_edge('extra', 'p0', 1.0)
+    graph.remove_edge('p1', next(graph.neighbor_ids('p1')))
+    assert graph.find_shortest_path('extra', 'p0') == 1.0
+
+
+@pytest.mark.parametrize('arguments', [
+    {'points': [(0, 0, 0)]},
+    {'points': [(0, 0)], 'mode': 'voronoi'},
+    {'points': [(0, 0), (1, 1)], 'ids': ['a', 'a']},
+    {'points': [(0, 0), (1, 1)], 'mode': 'knn'},
+])
+def test_bad_arguments(arguments):
+    with pytest.raises(ValueError):
+        WeightedGraph.from_points(**arguments)
@@ -0,0 +1,37 @@
+from graphs.stats import Stats, collect_stats
+from tests.helpers import random_graph
+
+
+def test_collect_stats_counts_phases():
+    graph, _ = random_graph(0, vertex_count=30, edge_count=60)
+    with collect_stats(graph) as stats:
+        graph.find_shortest_path('0', '1')
+        graph.find_shortest_path('0', '2')
+        list(graph.bfs_order('0'))
+        graph.minimum_spanning_tree_kruskal()
+
+    report = stats.as_dict()
+    assert report['phases']['dijkstra']['calls'] == 2
+    assert report['phases']['bfs']['vertices_visited'] == len(list(graph.bfs_order('0')))
+    assert 'kruskal.sort' in report['phases']
+    assert report['totals']['calls'] >= 5
+    assert report['wall_seconds'] > 0
+    assert graph.stats is None
+
+
+def test_stats_off_records_nothing():
+    graph, _ = random_graph(0)
+    stats = Stats()
+    graph.enable_stats(stats)
+    graph.disable_stats()
+    graph.find_shortest_path('0', '1')
+    assert stats.phases == {}
+
+
+def test_merge_keeps_largest_peak():
+    first, second = Stats(), Stats()
+    first.record('bfs', 1.0, 5, 10, 5, 5, 3)
+    second.record('bfs', 2.0, 1, 1, 1, 1, 7)
+    first.merge(second)
+    totals = first.phases['bfs']
+    assert totals['calls'] == 2 and totals['seconds'] == 3.0 and totals['peak_frontier'] == 7
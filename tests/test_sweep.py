@@ -0,0 +1,116 @@
+import json
+import shutil
+
+import pytest
+
+from graphs.sweep import (completed_keys, load_results, run_sweep, scenario_grid, scenario_key,
+                          solve_scenario)
+from main import make_food_table, mold_growth
+
+FOOD_MAP = 'graphs/food_map.txt'
+
+
+@pytest.fixture
+def unweighted_map(tmp_path):
+    """A copy of the repo's unweighted food map, so its cache is written under tmp_path."""
+    filename = str(tmp_path / 'food_map.txt')
+    shutil.copy(FOOD_MAP, filename)
+    return filename
+
+
+def results_by_scenario(filename):
+    return {json.dumps(record['scenario'], sort_keys=True): record
+            for record in load_results(filename)}
+
+
+def test_weighted_map_answers_match_graph():
+    graph = make_food_table()
+    result = solve_scenario(graph, {'map': 'food', 'start': 'A', 'target': 'J', 'radius': 4})
+
+    assert result['distance'] == graph.find_shortest_path('A', 'J')
+    assert result['path'][0] == 'A' and result['path'][-1] == 'J'
+    assert result['rings'] == mold_growth(graph, 'A', 4)
+    assert result['spanning_tree_weight'] == graph.minimum_spanning_tree_prim()
+
+
+def test_unweighted_map_uses_hops(unweighted_map):
+    output = unweighted_map + '.jsonl'
+    scenarios = scenario_grid(map=[unweighted_map], start=['A'], target=['F'], radius=[3])
+
+    assert run_sweep(scenarios, output) == (1, 0)
+    result = load_results(output)[0]['result']
+    assert result['distance'] == 3
+    assert len(result['path']) == 4
+    assert result['rings'] == [['A'], ['B', 'C'], ['D', 'E']]
+    # Six connected vertices give a spanning tree of five unit edges
+    assert result['spanning_tree_weight'] == 5
+
+
+@pytest.mark.parametrize('radius, expected', [(0, []), (1, [['A']])])
+def test_small_radius(radius, expected):
+    result = solve_scenario(make_food_table(), {'map': 'food', 'start': 'A', 'radius': radius})
+    assert result['rings'] == expected
+
+
+def test_failures_are_recorded_and_retried(tmp_path):
+    output = str(tmp_path / 'out.jsonl')
+    maps = {'food': make_food_table()}
+    scenarios = scenario_grid(map=['food'], start=['A'], target=['J', 'missing'], radius=[-1, 2])
+
+    assert run_sweep(scenarios, output, maps=maps) == (4, 3)
+    records = results_by_scenario(output)
+    assert all('error' in record for key, record in records.items()
+               if 'missing' in key or '-1' in key)
+    assert len(completed_keys(output)) == 1
+
+    # Only the failed scenarios are run again
+    assert run_sweep(scenarios, output, maps=maps) == (3, 3)
+    assert run_sweep(scenarios, output, maps=maps, resume=False) == (4, 3)
+
+
+def test_unexpected_errors_are_recorded(tmp_path):
+    output = str(tmp_path / 'out.jsonl')
+    maps = {'food': make_food_table()}
+    # A radius that is not a number fails with a TypeError
+    scenarios = [{'map': 'food', 'start': 'A', 'radius': 'three'},
+                 {'map': 'food', 'start': 'A', 'radius': 2}]
+
+    assert run_sweep(scenarios, output, maps=maps) == (2, 1)
+    records = results_by_scenario(output)
+    assert records[scenario_key(scenarios[0])]['error'].startswith('TypeError')
+    assert records[scenario_key(scenarios[1])]['result']['rings'] == mold_growth(maps['food'], 'A', 2)
+
+
+def test_resume_after_interrupted_line(tmp_path):
+    output = str(tmp_path / 'out.jsonl')
+    maps = {'food': make_food_table()}
+    scenarios = scenario_grid(map=['food'], start=list('ABCD'), target=['J'])
+
+    assert run_sweep(scenarios, output, maps=maps) == (4, 0)
+    with open(output) as f:
+        text = f.read()
+    with open(output, 'w') as f:
+        f.write(text[:-10])
+
+    assert run_sweep(scenarios, output, maps=maps) == (1, 0)
+    assert run_sweep(scenarios, output, maps=maps) == (0, 0)
+    assert len(completed_keys(output)) == 4
+
+
+def test_pool_matches_serial(unweighted_map, tmp_path):
+    weighted_map = str(tmp_path / 'weighted.txt')
+    with open(weighted_map, 'w') as f:
+        f.write('G\nA,B,C,D\n(A,B,1)\n(B,C,2)\n(A,C,5)\n(C,D,1)\n')
+    scenarios = (scenario_grid(map=[unweighted_map], start=list('ABC'), target=['F'], radius=[2])
+                 + scenario_grid(map=[weighted_map], start=list('ABC'), target=['D'], radius=[2]))
+
+    serial = str(tmp_path / 'serial.jsonl')
+    pooled = str(tmp_path / 'pooled.jsonl')
+    assert run_sweep(scenarios, serial) == (6, 0)
+    assert run_sweep(scenarios, pooled, workers=2, chunk_size=1) == (6, 0)
+
+    strip = lambda records: {key: record['result'] for key, record in records.items()}
+    assert strip(results_by_scenario(serial)) == strip(results_by_scenario(pooled))
+    assert results_by_scenario(serial)[json.dumps(
+        {'map': weighted_map, 'radius': 2, 'start': 'A', 'target': 'D'},
+        sort_keys=True)]['result']['distance'] == 4
@@ -0,0 +1,90 @@
+import random
+
+import pytest
+
+from graphs.graph import Graph
+from tests.helpers import random_graph
+
+
+def hop_levels(model, start_id):
+    """Return vertex id -> number of hops from start_id, for reachable vertices."""
+    levels = {start_id: 0}
+    frontier = [start_id]
+    while frontier:
+        following = []
+        for vertex_id in frontier:
+            for neighbor_id in model[vertex_id]:
+                if neighbor_id not in levels:
+                    levels[neighbor_id] = levels[vertex_id] + 1
+                    following.append(neighbor_id)
+        frontier = following
+    return levels
+
+
+@pytest.mark.parametrize('directed', [False, True])
+@pytest.mark.parametrize('seed', range(5))
+def test_bfs_and_shortest_paths_match_model(seed, directed):
+    graph, model = random_graph(seed, edge_count=35, directed=directed, weighted=False)
+    levels = hop_levels(model, '0')
+
+    order = list(graph.bfs_order('0'))
+    assert sorted(order) == sorted(levels)
+    assert [levels[vertex_id] for vertex_id in order] == sorted(levels.values())
+    for target_id in model:
+        path = graph.find_shortest_path('0', target_id)
+        if target_id not in levels:
+            assert path is None
+            continue
+        assert len(path) - 1 == levels[target_id]
+        assert all(b in model[a] for a, b in zip(path, path[1:]))
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_connected_components_match_model(seed):
+    graph, model = random_graph(seed, edge_count=25, weighted=False)
+    components = [sorted(component) for component in graph.get_connected_components()]
+    assert sorted(sum(components, [])) == sorted(model)
+    for component in components:
+        assert sorted(hop_levels(model, component[0])) == component
+
+
+def test_find_vertices_n_away():
+    graph, model = random_graph(3, weighted=False)
+    levels = hop_levels(model, '0')
+    for distance in range(4):
+        expected = sorted(v for v, level in levels.items() if level == distance)
+        assert sorted(graph.find_vertices_n_away('0', distance)) == expected
+
+
+@pytest.mark.parametrize('directed', [False, True])
+def test_is_bipartite(directed):
+    graph = Graph(is_directed=directed)
+    for vertex_id in 'ABCD':
+        graph.add_vertex(vertex_id)
+    graph.add_edges([('A', 'B'), ('B', 'C'), ('C', 'D'), ('D', 'A')])
+    assert graph.is_bipartite()
+    graph.add_edge('A', 'C')
+    assert not graph.is_bipartite()
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_topological_sort_respects_edges(seed):
+    rng = random.Random(seed)
+    graph = Graph(is_directed=True)
+    for i in range(20):
+        graph.add_vertex(str(i))
+    edges = set()
+    for _ in range(40):
+        a, b = sorted(rng.sample(range(20), 2))
+        edges.add((str(a), str(b)))
+    graph.add_edges(edges)
+
+    order = graph.topological_sort()
+    position = {vertex_id: i for i, vertex_id in enumerate(order)}
+    assert sorted(order, key=int) == [str(i) for i in range(20)]
+    assert all(position[a] < position[b] for a, b in edges)
+    assert not graph.contains_cycle()
+
+    a, b = next(iter(edges))
+    graph.add_edge(b, a)
+    assert graph.contains_cycle()
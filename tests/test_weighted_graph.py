@@ -0,0 +1,39 @@
+import math
+
+import pytest
+
+from main import make_food_table
+
+
+def test_find_vertices_within_bands():
+    graph = make_food_table()
+    distances = graph.find_all_distances('A')
+    bands = graph.find_vertices_within('A', 10, band_width=4)
+
+    assert len(bands) == max(int(d // 4) for d in distances.values() if d <= 10) + 1
+    assert bands[-1]
+    for n, band in enumerate(bands):
+        for vertex_id in band:
+            assert n * 4 <= distances[vertex_id] < (n + 1) * 4
+    assert sorted(sum(bands, [])) == sorted(v for v, d in distances.items() if d <= 10)
+
+
+def test_find_vertices_within_stops_at_last_reached_band():
+    graph = make_food_table()
+    furthest = max(graph.find_all_distances('A').values())
+    bands = graph.find_vertices_within('A', 10 ** 9, band_width=0.5)
+
+    assert len(bands) == int(furthest // 0.5) + 1
+    assert sorted(sum(bands, [])) == sorted(graph.vertex_dict)
+
+
+@pytest.mark.parametrize('budget', [-1, math.inf, math.nan])
+def test_find_vertices_within_rejects_bad_budget(budget):
+    with pytest.raises(ValueError):
+        make_food_table().find_vertices_within('A', budget)
+
+
+@pytest.mark.parametrize('band_width', [0, -2, math.nan])
+def test_find_vertices_within_rejects_bad_band_width(band_width):
+    with pytest.raises(ValueError):
+        make_food_table().find_vertices_within('A', 10, band_width)